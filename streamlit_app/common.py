@@ -48,9 +48,18 @@ def ensure_state_defaults() -> None:
     state.setdefault(KEY_ACTIVE_SESSION, None)
 
 
+_TEMPLATE_CACHE: Optional[tuple[int, List[Dict[str, Any]]]] = None
+
+
 def load_templates() -> List[Dict[str, Any]]:
+    """Return templates, rebuilding the list only when the registry version moved."""
+
+    global _TEMPLATE_CACHE
     MANAGER.refresh_templates()
-    return MANAGER.list_templates()
+    version = MANAGER.template_version
+    if _TEMPLATE_CACHE is None or _TEMPLATE_CACHE[0] != version:
+        _TEMPLATE_CACHE = (version, MANAGER.list_templates())
+    return _TEMPLATE_CACHE[1]
 
 
 def list_sessions() -> List[SessionMetadata]:
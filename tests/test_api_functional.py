@@ -7,6 +7,7 @@ stack quickly.
 
 from __future__ import annotations
 
+import gc
 import time
 import uuid
 from typing import Iterator
@@ -21,10 +22,12 @@ def reset_manager() -> Iterator[None]:
     """Ensure each test gets a fresh SessionManager instance."""
 
     vibestack_api._MANAGER = None  # type: ignore[attr-defined]
+    vibestack_api._MANAGERS.clear()  # type: ignore[attr-defined]
     try:
         yield
     finally:
         vibestack_api._MANAGER = None  # type: ignore[attr-defined]
+        vibestack_api._MANAGERS.clear()  # type: ignore[attr-defined]
 
 
 @pytest.fixture
@@ -76,3 +79,54 @@ def test_enqueue_one_off_captures_stdout(session_root: str) -> None:
     session_url = session.get("session_url")
     assert session_url and session_name in session_url
     assert "hello-from-test" in log_output
+
+
+def test_get_manager_caches_per_session_root(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("VIBESTACK_MANAGER_CACHE_SIZE", "2")
+    monkeypatch.setenv("VIBESTACK_TMUX_CONTROL", "1")
+    roots = [str(tmp_path_factory.mktemp(f"root{index}")) for index in range(3)]
+
+    first = vibestack_api.get_manager(roots[0])
+    default = vibestack_api.get_manager()
+
+    assert vibestack_api.get_manager(roots[0] + "/") is first
+    assert vibestack_api.get_manager() is default
+    second = vibestack_api.get_manager(roots[1])
+    assert second.template_registry is first.template_registry
+    client = second._control_client()
+    vibestack_api.get_manager(roots[0])
+    vibestack_api.get_manager(roots[2])
+    assert vibestack_api.get_manager(roots[0]) is first
+    assert vibestack_api.get_manager(roots[1]) is not second
+    assert vibestack_api.get_async_manager(roots[0]).manager is first
+    # Eviction leaves a manager that is still in use working; collecting it closes it.
+    if client is not None:
+        assert client.alive and second.list_sessions() == []
+        del second
+        gc.collect()
+        assert not client.alive
+
+
+def test_search_logs_finds_clean_lines_across_sessions(session_root: str) -> None:
+    names = [f"pytest-{uuid.uuid4().hex[:8]}" for _ in range(2)]
+    vibestack_api.enqueue_one_off(names[0], "printf '\\033[31mfatal: boom\\033[0m\\n'", session_root=session_root)
+    vibestack_api.enqueue_one_off(names[1], "printf 'all good\\n'", session_root=session_root)
+    for name in names:
+        _wait_for_completion(name, session_root)
+
+    deadline = time.time() + 10.0
+    result: dict = {}
+    while time.time() < deadline:
+        result = vibestack_api.search_logs("FATAL", ignore_case=True, session_root=session_root)
+        if any(match["text"] == "fatal: boom" for match in result["matches"]):
+            break
+        time.sleep(0.2)
+
+    (match,) = [match for match in result["matches"] if match["text"] == "fatal: boom"]
+    assert match["session"] == names[0]
+    assert result["sessions_searched"] == 2 and not result["truncated"]
+    lines = vibestack_api.read_log_lines(names[0], match["line"], match["line"], session_root=session_root)
+    assert lines["log"] == "fatal: boom" and lines["from_line"] == match["line"]
+    assert vibestack_api.search_logs("boom", names=[names[1]], session_root=session_root)["matches"] == []
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import random
+import threading
+from pathlib import Path
+
+import pytest
+
+from vibestack.sessions import logindex, logrotate, logs
+
+
+@pytest.mark.parametrize("lines", [1, 3, 50, 500])
+def test_tail_lines_matches_full_read(tmp_path: Path, lines: int) -> None:
+    rng = random.Random(lines)
+    pieces = ["plain", "\x1b[32mgreen\x1b[0m", "redraw\rover", "crlf\r\n", "ünïcødé", "", "tab\tline"]
+    content = "".join(rng.choice(pieces) + rng.choice(["\n", "\r\n", ""]) for _ in range(400))
+    path = tmp_path / "console.log"
+    path.write_text(content, encoding="utf-8")
+
+    chunk = logs.tail_lines(path, lines, block_size=16)
+
+    assert chunk.text == "\n".join(content.splitlines()[-lines:])
+    assert chunk.next_offset == path.stat().st_size
+    assert path.read_bytes()[chunk.offset :].decode("utf-8").splitlines() == content.splitlines()[-lines:]
+
+
+def test_tail_lines_offsets_count_bytes_not_decoded_text(tmp_path: Path) -> None:
+    path = tmp_path / "console.log"
+    content = b"".join(b"bad \xff\xfe line %02d\n" % index for index in range(5))
+    path.write_bytes(content)
+
+    chunk = logs.tail_lines(path, 2, block_size=8)
+
+    assert chunk.text == "bad \ufffd\ufffd line 03\nbad \ufffd\ufffd line 04"
+    assert content[chunk.offset :] == b"bad \xff\xfe line 03\nbad \xff\xfe line 04\n"
+
+
+def test_tail_lines_reads_a_long_run_without_newlines_once(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "console.log"
+    path.write_bytes(b"head\n" + b"x" * (1 << 20))
+    reads = []
+    read = logs._LogView.read
+    monkeypatch.setattr(logs._LogView, "read", lambda self, offset, size: reads.append(size) or read(self, offset, size))
+
+    chunk = logs.tail_lines(path, 1, block_size=4096)
+
+    assert (chunk.text, chunk.offset) == ("x" * (1 << 20), 5)
+    assert sum(reads) == path.stat().st_size
+
+
+def test_tail_lines_missing_file(tmp_path: Path) -> None:
+    chunk = logs.tail_lines(tmp_path / "missing.log", 10)
+
+    assert (chunk.text, chunk.next_offset) == ("", 0)
+
+
+def test_read_from_holds_back_partial_utf8(tmp_path: Path) -> None:
+    path = tmp_path / "console.log"
+    path.write_bytes("ab".encode("utf-8") + "é".encode("utf-8")[:1])
+
+    first = logs.read_from(path, 0)
+    with path.open("ab") as handle:
+        handle.write("é".encode("utf-8")[1:] + b"cd")
+    second = logs.read_from(path, first.next_offset)
+
+    assert first.text == "ab"
+    assert first.next_offset == 2
+    assert second.text == "écd"
+    assert second.next_offset == path.stat().st_size
+
+
+def test_read_from_restarts_when_log_shrinks(tmp_path: Path) -> None:
+    path = tmp_path / "console.log"
+    path.write_text("fresh\n")
+
+    chunk = logs.read_from(path, 1024)
+
+    assert chunk.offset == 0
+    assert chunk.text == "fresh\n"
+
+
+def test_log_follower_returns_only_appended_output(tmp_path: Path) -> None:
+    path = tmp_path / "console.log"
+    path.write_text("old\n")
+    follower = logs.LogFollower(path, offset=path.stat().st_size)
+
+    assert follower.poll() is None
+    with path.open("a") as handle:
+        handle.write("new\n")
+    chunk = follower.poll()
+
+    assert chunk is not None and chunk.text == "new\n"
+    assert follower.poll() is None
+    path.write_text("x\n")
+    reset = follower.poll()
+    assert reset is not None and reset.offset == 0 and reset.text == "x\n"
+
+
+def _rotated_log(tmp_path: Path, content: bytes, *, max_bytes: int, keep: int = 10) -> Path:
+    path = tmp_path / "console.log"
+    writer = logrotate.RotatingLogWriter(path, max_bytes=max_bytes, keep=keep, codec="gzip")
+    for start in range(0, len(content), 7):
+        writer.write(content[start : start + 7])
+    writer.close()
+    return path
+
+
+def test_rotation_compresses_segments_and_reads_across_them(tmp_path: Path) -> None:
+    content = "".join(f"line {index} ünïcødé\n" for index in range(200)).encode("utf-8")
+    path = _rotated_log(tmp_path, content, max_bytes=512)
+
+    index = logrotate.load_index(path)
+    assert len(index["segments"]) > 2
+    assert all(segment["file"].endswith(".gz") for segment in index["segments"])
+    assert path.stat().st_size < 512
+
+    tail = logs.tail_lines(path, 150, block_size=64)
+    assert tail.text == "\n".join(content.decode("utf-8").splitlines()[-150:])
+    assert tail.next_offset == len(content)
+
+    collected = b""
+    offset = 0
+    while offset < len(content):
+        chunk = logs.read_from(path, offset, max_bytes=100)
+        collected += chunk.text.encode("utf-8")
+        offset = chunk.next_offset
+    assert collected == content
+    middle = logs.read_range(path, 300, 1300)
+    assert middle.text.encode("utf-8") == content[300:1300]
+
+
+def test_rotation_drops_old_segments_and_clamps_ranges(tmp_path: Path) -> None:
+    content = b"".join(b"%04d\n" % index for index in range(400))
+    path = _rotated_log(tmp_path, content, max_bytes=200, keep=2)
+
+    index = logrotate.load_index(path)
+    first = index["segments"][0]["start"]
+    assert len(index["segments"]) == 2
+    assert sorted(item.name for item in tmp_path.glob("console.log.*.gz")) == sorted(
+        segment["file"] for segment in index["segments"]
+    )
+    assert logs.log_bounds(path) == (first, len(content))
+
+    clamped = logs.read_range(path, 0, first + 10)
+    assert clamped.offset == first
+    assert clamped.text.encode() == content[first : first + 10]
+    assert logs.read_from(path, 0).offset == first
+
+    follower = logs.LogFollower(path, offset=len(content))
+    assert follower.poll() is None
+
+
+def test_rotation_compresses_in_the_background(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "console.log"
+    release = threading.Event()
+    compress = logrotate.RotatingLogWriter._compress
+
+    def slow_compress(self, source: Path, destination: Path) -> None:
+        release.wait(5)
+        compress(self, source, destination)
+
+    monkeypatch.setattr(logrotate.RotatingLogWriter, "_compress", slow_compress)
+    writer = logrotate.RotatingLogWriter(path, max_bytes=10, codec="gzip")
+    writer.write(b"0123456789\n")
+    writer.write(b"after\n")
+
+    # Pane output keeps flowing and the pending segment is readable uncompressed.
+    assert [segment["codec"] for segment in logrotate.load_index(path)["segments"]] == ["none"]
+    assert logs.read_range(path, 0).text == "0123456789\nafter\n"
+    release.set()
+    writer.close()
+
+    (segment,) = logrotate.load_index(path)["segments"]
+    assert (segment["file"], segment["codec"]) == ("console.log.1.gz", "gzip")
+    assert not (tmp_path / "console.log.1").exists()
+    assert logs.read_range(path, 0).text == "0123456789\nafter\n"
+
+
+def test_segment_reads_cache_blocks_not_segments(tmp_path: Path, monkeypatch) -> None:
+    content = b"".join(b"%07d\n" % index for index in range(60000))  # ~480 KiB per segment
+    path = _rotated_log(tmp_path, content, max_bytes=len(content) - 10)
+    opened = []
+    open_segment = logrotate.open_segment
+    monkeypatch.setattr(logrotate, "open_segment", lambda *args: opened.append(args) or open_segment(*args))
+
+    assert logs.tail_lines(path, 20000).text == "\n".join(content.decode().splitlines()[-20000:])
+    collected, offset = b"", 0
+    while offset < len(content):
+        chunk = logs.read_from(path, offset, max_bytes=50000)
+        collected += chunk.text.encode()
+        offset = chunk.next_offset
+
+    assert collected == content
+    assert len(opened) <= 2  # one pass for the tail, one resumed stream for the forward scan
+    assert len(logs._segment_blocks_cache) <= logs._SEGMENT_CACHE_BLOCKS
+
+
+def test_render_line_applies_redraws_and_drops_escapes() -> None:
+    assert logindex.render_line("\x1b[32mok\x1b[0m done\r") == "ok done"
+    assert logindex.render_line("50%\r\x1b[K100%") == "100%"
+    assert logindex.render_line("abc\rX") == "Xbc"
+    assert logindex.render_line("\x1b]0;title\x07$ ls\x1b[5Cx") == "$ ls     x"
+
+
+def test_log_index_reads_line_ranges_incrementally_across_rotation(tmp_path: Path) -> None:
+    content = "".join(f"\x1b[1mline {index}\x1b[0m\r\n" for index in range(1, 301)).encode("utf-8")
+    path = _rotated_log(tmp_path, content, max_bytes=1024)
+    index = logindex.LogIndex(path, checkpoint=16)
+
+    assert index.read_lines(100, 102).text == "line 100\nline 101\nline 102"
+    assert index.read_lines(-2).text == "line 299\nline 300"
+
+    with path.open("ab") as handle:
+        handle.write(b"\x1b[31mError: disk full\x1b[0m\r\npartial")
+    state = index.update()
+    assert state["lines"] == 301
+    assert state["raw_offset"] == len(content) + len(b"\x1b[31mError: disk full\x1b[0m\r\n")
+    assert index.search(logindex.compile_matcher("error", ignore_case=True)) == [{"line": 301, "text": "Error: disk full"}]
+    assert len(index.search(logindex.compile_matcher(r"line \d+0$", regex=True), limit=5)) == 5
+    with pytest.raises(ValueError):
+        logindex.compile_matcher("(", regex=True)
+
+
+def test_log_index_trims_text_but_keeps_line_numbers(tmp_path: Path) -> None:
+    path = tmp_path / "console.log"
+    path.write_bytes(b"".join(b"%04d\n" % index for index in range(1, 1001)))
+    index = logindex.LogIndex(path, checkpoint=10, max_bytes=1000)
+
+    state = index.update()
+    window = index.read_lines(1, max_lines=3)
+
+    assert state["lines"] == 1000 and state["text_size"] <= 1000
+    assert window.first == state["first_line"] > 1
+    assert window.text.splitlines()[0] == "%04d" % window.first
+    assert index.read_lines(1000).text == "1000"
+    assert index.read_lines(1, 3).text == ""
+
+
+def test_log_index_budget_bounds_each_update_and_reports_pending(tmp_path: Path) -> None:
+    path = tmp_path / "console.log"
+    path.write_bytes(b"".join(b"%04d\n" % index for index in range(1, 1001)))  # 5000 bytes
+    index = logindex.LogIndex(path, checkpoint=10)
+
+    window = index.read_lines(-1, budget=1502)
+    assert (window.text, window.pending_bytes) == ("0300", 3500)  # stops at the last whole line
+    assert index.search(logindex.compile_matcher("0301"), budget=0) == []
+
+    state = index.update(budget=4000)
+    assert (state["indexed_bytes"], state["pending_bytes"], state["lines"]) == (3500, 0, 1000)
+    assert index.read_lines(-1, budget=0).to_dict()["pending_bytes"] == 0
+    assert index.search(logindex.compile_matcher("0301"), budget=0) == [{"line": 301, "text": "0301"}]
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List, Optional
+
+import mcp.types as types
+
+from vibestack.mcp.events import BoundedEventStore
+
+
+def _message(request_id: int) -> types.JSONRPCMessage:
+    return types.JSONRPCMessage(types.JSONRPCResponse(jsonrpc="2.0", id=request_id, result={}))
+
+
+def _replay(store, last_event_id: str):
+    seen: List[int] = []
+
+    async def collect(event) -> None:
+        seen.append(event.message.root.id)
+
+    stream: Optional[str] = asyncio.run(store.replay_events_after(last_event_id, collect))
+    return stream, seen
+
+
+def test_event_store_replays_after_last_event_id_per_session() -> None:
+    store = BoundedEventStore(retention=3)
+    first, second = store.for_session("a"), store.for_session("b")
+
+    priming = asyncio.run(first.store_event("1", None))
+    ids = [asyncio.run(first.store_event("1", _message(n))) for n in range(5)]
+    other = asyncio.run(second.store_event("1", _message(99)))
+
+    # Only the newest three events are retained; the priming event is never sent.
+    assert _replay(first, ids[2]) == ("1", [3, 4])
+    assert _replay(first, ids[1]) == (None, [])
+    assert _replay(first, priming) == (None, [])
+    # Sessions share request ids but never see each other's events.
+    assert _replay(second, ids[2]) == (None, [])
+    assert _replay(second, other) == ("1", [])
+
+    store.forget_session("a")
+    assert _replay(first, ids[3]) == (None, [])
+    assert store.stream_count == 1
+
+
+def test_event_store_evicts_idle_and_excess_streams(monkeypatch) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr("vibestack.mcp.events.time.monotonic", lambda: clock[0])
+    store = BoundedEventStore(max_streams=2, ttl=60)
+
+    oldest = asyncio.run(store.store_event("1", _message(1)))
+    kept = asyncio.run(store.store_event("2", _message(2)))
+    asyncio.run(store.store_event("3", _message(3)))
+
+    assert _replay(store, oldest) == (None, [])
+    assert _replay(store, kept) == ("2", [])
+
+    clock[0] += 61
+    assert _replay(store, kept) == (None, [])
+    assert (store.stream_count, store.event_count) == (0, 0)
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+import httpx
+import pytest
+
+from vibestack import api as vibestack_api
+from vibestack.mcp.events import BoundedEventStore, _SessionEventStore
+from vibestack.mcp.resources import SubscriptionHub, parse_uri
+from vibestack.sessions.models import SessionMetadata, SessionType
+from vibestack.sessions.storage import SessionStorage
+
+# ``vibestack.mcp`` re-exports the Server instance under the module's name.
+mcp_server = importlib.import_module("vibestack.mcp.server")
+
+
+@pytest.fixture(autouse=True)
+def reset_manager() -> Iterator[None]:
+    vibestack_api._MANAGER = None  # type: ignore[attr-defined]
+    vibestack_api._MANAGERS.clear()  # type: ignore[attr-defined]
+    try:
+        yield
+    finally:
+        vibestack_api._MANAGER = None  # type: ignore[attr-defined]
+        vibestack_api._MANAGERS.clear()  # type: ignore[attr-defined]
+
+
+def _metadata(
+    storage: SessionStorage,
+    name: str,
+    session_type: SessionType = SessionType.LONG_RUNNING,
+    status: str = "stopped",
+) -> SessionMetadata:
+    return SessionMetadata(
+        name=name,
+        command="bash",
+        template="bash",
+        session_type=session_type,
+        status=status,  # type: ignore[arg-type]
+        created_at="2024-01-01T00:00:00.000000Z",
+        updated_at="2024-01-01T00:00:00.000000Z",
+        log_path=str(storage.log_path(name)),
+        workspace_path=str(storage.workspace_path(name)),
+    )
+
+
+def _call(handler, arguments: Dict[str, Any]) -> Any:
+    (block,) = asyncio.run(handler(arguments))
+    return json.loads(block.text)
+
+
+def test_list_tools_page_with_cursors_and_project_fields(tmp_path: Path) -> None:
+    root = str(tmp_path)
+    storage = vibestack_api.get_manager(root).storage
+    for name in ("c", "a", "d", "b"):
+        storage.save(_metadata(storage, name))
+        storage.add_job({"id": f"job-{name}", "session": name, "status": "completed"})
+
+    (block,) = asyncio.run(mcp_server._handle_list_sessions({"session_root": root, "fields": "name,status"}))
+    assert "\n" not in block.text
+    assert json.loads(block.text) == [{"name": name, "status": "stopped"} for name in "abcd"]
+
+    first = _call(mcp_server._handle_list_sessions, {"session_root": root, "limit": 3, "fields": ["name"]})
+    assert first["sessions"] == [{"name": "a"}, {"name": "b"}, {"name": "c"}]
+    rest = _call(
+        mcp_server._handle_list_sessions,
+        {"session_root": root, "limit": 3, "cursor": first["next_cursor"], "fields": ["name"]},
+    )
+    assert rest == {"sessions": [{"name": "d"}], "next_cursor": None}
+
+    jobs = _call(mcp_server._handle_list_jobs, {"session_root": root, "limit": 2, "fields": "id"})
+    assert jobs["jobs"] == [{"id": "job-c"}, {"id": "job-a"}]
+    jobs = _call(
+        mcp_server._handle_list_jobs,
+        {"session_root": root, "limit": 2, "cursor": jobs["next_cursor"], "fields": "id"},
+    )
+    assert jobs == {"jobs": [{"id": "job-d"}, {"id": "job-b"}], "next_cursor": None}
+
+    for arguments in ({"cursor": "%%%"}, {"cursor": mcp_server._encode_cursor("job-gone")}, {"limit": "ten"}):
+        with pytest.raises(mcp_server.McpError) as error:
+            asyncio.run(mcp_server._handle_list_jobs({"session_root": root, **arguments}))
+        assert error.value.error.code == mcp_server.types.INVALID_PARAMS
+
+
+class _Subscriber:
+    def __init__(self) -> None:
+        self.updates: List[str] = []
+
+    async def send_resource_updated(self, uri: Any) -> None:
+        self.updates.append(str(uri))
+
+
+def test_subscription_hub_notifies_on_log_growth_and_status_change(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("VIBESTACK_SESSION_ROOT", str(tmp_path))
+    storage = vibestack_api.get_manager().storage
+    # A finished one-off keeps the status it was saved with when listed.
+    metadata = _metadata(storage, "watched", SessionType.ONE_OFF, "completed")
+    storage.save(metadata)
+    log_path = Path(metadata.log_path)
+    log_path.write_text("start\n")
+    log_uri, status_uri = "vibestack://sessions/watched/log", "vibestack://sessions/watched/status"
+    hub = SubscriptionHub()
+    first, second = _Subscriber(), _Subscriber()
+
+    async def scenario() -> Tuple[List[str], List[str], List[str]]:
+        await hub.subscribe(parse_uri(log_uri), first)
+        await hub.subscribe(parse_uri(status_uri), first)
+        await hub.subscribe(parse_uri(log_uri + "?lines=5"), second)
+        idle = await hub.poll()
+        with log_path.open("a") as handle:
+            handle.write("more\n")
+        metadata.status = "failed"  # type: ignore[assignment]
+        storage.save(metadata)
+        changed = await hub.poll()
+        hub.unsubscribe(parse_uri(log_uri), second)
+        with log_path.open("a") as handle:
+            handle.write("again\n")
+        return idle, changed, await hub.poll()
+
+    idle, changed, after_unsubscribe = asyncio.run(scenario())
+
+    assert idle == []
+    assert changed == [log_uri, status_uri]
+    assert after_unsubscribe == [log_uri]
+    assert first.updates == [log_uri, status_uri, log_uri]
+    assert second.updates == [log_uri]
+    with pytest.raises(ValueError):
+        asyncio.run(hub.subscribe(parse_uri("vibestack://sessions/missing/log"), first))
+    with pytest.raises(ValueError):
+        parse_uri("vibestack://jobs/1")
+
+
+def test_tool_calls_are_timed_and_exposed_at_metrics() -> None:
+    from starlette.testclient import TestClient
+
+    calls = mcp_server.TOOL_CALLS.value("list_templates")
+    unknown = mcp_server.TOOL_ERRORS.value("(unknown)")
+
+    asyncio.run(mcp_server.call_tool("list_templates", {}))
+    with pytest.raises(mcp_server.McpError):
+        asyncio.run(mcp_server.call_tool("no_such_tool", {}))
+
+    assert mcp_server.TOOL_CALLS.value("list_templates") == calls + 1
+    assert mcp_server.TOOL_ERRORS.value("(unknown)") == unknown + 1
+    assert mcp_server.TOOL_IN_FLIGHT.value("list_templates") == 0
+    assert mcp_server.OFFLOAD_QUEUED.value() == 0
+    response = TestClient(mcp_server.app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'vibestack_mcp_tool_duration_seconds_count{tool="list_templates"}' in response.text
+    assert "vibestack_mcp_offload_running 0" in response.text
+
+
+def test_streamable_http_sessions_get_their_own_event_store(monkeypatch) -> None:
+    # A fresh manager built like SESSION_MANAGER, since run() can only be entered once per instance.
+    session_manager = mcp_server._ResumableSessionManager(app=mcp_server.server, event_store=mcp_server._build_event_store(False))
+    monkeypatch.setattr(mcp_server, "SESSION_MANAGER", session_manager)
+    initialize = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {"protocolVersion": "2025-03-26", "capabilities": {}, "clientInfo": {"name": "pytest", "version": "0"}},
+    }
+    headers = {"accept": "application/json, text/event-stream", "content-type": "application/json"}
+
+    async def scenario() -> Tuple[List[str], Dict[str, Any], Tuple[int, int]]:
+        transport = httpx.ASGITransport(app=mcp_server._handle_streamable_http)
+        async with session_manager.run(), httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            ids = []
+            for _ in range(2):
+                response = await client.post("/", json=initialize, headers=headers)
+                assert response.status_code == 200
+                ids.append(response.headers["mcp-session-id"])
+            stores = {session_id: session_manager._server_instances[session_id]._event_store for session_id in ids}
+            before = session_manager.event_store.stream_count
+            await client.delete("/", headers={"mcp-session-id": ids[0]})
+            return ids, stores, (before, session_manager.event_store.stream_count)
+
+    ids, stores, (before, after) = asyncio.run(scenario())
+    assert isinstance(session_manager.event_store, BoundedEventStore)
+    assert before == 2 and after == 1  # the deleted session's stream is forgotten
+    for session_id in ids:
+        assert isinstance(stores[session_id], _SessionEventStore)
+        assert stores[session_id]._session_id == session_id
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from vibestack.metrics import Registry
+
+
+def test_registry_renders_prometheus_text() -> None:
+    registry = Registry()
+    calls = registry.counter("demo_calls_total", "Calls.", ["tool"])
+    latency = registry.histogram("demo_seconds", "Latency.", ["tool"], buckets=[0.1, 1])
+    registry.gauge("demo_depth", "Depth.", collect=lambda: {(): 3})
+    in_flight = registry.gauge("demo_in_flight", "Running.", ["tool"])
+
+    threads = [threading.Thread(target=lambda: [calls.inc('a"b') for _ in range(1000)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for value in (0.05, 0.5, 5):
+        latency.observe(value, "x")
+    with in_flight.track("x"):
+        assert in_flight.value("x") == 1
+
+    text = registry.render()
+
+    assert '# TYPE demo_calls_total counter\ndemo_calls_total{tool="a\\"b"} 4000\n' in text
+    assert 'demo_seconds_bucket{tool="x",le="0.1"} 1\n' in text
+    assert 'demo_seconds_bucket{tool="x",le="1"} 2\n' in text
+    assert 'demo_seconds_bucket{tool="x",le="+Inf"} 3\n' in text
+    assert 'demo_seconds_sum{tool="x"} 5.55\ndemo_seconds_count{tool="x"} 3\n' in text
+    assert "demo_depth 3\n" in text
+    assert 'demo_in_flight{tool="x"} 0\n' in text
+    assert registry.counter("demo_calls_total", "Calls.", ["tool"]) is calls
+    with pytest.raises(ValueError):
+        registry.gauge("demo_calls_total", "Clash.")
+    with pytest.raises(ValueError):
+        calls.inc()
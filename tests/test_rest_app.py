@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import importlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from vibestack import api as vibestack_api
+from vibestack.sessions.models import SessionMetadata, SessionType
+from vibestack.sessions.reconciler import SESSION_LOG_BYTES, SessionReconciler
+from vibestack.sessions.storage import SessionStorage
+
+# ``vibestack.rest`` re-exports the FastAPI instance under the module's name.
+rest_app = importlib.import_module("vibestack.rest.app")
+
+
+@pytest.fixture(autouse=True)
+def reset_manager() -> Iterator[None]:
+    vibestack_api._MANAGER = None  # type: ignore[attr-defined]
+    vibestack_api._MANAGERS.clear()  # type: ignore[attr-defined]
+    try:
+        yield
+    finally:
+        vibestack_api._MANAGER = None  # type: ignore[attr-defined]
+        vibestack_api._MANAGERS.clear()  # type: ignore[attr-defined]
+
+
+def _save_one_off(storage: SessionStorage, name: str, status: str) -> SessionMetadata:
+    # A finished one-off keeps its saved status when listed, without tmux.
+    metadata = SessionMetadata(
+        name=name,
+        command="true",
+        template="script",
+        session_type=SessionType.ONE_OFF,
+        status=status,  # type: ignore[arg-type]
+        created_at="2024-01-01T00:00:00.000000Z",
+        updated_at="2024-01-01T00:00:00.000000Z",
+        log_path=str(storage.log_path(name)),
+        workspace_path=str(storage.workspace_path(name)),
+    )
+    storage.save(metadata)
+    return metadata
+
+
+def _events(body: str) -> List[Dict[str, Any]]:
+    events = []
+    for block in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields:
+            events.append({"id": int(fields["id"]), "event": fields["event"], **json.loads(fields["data"])})
+    return events
+
+
+def test_log_stream_backfills_resumes_and_resets(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("VIBESTACK_SESSION_ROOT", str(tmp_path))
+    log_path = Path(_save_one_off(vibestack_api.get_manager().storage, "job", "completed").log_path)
+    log_path.write_text("one\ntwo\nthree\n")
+    ticks = [0]
+
+    async def is_disconnected(self) -> bool:
+        # The test client buffers the whole body, so end each stream after a few polls.
+        ticks[0] -= 1
+        return ticks[0] < 0
+
+    monkeypatch.setattr(rest_app.Request, "is_disconnected", is_disconnected)
+    client = TestClient(rest_app.app)
+
+    def stream(polls: int, **headers: str) -> str:
+        ticks[0] = polls
+        response = client.get("/api/sessions/job/log/stream?lines=2&poll_interval=0.05", headers=headers)
+        assert response.headers["content-type"].startswith("text/event-stream")
+        return response.text
+
+    (backfill,) = _events(stream(1))
+    assert (backfill["event"], backfill["log"], backfill["id"]) == ("log", "two\nthree", 14)
+
+    with log_path.open("a") as handle:
+        handle.write("four\n")
+    (resumed,) = _events(stream(1, **{"Last-Event-ID": "14"}))
+    assert (resumed["event"], resumed["log"], resumed["offset"], resumed["id"]) == ("log", "four\n", 14, 19)
+
+    log_path.write_text("new\n")  # truncated and restarted
+    (reset,) = _events(stream(1, **{"Last-Event-ID": "19"}))
+    assert (reset["event"], reset["log"], reset["offset"]) == ("reset", "new\n", 0)
+
+    monkeypatch.setattr(rest_app, "SSE_KEEPALIVE_SECONDS", 0.0)
+    assert ": keep-alive" in stream(2, **{"Last-Event-ID": "4"})
+    assert client.get("/api/sessions/missing/log/stream").status_code == 404
+
+
+def test_metrics_cover_requests_sessions_and_logs(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("VIBESTACK_SESSION_ROOT", str(tmp_path))
+    storage = vibestack_api.get_manager().storage
+    for name, status in (("done", "completed"), ("broken", "failed"), ("gone", "completed")):
+        _save_one_off(storage, name, status)
+    storage.log_path("done").write_text("x" * 10)
+    storage.log_path("gone").write_text("x" * 5)
+
+    # Without the lifespan, so no warm pool is started; session gauges come from reconciler passes.
+    reconciler = SessionReconciler(vibestack_api.get_manager(), interval=60)
+    monkeypatch.setattr(reconciler, "_run", lambda: None)
+    reconciler.start()
+    try:
+        reconciler.reconcile()
+        reconciler.index_logs()
+        assert 'vibestack_session_log_bytes{template="script"} 15\n' in SESSION_LOG_BYTES.render() + "\n"
+        storage.delete("gone")
+        reconciler.reconcile()
+        reconciler.index_logs()
+        client = TestClient(rest_app.app)
+        assert client.get("/api/sessions/missing").status_code == 404
+        response = client.get("/metrics")
+    finally:
+        reconciler.stop()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'vibestack_rest_requests_total{method="GET",route="/api/sessions/{name}",status="404"}' in text
+    assert 'vibestack_rest_request_duration_seconds_count{method="GET",route="/api/sessions/{name}"}' in text
+    assert 'vibestack_sessions{status="completed",template="script"} 1\n' in text
+    assert 'vibestack_sessions{status="failed",template="script"} 1\n' in text
+    assert 'vibestack_session_log_bytes{template="script"} 10\n' in text
+    assert 'status="completed",template="script"} 2' not in text
+    assert 'vibestack_storage_operation_seconds_count{backend="files",operation="list_sessions"}' in text
+    assert "# TYPE vibestack_tmux_commands_total counter" in text
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from vibestack.sessions import SessionManager
+
+
+@pytest.fixture
+def manager(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> SessionManager:
+    monkeypatch.setenv("VIBESTACK_TEMPLATE_DIR", str(tmp_path / "templates"))
+    monkeypatch.setenv("VIBESTACK_USER_TEMPLATE_DIR", str(tmp_path / "user-templates"))
+    monkeypatch.setenv("VIBESTACK_ASSET_DIR", str(tmp_path / "assets"))
+    monkeypatch.setenv("VIBESTACK_USER_ASSET_DIR", str(tmp_path / "user-assets"))
+    manager = SessionManager(session_root=tmp_path / "sessions")
+    launched: List[str] = []
+    monkeypatch.setattr(manager, "_session_exists", lambda name: False)
+    monkeypatch.setattr(
+        manager,
+        "_launch_session",
+        lambda metadata, working_dir=None, extra_env=None: launched.append(metadata.name),
+    )
+    manager.launched = launched  # type: ignore[attr-defined]
+    return manager
+
+
+def _finish(manager: SessionManager, name: str, exit_code: int = 0) -> None:
+    result = manager.storage.session_dir(name) / "result.json"
+    result.write_text(json.dumps({"exit_code": exit_code, "finished_at": "2024-01-01T00:00:00.000000Z"}))
+
+
+def test_dispatch_respects_concurrency_priority_and_template_limits(manager: SessionManager) -> None:
+    manager.scheduler.max_concurrency = 2
+    manager.scheduler.template_limits = {"slow": 1}
+    manager.save_template({"name": "slow", "command": "bash", "session_type": "one_off"})
+
+    first = manager.enqueue_one_off("job-a", "true")
+    manager.enqueue_one_off("job-b", "true", template="slow")
+    manager.enqueue_one_off("job-c", "true", template="slow", priority="high")
+    manager.enqueue_one_off("job-d", "true", priority="low")
+    manager.enqueue_one_off("job-e", "true", priority="high")
+
+    assert first.status == "running"
+    assert manager.launched == ["job-a", "job-b"]  # type: ignore[attr-defined]
+    queue = manager.job_queue()
+    assert queue["queued"] == 3 and queue["running"] == 2
+    assert queue["by_priority"] == {"high": 2, "normal": 0, "low": 1}
+    positions = {job["session"]: job.get("queue_position") for job in manager.list_jobs(status="queued")}
+    assert positions == {"job-c": 1, "job-e": 2, "job-d": 3}
+
+    # job-c is blocked by the template limit, so the freed slot goes to job-e.
+    _finish(manager, "job-a")
+    manager.scheduler.dispatch()
+    assert manager.launched[-1] == "job-e"  # type: ignore[attr-defined]
+    assert manager.get_job(first.job_id)["status"] == "completed"  # type: ignore[arg-type,index]
+
+    _finish(manager, "job-b", exit_code=2)
+    manager.scheduler.dispatch()
+    assert manager.launched[-1] == "job-c"  # type: ignore[attr-defined]
+    started = manager.get_job(manager.storage.load("job-c").job_id)  # type: ignore[union-attr]
+    assert started["status"] == "running" and started["started_at"]  # type: ignore[index]
+    assert manager.list_jobs(status="running")[0]["wait_seconds"] >= 0
+
+
+def test_killing_a_queued_job_cancels_it(manager: SessionManager) -> None:
+    manager.scheduler.max_concurrency = 1
+    manager.enqueue_one_off("job-a", "true")
+    queued = manager.enqueue_one_off("job-b", "true")
+    assert queued.status == "queued"
+    with pytest.raises(ValueError):
+        manager.enqueue_one_off("job-b", "true")
+    with pytest.raises(ValueError):
+        manager.enqueue_one_off("job-c", "true", priority="urgent")
+
+    manager.kill_session("job-b")
+    _finish(manager, "job-a")
+    manager.scheduler.dispatch()
+
+    assert manager.launched == ["job-a"]  # type: ignore[attr-defined]
+    assert manager.storage.load("job-b").status == "stopped"  # type: ignore[union-attr]
+    assert manager.get_job(queued.job_id)["status"] == "stopped"  # type: ignore[arg-type,index]
+    assert manager.job_queue()["queued"] == 0
@@ -0,0 +1,515 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from vibestack.sessions import AsyncSessionManager, SessionManager, SessionMetadata, SessionType
+from vibestack.sessions import manager as manager_module
+from vibestack.sessions.pool import WarmPool
+from vibestack.sessions.reconciler import SessionReconciler
+from vibestack.sessions.screen import ScreenTracker
+from vibestack.sessions.tmux import TmuxControlClient, TmuxControlUnavailable, build_command_line, chain_commands
+
+
+def _seed(manager: SessionManager, name: str) -> SessionMetadata:
+    metadata = SessionMetadata(
+        name=name,
+        command="bash",
+        template="bash",
+        session_type=SessionType.LONG_RUNNING,
+        status="running",
+        created_at="2023-01-01T00:00:00.000000Z",
+        updated_at="2023-01-01T00:00:00.000000Z",
+        log_path=str(manager.storage.log_path(name)),
+        workspace_path=str(manager.storage.workspace_path(name)),
+    )
+    manager.storage.save(metadata)
+    return metadata
+
+
+@pytest.fixture
+def manager(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> SessionManager:
+    monkeypatch.setenv("VIBESTACK_TEMPLATE_DIR", str(tmp_path / "templates"))
+    monkeypatch.setenv("VIBESTACK_USER_TEMPLATE_DIR", str(tmp_path / "user-templates"))
+    monkeypatch.setenv("VIBESTACK_ASSET_DIR", str(tmp_path / "assets"))
+    monkeypatch.setenv("VIBESTACK_USER_ASSET_DIR", str(tmp_path / "user-assets"))
+    return SessionManager(session_root=tmp_path / "sessions")
+
+
+def test_list_sessions_uses_fixed_number_of_tmux_calls(
+    manager: SessionManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for index in range(10):
+        _seed(manager, f"agent-{index}")
+
+    outputs: Dict[str, str] = {
+        "list-sessions": "\n".join(f"agent-{index}\t0\t0" for index in range(0, 10, 2)),
+        "list-panes": "\n".join(
+            f"agent-{index}\t1\t%{index}\t0\t1\tbash\t/tmp" for index in range(0, 10, 2)
+        ),
+        "list-clients": "agent-0\t/dev/pts/1\t1700000000\t80\t24",
+    }
+    calls: List[List[str]] = []
+
+    def fake_capture(args: List[str], env: Dict[str, str] | None = None) -> str:
+        calls.append(args)
+        return outputs.get(args[0], "")
+
+    monkeypatch.setattr(manager, "_capture_tmux", fake_capture)
+
+    sessions = {meta.name: meta for meta in manager.list_sessions()}
+
+    assert len(calls) == 3
+    assert sessions["agent-0"].status == "running"
+    assert sessions["agent-0"].runtime["pane_current_command"] == "bash"
+    assert sessions["agent-0"].runtime["tmux_clients"][0]["client_width"] == 80
+    assert sessions["agent-1"].status == "stopped"
+    assert sessions["agent-1"].runtime == {}
+
+
+def test_reconciler_serves_reads_from_memory_and_persists_only_transitions(
+    manager: SessionManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for index in range(3):
+        _seed(manager, f"agent-{index}")
+    outputs: Dict[str, str] = {
+        "list-sessions": "agent-0\t0\t0",
+        "list-panes": "agent-0\t1\t%0\t0\t1\tbash\t/tmp",
+        "list-clients": "",
+    }
+    calls: List[str] = []
+    saves: List[str] = []
+
+    def fake_capture(args: List[str], env: Dict[str, str] | None = None) -> str:
+        calls.append(args[0])
+        return outputs.get(args[0], "")
+
+    original_save = manager.storage.save
+    monkeypatch.setattr(manager, "_capture_tmux", fake_capture)
+    monkeypatch.setattr(manager.storage, "save", lambda meta: saves.append(meta.name) or original_save(meta))
+    reconciler = SessionReconciler(manager, interval=60)
+
+    reconciler.reconcile()
+    assert sorted(saves) == ["agent-1", "agent-2"]
+    assert manager.storage.load("agent-1").status == "stopped"
+
+    saves.clear()
+    calls.clear()
+    reconciler.reconcile()
+    assert saves == []
+    assert len(calls) == 3
+
+    calls.clear()
+    sessions = {meta.name: meta for meta in reconciler.list_sessions()}
+    assert calls == [] and saves == []
+    assert sessions["agent-0"].runtime["pane_current_command"] == "bash"
+    assert [meta.name for meta in reconciler.list_sessions(status="stopped")] == ["agent-1", "agent-2"]
+
+    sessions["agent-0"].status = "failed"
+    assert reconciler.get_session("agent-0").status == "running"
+    assert reconciler.get_session("missing") is None
+
+
+def test_log_search_shares_an_index_budget_and_reconciler_indexes_the_rest(
+    manager: SessionManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for index in range(2):
+        metadata = _seed(manager, f"agent-{index}")
+        Path(metadata.log_path).write_bytes(b"".join(b"line %04d\n" % line for line in range(200)))  # 2000 bytes
+    manager.log_index_budget = 1500
+    monkeypatch.setattr(manager, "_capture_tmux", lambda args, env=None: "")
+
+    result = manager.search_logs("line", limit=1000)
+    assert len(result["matches"]) == 150 and result["pending_bytes"] == 2500
+    assert manager.read_log_lines("agent-1", -1).pending_bytes == 500  # the read indexed another 1500
+
+    reconciler = SessionReconciler(manager, interval=60)
+    reconciler.reconcile()
+    reconciler.index_logs()
+    result = manager.search_logs("line", limit=1000)
+    assert len(result["matches"]) == 400 and result["pending_bytes"] == 0
+
+    indexed: List[List[str]] = []
+    original_index_logs = manager.index_logs
+    monkeypatch.setattr(
+        manager, "index_logs", lambda sessions: indexed.append([meta.name for meta in sessions]) or original_index_logs(sessions)
+    )
+    reconciler.index_logs()
+    with open(manager.storage.log_path("agent-0"), "ab") as handle:
+        handle.write(b"line 0200\n")
+    reconciler.index_logs()
+    assert indexed == [[], ["agent-0"]]
+
+
+def test_log_rotation_is_opt_in(manager: SessionManager, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    log_path = tmp_path / "console.log"
+    assert manager._pipe_command(log_path) == f"cat >> {log_path}"
+
+    monkeypatch.setenv("VIBESTACK_LOG_MAX_BYTES", "1048576")
+    rotating = SessionManager(session_root=tmp_path / "sessions")
+    assert "-m vibestack.sessions.logrotate" in rotating._pipe_command(log_path)
+    assert "--max-bytes 1048576" in rotating._pipe_command(log_path)
+
+
+def test_unanswered_control_client_falls_back_to_subprocesses(
+    manager: SessionManager, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # A fake tmux whose control client answers the attach and then never again.
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    calls = tmp_path / "calls.log"
+    fake = bin_dir / "tmux"
+    fake.write_text(
+        "#!/bin/sh\n"
+        'if [ "$1" = "-C" ]; then echo "%begin 1 1 0"; echo "%end 1 1 0"; exec cat >/dev/null; fi\n'
+        f'echo "$*" >> {calls}\n'
+        "echo ok\n"
+    )
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}:{os.environ['PATH']}")
+    monkeypatch.setattr(manager_module, "TmuxControlClient", lambda: TmuxControlClient(timeout=0.2))
+    manager.control_mode = True
+
+    result = manager._execute_tmux(["tmux", "list-sessions"], capture=True)
+
+    assert (result.returncode, result.stdout) == (0, "ok\n")
+    assert manager._control_retry_at > time.monotonic()
+    assert not manager._control.alive  # type: ignore[union-attr]
+    logged = calls.read_text().splitlines()
+    assert logged[-1] == "list-sessions" and any(line.startswith("kill-session") for line in logged)
+
+
+def test_control_mode_quoting_round_trips_through_tmux() -> None:
+    client = TmuxControlClient(session_name=f"__pytest_control_{uuid.uuid4().hex[:6]}")
+    if not client.start():
+        pytest.skip("tmux control mode unavailable")
+    try:
+        payload = "it's \"quoted\" ; ~ $HOME"
+        result = client.run(["display-message", "-p", payload])
+        missing = client.run(["has-session", "-t", f"missing-{uuid.uuid4().hex}"])
+        chained = client.run(chain_commands([["display-message", "-p", "one"], ["display-message", "-p", "two;"]]))
+        # tmux skips the rest of a chain after an error; the next result must still line up.
+        aborted = client.run(chain_commands([["has-session", "-t", "missing-chain"], ["display-message", "-p", "x"]]))
+        after = client.run(["display-message", "-p", "after"])
+    finally:
+        client.close()
+
+    assert subprocess.run(["tmux", "has-session", "-t", client.session_name], capture_output=True).returncode != 0
+    assert result.returncode == 0
+    assert result.stdout == payload
+    assert missing.returncode == 1
+    assert chained.stdout == "one\ntwo;"
+    assert aborted.returncode == 1 and after.stdout == "after"
+    with pytest.raises(TmuxControlUnavailable):
+        build_command_line(["send-keys", "line one\nline two"])
+
+
+def test_async_manager_shares_snapshot_parsing(manager: SessionManager, monkeypatch: pytest.MonkeyPatch) -> None:
+    _seed(manager, "agent-0")
+    _seed(manager, "agent-1")
+    async_manager = AsyncSessionManager(manager)
+    outputs = {
+        "list-sessions": "agent-0\t1\t0",
+        "list-panes": "agent-0\t1\t%0\t0\t1\tcodex\t/work",
+        "list-clients": "",
+    }
+    calls: List[str] = []
+
+    async def fake_capture(args: List[str], env: Dict[str, str] | None = None) -> str:
+        calls.append(args[0])
+        return outputs[args[0]]
+
+    monkeypatch.setattr(async_manager, "_capture_tmux", fake_capture)
+
+    sessions = {meta.name: meta for meta in asyncio.run(async_manager.list_sessions())}
+
+    assert sorted(calls) == ["list-clients", "list-panes", "list-sessions"]
+    assert sessions["agent-0"].runtime["pane_current_command"] == "codex"
+    assert sessions["agent-0"].runtime["session_attached"] is True
+    assert sessions["agent-1"].status == "stopped"
+
+
+@pytest.mark.skipif(shutil.which("tmux") is None, reason="tmux not installed")
+def test_async_manager_drives_tmux(manager: SessionManager, monkeypatch: pytest.MonkeyPatch) -> None:
+    async_manager = AsyncSessionManager(manager)
+    name = f"pytest-async-{uuid.uuid4().hex[:6]}"
+    on_loop: List[str] = []
+    for operation in ("load", "save", "add_job", "update_job", "list_sessions"):
+        original = getattr(manager.storage, operation)
+
+        def record(*args, _operation=operation, _original=original, **kwargs):  # type: ignore[no-untyped-def]
+            if threading.current_thread() is threading.main_thread():
+                on_loop.append(_operation)
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(manager.storage, operation, record)
+
+    async def scenario() -> SessionMetadata | None:
+        await async_manager.create_session(name, command="cat")
+        try:
+            await async_manager.send_text(name, "ping")
+            with pytest.raises(ValueError):
+                await async_manager.create_session(name)
+            return await async_manager.get_session(name)
+        finally:
+            await async_manager.kill_session(name)
+
+    running = asyncio.run(scenario())
+
+    # Locked storage I/O runs in worker threads, never on the event loop.
+    assert on_loop == []
+    assert running is not None and running.status == "running"
+    assert manager.get_session(name).status == "stopped"  # type: ignore[union-attr]
+    assert manager.get_job(running.job_id)["status"] == "stopped"  # type: ignore[arg-type,index]
+
+
+@pytest.mark.skipif(shutil.which("tmux") is None, reason="tmux not installed")
+def test_wait_for_job_wakes_on_completion(manager: SessionManager, monkeypatch: pytest.MonkeyPatch) -> None:
+    # With a slice far longer than the job, only the exit signal can end the first wait.
+    monkeypatch.setattr(manager, "JOB_WAIT_SLICE_SECONDS", 120.0)
+    signalled: List[bool] = []
+    wait_for_channel = manager._wait_for_channel
+    monkeypatch.setattr(
+        manager, "_wait_for_channel", lambda channel, timeout: signalled.append(wait_for_channel(channel, timeout)) or signalled[-1]
+    )
+    name = f"pytest-wait-{uuid.uuid4().hex[:6]}"
+    metadata = manager.enqueue_one_off(name, "bash -c 'sleep 0.5; exit 3'")
+    assert metadata.job_id is not None
+    # Keep a session alive so the tmux server outlives the job and the signal is delivered.
+    keeper = f"pytest-keep-{uuid.uuid4().hex[:6]}"
+    manager._run_tmux(["new-session", "-d", "-s", keeper, "sleep 30"])
+    try:
+        job = manager.wait_for_job(metadata.job_id)
+        unfinished = manager.wait_for_job(metadata.job_id, timeout=0)
+    finally:
+        manager._run_tmux(["kill-session", "-t", keeper])
+        if manager._session_exists(name):
+            manager.kill_session(name)
+
+    assert job is not None and job["status"] == "failed"
+    assert job["message"] == "session exited with code 3"
+    assert signalled == [True]
+    assert unfinished is not None and unfinished["status"] == "failed"
+    assert manager.wait_for_job("missing", timeout=0) is None
+    assert asyncio.run(AsyncSessionManager(manager).wait_for_job(metadata.job_id, timeout=1))["status"] == "failed"  # type: ignore[index]
+
+
+@pytest.mark.skipif(shutil.which("tmux") is None, reason="tmux not installed")
+def test_create_session_adopts_warm_pool_session(manager: SessionManager) -> None:
+    template = f"pool{uuid.uuid4().hex[:6]}"
+    manager.save_template({"name": template, "command": "", "env": {"POOL_MARKER": "warm"}})
+    pool = WarmPool(manager, {template: 1})
+    manager.pool = pool
+    name = f"pytest-pool-{uuid.uuid4().hex[:6]}"
+    try:
+        pool.refill()
+        (warm_name,) = [session.name for session in pool._idle[template]]
+        metadata = manager.create_session(
+            name,
+            template=template,
+            command="sh -c 'printenv POOL_MARKER EXTRA; printenv POOL_SECRET | tr a-z A-Z'",
+            env={"EXTRA": "xyz", "POOL_SECRET": "hunter-two"},
+        )
+        assert pool.idle_counts()[template] == 0
+        assert not manager._session_exists(warm_name)
+        assert manager._session_exists(name)
+        deadline = time.monotonic() + 10
+        while "\nwarm\nxyz\nHUNTER-TWO" not in manager.tail_log(name) and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert "\nwarm\nxyz\nHUNTER-TWO" in manager.tail_log(name)
+        # The session environment never passes through the pane, so it stays out of the log.
+        assert "hunter-two" not in Path(metadata.log_path).read_text()
+        assert metadata.status == "running"
+        pool.refill()
+        assert pool.idle_counts()[template] == 1
+    finally:
+        manager.kill_session(name)
+        manager.close()
+    assert pool.idle_counts()[template] == 0
+
+
+def test_batch_operations_report_per_item_results(manager: SessionManager, monkeypatch: pytest.MonkeyPatch) -> None:
+    live = {"existing"}
+    launched: List[str] = []
+    journal_writes: List[int] = []
+    add_jobs = manager.storage.add_jobs
+
+    def fake_launch(metadata: SessionMetadata, working_dir=None, extra_env=None, warm=None) -> None:
+        if metadata.name == "broken":
+            raise RuntimeError("launch failed")
+        launched.append(metadata.name)
+        live.add(metadata.name)
+
+    def fake_run(args: List[str], env: Dict[str, str] | None = None) -> None:
+        if args[0] == "kill-session":
+            live.discard(args[-1])
+
+    def counting_add_jobs(jobs: List[dict]) -> None:
+        journal_writes.append(len(jobs))
+        add_jobs(jobs)
+
+    monkeypatch.setattr(manager, "_capture_tmux", lambda args, env=None: "\n".join(sorted(live)))
+    monkeypatch.setattr(manager, "_launch_session", fake_launch)
+    monkeypatch.setattr(manager, "_run_tmux", fake_run)
+    monkeypatch.setattr(manager.storage, "add_jobs", counting_add_jobs)
+
+    created = manager.create_sessions(
+        [
+            {"name": "agent-1", "command": "cat"},
+            {"name": "agent-2"},
+            {"name": "agent-1"},
+            {"name": "existing"},
+            {"name": "broken"},
+            {"name": "agent-3", "bogus": True},
+        ]
+    )
+
+    assert [(item["name"], item["ok"]) for item in created] == [
+        ("agent-1", True),
+        ("agent-2", True),
+        ("agent-1", False),
+        ("existing", False),
+        ("broken", False),
+        ("agent-3", False),
+    ]
+    assert "already exists" in created[2]["error"] and "bogus" in created[5]["error"]
+    assert sorted(launched) == ["agent-1", "agent-2"]
+    assert journal_writes == [3]
+    assert created[0]["metadata"].status == "running"
+    assert manager.get_job(created[4]["metadata"].job_id)["status"] == "failed"  # type: ignore[index]
+
+    sent = manager.send_texts([{"name": "agent-1", "text": "hi"}, {"name": "missing", "text": "hi"}])
+    assert [item["ok"] for item in sent] == [True, False]
+
+    killed = manager.kill_sessions(["agent-1", "agent-2", "missing"])
+    assert [item["ok"] for item in killed] == [True, True, False]
+    assert manager.storage.load("agent-2").status == "stopped"  # type: ignore[union-attr]
+    assert manager.get_job(created[1]["metadata"].job_id)["status"] == "stopped"  # type: ignore[index]
+
+
+@pytest.mark.skipif(shutil.which("tmux") is None, reason="tmux not installed")
+@pytest.mark.parametrize("control_mode", [False, True])
+def test_broadcast_text_uses_one_tmux_command(
+    manager: SessionManager, monkeypatch: pytest.MonkeyPatch, control_mode: bool
+) -> None:
+    manager.control_mode = control_mode
+    prefix = f"pytest-cast-{uuid.uuid4().hex[:6]}"
+    names = [f"{prefix}-{index}" for index in range(3)]
+    other = f"pytest-other-{uuid.uuid4().hex[:6]}"
+    for name in [*names, other]:
+        manager.create_session(name, command="cat")
+    sent: List[List[str]] = []
+    execute = manager._execute_tmux
+
+    def recording_execute(args: List[str], env: Dict[str, str] | None = None, *, capture: bool):
+        if "send-keys" in args:
+            sent.append(args)
+        return execute(args, env=env, capture=capture)
+
+    monkeypatch.setattr(manager, "_execute_tmux", recording_execute)
+    try:
+        result = manager.broadcast_text("echo hi;", pattern=f"{prefix}-*")
+        explicit = manager.broadcast_text(";", names=[names[0], "missing"], enter=False)
+        deadline = time.monotonic() + 5
+        screens: Dict[str, str] = {}
+        while time.monotonic() < deadline:
+            screens = {name: manager._capture_tmux(["capture-pane", "-p", "-t", name]) for name in [*names, other]}
+            if all("echo hi;" in screens[name] for name in names):
+                break
+            time.sleep(0.1)
+    finally:
+        manager.close()
+        for name in [*names, other]:
+            manager.kill_session(name)
+
+    assert result == {"sessions": names, "missing": []}
+    assert explicit == {"sessions": [names[0]], "missing": ["missing"]}
+    assert len(sent) == 2 and sent[0].count("send-keys") == 3
+    assert all("echo hi;" in screens[name] for name in names)
+    assert screens[names[0]].rstrip().endswith(";")
+    assert "echo hi" not in screens[other]
+    with pytest.raises(ValueError):
+        manager.broadcast_text("noop")
+
+
+@pytest.mark.skipif(shutil.which("tmux") is None, reason="tmux not installed")
+def test_large_input_is_pasted_from_a_buffer(manager: SessionManager, monkeypatch: pytest.MonkeyPatch) -> None:
+    name = f"pytest-paste-{uuid.uuid4().hex[:6]}"
+    manager.create_session(name, command="cat")
+    lines = [f"patch line {index:03d} ; {'x' * 60}" for index in range(80)]
+    payloads: List[bytes] = []
+    run_input = manager._run_tmux_input
+
+    def recording_run_input(args: List[str], stdin: bytes) -> None:
+        payloads.append(stdin)
+        run_input(args, stdin)
+
+    monkeypatch.setattr(manager, "_run_tmux_input", recording_run_input)
+    try:
+        manager.send_text(name, "\n".join(lines))
+        asyncio.run(AsyncSessionManager(manager).send_text(name, "\n".join("async " + line for line in lines)))
+        deadline = time.monotonic() + 10
+        log = ""
+        while time.monotonic() < deadline:
+            log = manager.tail_log(name, lines=400)
+            if "async " + lines[-1] in log:
+                break
+            time.sleep(0.1)
+        buffers = manager._capture_tmux(["list-buffers", "-F", "#{buffer_name}"])
+    finally:
+        manager.kill_session(name)
+
+    assert len(payloads) == 1 and len(payloads[0]) > manager.paste_threshold
+    assert all(line in log for line in lines)
+    assert "async " + lines[-1] in log
+    assert "vibestack-paste-" not in buffers
+    args, stdin = manager._paste_args(["a", "b"], "body\n", enter=False)
+    assert stdin == b"body"
+    assert args.count("paste-buffer") == 2 and args.count("Enter") == 2
+
+
+@pytest.mark.skipif(shutil.which("tmux") is None, reason="tmux not installed")
+def test_capture_pane_returns_changed_rows_since_seq(manager: SessionManager) -> None:
+    name = f"pytest-screen-{uuid.uuid4().hex[:6]}"
+    manager.create_session(name, command="cat")
+    try:
+        first = manager.capture_pane(name)
+        assert first is not None
+        unchanged = manager.capture_pane(name, first["seq"])
+        manager.send_text(name, "screen-marker")
+        deadline = time.monotonic() + 5
+        changed = unchanged
+        while time.monotonic() < deadline:
+            changed = manager.capture_pane(name, first["seq"])
+            if changed and any("screen-marker" in line["text"] for line in changed["lines"]):
+                break
+            time.sleep(0.1)
+        stale = manager.capture_pane(name, 12345)
+    finally:
+        manager.kill_session(name)
+
+    assert first["full"] and len(first["lines"]) == first["height"]
+    assert unchanged == {**first, "since_seq": first["seq"], "full": False, "lines": []}
+    assert changed is not None and changed["seq"] > first["seq"] and not changed["full"]
+    assert 0 < len(changed["lines"]) < changed["height"]
+    assert stale is not None and stale["full"]
+    assert manager.capture_pane(name) is None
+
+
+def test_screen_tracker_expires_old_sequences() -> None:
+    tracker = ScreenTracker(history=2)
+    first, _ = tracker.update("pane", ["a", "b"])
+    second, changed = tracker.update("pane", ["a", "c", "d"], first)
+    assert changed == [1, 2]
+    tracker.update("pane", ["x"])
+    assert tracker.update("pane", ["x"], second)[1] == [0]
+    assert tracker.update("pane", ["x"], first)[1] is None
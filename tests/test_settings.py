@@ -31,3 +31,29 @@ def test_base_override_parameter() -> None:
         base_url="http://localhost:8501",
     )
     assert override.startswith("http://localhost:8501/ui/Sessions")
+
+
+def test_load_settings_is_cached_until_the_file_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings_dir = tmp_path / "settings"
+    monkeypatch.setenv("VIBESTACK_SETTINGS_DIR", str(settings_dir))
+
+    assert vibe_settings.get_session_base_url() == vibe_settings.DEFAULT_SESSION_BASE_URL
+    assert not settings_dir.exists()
+
+    vibe_settings.set_session_base_url("https://one.test")
+    reads: list[Path] = []
+    original = vibe_settings._read_settings
+    monkeypatch.setattr(vibe_settings, "_read_settings", lambda path: reads.append(path) or original(path))
+
+    urls = vibe_settings.build_session_ui_urls([("a", None), ("b", "codex")])
+    vibe_settings.build_session_ui_url("c")
+
+    assert urls == [
+        "https://one.test/ui/Sessions?session=a",
+        "https://one.test/ui/Sessions?session=b&template=codex",
+    ]
+    assert len(reads) == 1
+    (settings_dir / "settings.json").write_text('{"session_base_url": "https://two.test/base"}')
+    assert vibe_settings.get_session_base_url() == "https://two.test/base"
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from vibestack.sessions.models import SessionMetadata, SessionType
+from vibestack.sessions.sqlite_storage import SQLiteSessionStorage
+from vibestack.sessions.storage import SessionStorage, open_storage
+
+
+def _job(job_id: str, status: str = "queued") -> dict:
+    return {
+        "id": job_id,
+        "session": f"session-{job_id}",
+        "template": "script",
+        "command": "true",
+        "status": status,
+        "created_at": "2023-01-01T00:00:00.000000Z",
+        "updated_at": "2023-01-01T00:00:00.000000Z",
+    }
+
+
+def test_job_updates_are_appended_not_rewritten(tmp_path: Path) -> None:
+    storage = SessionStorage(tmp_path)
+    storage.add_job(_job("a"))
+    storage.add_job(_job("b"))
+    snapshot_before = storage.queue_path.read_text()
+
+    storage.update_job_status("a", "completed", message="done")
+
+    assert storage.queue_path.read_text() == snapshot_before
+    assert len(storage.journal_path.read_text().splitlines()) == 3
+    job = storage.get_job("a")
+    assert job is not None
+    assert job["status"] == "completed"
+    assert job["message"] == "done"
+
+
+def test_bulk_job_writes_skip_unknown_ids(tmp_path: Path) -> None:
+    files = SessionStorage(tmp_path / "files")
+    for storage in (files, SQLiteSessionStorage(tmp_path / "sqlite")):
+        storage.add_jobs([_job("a"), _job("b")])
+        storage.update_jobs({"a": {"status": "running"}, "b": {"status": "failed", "message": "boom"}, "missing": {"status": "stopped"}})
+
+        assert storage.get_job("a")["status"] == "running"  # type: ignore[index]
+        assert storage.get_job("b")["message"] == "boom"  # type: ignore[index]
+        assert storage.get_job("missing") is None
+    assert len(files.journal_path.read_text().splitlines()) == 4
+
+
+def test_list_jobs_filters_and_paginates(tmp_path: Path) -> None:
+    storage = SessionStorage(tmp_path)
+    for index in range(6):
+        storage.add_job(_job(str(index), status="running" if index % 2 else "completed"))
+
+    running = storage.list_jobs(status="running")
+    page = storage.list_jobs(limit=2, offset=2)
+
+    assert [job["id"] for job in running] == ["1", "3", "5"]
+    assert [job["id"] for job in page] == ["2", "3"]
+    assert storage.list_jobs(status=["running", "completed"], limit=1)[0]["id"] == "0"
+
+
+def test_list_jobs_resumes_after_a_job_id(tmp_path: Path) -> None:
+    for storage in (SessionStorage(tmp_path / "files"), SQLiteSessionStorage(tmp_path / "sqlite")):
+        for index in range(6):
+            storage.add_job(_job(str(index), status="running" if index % 2 else "completed"))
+
+        assert [job["id"] for job in storage.list_jobs(after="1", limit=2)] == ["2", "3"]
+        assert [job["id"] for job in storage.list_jobs(status="running", after="2")] == ["3", "5"]
+        assert storage.list_jobs(after="5") == []
+        with pytest.raises(ValueError):
+            storage.list_jobs(after="missing")
+
+
+def test_re_adding_a_job_keeps_its_place(tmp_path: Path) -> None:
+    for storage in (SessionStorage(tmp_path / "files"), SQLiteSessionStorage(tmp_path / "sqlite")):
+        storage.add_jobs([_job(job_id) for job_id in "abc"])
+        storage.add_job(_job("a", status="running"))
+        storage.add_jobs([_job("b", status="failed")])
+
+        assert [(job["id"], job["status"]) for job in storage.list_jobs()] == [("a", "running"), ("b", "failed"), ("c", "queued")]
+        assert [job["id"] for job in storage.list_jobs(after="a")] == ["b", "c"]
+
+
+def test_writers_in_other_processes_are_visible_across_compaction(tmp_path: Path) -> None:
+    writer = SessionStorage(tmp_path)
+    reader = SessionStorage(tmp_path)
+    writer.add_job(_job("first"))
+    assert [job["id"] for job in reader.list_jobs()] == ["first"]
+
+    writer.JOURNAL_COMPACT_THRESHOLD = 3
+    writer.add_job(_job("second"))
+    writer.update_job_status("first", "failed")
+
+    assert writer.journal_path.read_text() == ""
+    snapshot = json.loads(writer.queue_path.read_text())
+    assert [job["id"] for job in snapshot["jobs"]] == ["first", "second"]
+    assert reader.get_job("first")["status"] == "failed"  # type: ignore[index]
+    assert [job["id"] for job in reader.list_jobs()] == ["first", "second"]
+
+
+def test_legacy_queue_file_is_used_as_snapshot(tmp_path: Path) -> None:
+    (tmp_path / "queue.json").write_text(json.dumps({"jobs": [_job("legacy", status="running")]}))
+    storage = SessionStorage(tmp_path)
+
+    storage.update_job_status("legacy", "completed")
+
+    assert storage.list_jobs(status="completed")[0]["id"] == "legacy"
+
+
+def _metadata(storage: SessionStorage, name: str, status: str, template: str, updated_at: str) -> SessionMetadata:
+    return SessionMetadata(
+        name=name,
+        command="bash",
+        template=template,
+        session_type=SessionType.LONG_RUNNING,
+        status=status,  # type: ignore[arg-type]
+        created_at="2023-01-01T00:00:00.000000Z",
+        updated_at=updated_at,
+        log_path=str(storage.log_path(name)),
+        workspace_path=str(storage.workspace_path(name)),
+    )
+
+
+def test_sqlite_backend_imports_existing_layout(tmp_path: Path) -> None:
+    files = SessionStorage(tmp_path)
+    files.save(_metadata(files, "legacy", "running", "codex", "2024-01-01T00:00:00.000000Z"))
+    files.add_job(_job("legacy-job", status="running"))
+
+    storage = open_storage(tmp_path, backend="sqlite")
+
+    assert isinstance(storage, SQLiteSessionStorage)
+    loaded = storage.load("legacy")
+    assert loaded is not None and loaded.template == "codex"
+    assert storage.get_job("legacy-job")["status"] == "running"  # type: ignore[index]
+    assert storage.import_directory_layout() == 0
+
+
+def test_sqlite_backend_filters_sessions_and_jobs(tmp_path: Path) -> None:
+    storage = SQLiteSessionStorage(tmp_path)
+    storage.save(_metadata(storage, "a", "running", "codex", "2024-01-01T00:00:00.000000Z"))
+    storage.save(_metadata(storage, "b", "stopped", "codex", "2024-02-01T00:00:00.000000Z"))
+    storage.save(_metadata(storage, "c", "running", "bash", "2024-03-01T00:00:00.000000Z"))
+    for index in range(4):
+        storage.add_job(_job(str(index)))
+    storage.update_job_status("2", "completed")
+
+    assert [meta.name for meta in storage.list_sessions(status="running")] == ["a", "c"]
+    assert [meta.name for meta in storage.list_sessions(template="codex")] == ["a", "b"]
+    assert [meta.name for meta in storage.list_sessions(updated_since="2024-02-01T00:00:00.000000Z")] == ["b", "c"]
+    assert [job["id"] for job in storage.list_jobs(status="queued", limit=2, offset=1)] == ["1", "3"]
+    assert storage.get_job("2")["status"] == "completed"  # type: ignore[index]
+
+    storage.delete("a")
+    assert storage.load("a") is None
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from vibestack.sessions.templates import TemplateRegistry
+
+
+@pytest.fixture
+def registry(tmp_path: Path) -> TemplateRegistry:
+    return TemplateRegistry(
+        repo_root=tmp_path,
+        template_dir=tmp_path / "templates",
+        user_template_dir=tmp_path / "user-templates",
+        asset_dir=tmp_path / "assets",
+        user_asset_dir=tmp_path / "user-assets",
+    )
+
+
+def _write(path: Path, payload: dict, mtime_ns: int) -> None:
+    path.write_text(json.dumps(payload))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_refresh_only_rereads_changed_files(registry: TemplateRegistry, monkeypatch: pytest.MonkeyPatch) -> None:
+    _write(registry.template_dir / "alpha.json", {"name": "alpha", "command": "a"}, 1_000_000_000)
+    _write(registry.user_template_dir / "beta.json", {"name": "beta", "command": "b"}, 1_000_000_000)
+    assert registry.refresh() is True
+    version = registry.version
+
+    parsed: list[str] = []
+    original = TemplateRegistry._parse
+    monkeypatch.setattr(TemplateRegistry, "_parse", staticmethod(lambda file: parsed.append(file.name) or original(file)))
+
+    assert registry.refresh() is False
+    assert registry.version == version
+    assert parsed == []
+
+    _write(registry.user_template_dir / "beta.json", {"name": "beta", "command": "bb"}, 2_000_000_000)
+    assert registry.refresh() is True
+    assert parsed == ["beta.json"]
+    assert registry.templates["beta"]["command"] == "bb"
+    assert registry.version == version + 1
+
+
+def test_user_templates_override_and_removal_restores_builtin(registry: TemplateRegistry) -> None:
+    registry.save_template({"name": "bash", "command": "zsh"})
+    assert registry.templates["bash"]["command"] == "zsh"
+    assert registry.sources["bash"].endswith("bash.json")
+
+    registry.delete_template("bash")
+
+    assert registry.sources["bash"] == "built-in"
+    assert "Welcome" in registry.templates["bash"]["command"]
+    with pytest.raises(ValueError):
+        registry.delete_template("bash")
@@ -2,21 +2,158 @@ from __future__ import annotations
 
 """High-level API helpers for working with VibeStack sessions."""
 
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
 
 from . import settings as vibestack_settings
-from .sessions import SessionManager, SessionMetadata
+from .sessions import AsyncSessionManager, SessionManager, SessionMetadata
+from .sessions.logindex import DEFAULT_MAX_LINES
+from .sessions.logs import DEFAULT_MAX_BYTES
+from .sessions.pool import WarmPool, pool_sizes_from_environment
+from .sessions.reconciler import SessionReconciler, interval_from_environment
+from .sessions.templates import TemplateRegistry
 
 _MANAGER: Optional[SessionManager] = None
+# Managers for explicit ``session_root`` overrides, least recently used first.
+_MANAGERS: "OrderedDict[Path, SessionManager]" = OrderedDict()
+_ASYNC_MANAGERS: Dict[int, AsyncSessionManager] = {}
+_TEMPLATES: Optional[TemplateRegistry] = None
+_RECONCILER: Optional[SessionReconciler] = None
+_LOCK = threading.RLock()
+
+
+def _manager_cache_size() -> int:
+    try:
+        return max(1, int(os.environ.get("VIBESTACK_MANAGER_CACHE_SIZE", "8")))
+    except ValueError:
+        return 8
+
+
+def _template_registry() -> TemplateRegistry:
+    global _TEMPLATES  # type: ignore[global-statement]
+    if _TEMPLATES is None:
+        _TEMPLATES = TemplateRegistry.from_environment(SessionManager.DEFAULT_TEMPLATES)
+    return _TEMPLATES
 
 
 def get_manager(session_root: Optional[str] = None) -> SessionManager:
-    """Return a memoised :class:`SessionManager` instance."""
+    """Return the memoised :class:`SessionManager` for ``session_root``.
+
+    Without ``session_root`` the default manager is returned. Overrides get their
+    own manager, cached per resolved path with LRU eviction
+    (``VIBESTACK_MANAGER_CACHE_SIZE``, default 8). All managers share one
+    template registry. An evicted manager is only dropped from the cache, never
+    closed, since other threads may be mid-call on it; it releases its control
+    client once it is garbage collected.
+    """
     global _MANAGER  # type: ignore[global-statement]
-    if session_root or _MANAGER is None:
-        _MANAGER = SessionManager(session_root=session_root)
-    return _MANAGER
+    with _LOCK:
+        if not session_root:
+            if _MANAGER is None:
+                _MANAGER = SessionManager(templates=_template_registry())
+            return _MANAGER
+        key = Path(session_root).expanduser().resolve()
+        if _MANAGER is not None and _MANAGER.storage.session_root.expanduser().resolve() == key:
+            return _MANAGER
+        manager = _MANAGERS.get(key)
+        if manager is not None:
+            _MANAGERS.move_to_end(key)
+            return manager
+        manager = SessionManager(session_root=key, templates=_template_registry())
+        _MANAGERS[key] = manager
+        while len(_MANAGERS) > _manager_cache_size():
+            _, evicted = _MANAGERS.popitem(last=False)
+            _ASYNC_MANAGERS.pop(id(evicted), None)
+        return manager
+
+
+def get_async_manager(session_root: Optional[str] = None) -> AsyncSessionManager:
+    """Return the :class:`AsyncSessionManager` wrapping :func:`get_manager`'s instance."""
+    manager = get_manager(session_root)
+    with _LOCK:
+        async_manager = _ASYNC_MANAGERS.get(id(manager))
+        if async_manager is None or async_manager.manager is not manager:
+            async_manager = AsyncSessionManager(manager)
+            _ASYNC_MANAGERS[id(manager)] = async_manager
+        return async_manager
+
+
+def start_reconciler() -> Optional[SessionReconciler]:
+    """Start the background status reconciler for the default session root.
+
+    Long-lived servers call this on startup so session reads are answered from
+    memory. ``VIBESTACK_RECONCILE_INTERVAL=0`` keeps the pull-based behaviour.
+    """
+    global _RECONCILER  # type: ignore[global-statement]
+    interval = interval_from_environment()
+    if interval <= 0:
+        return None
+    manager = get_manager()
+    with _LOCK:
+        if _RECONCILER is None or _RECONCILER.manager is not manager:
+            if _RECONCILER is not None:
+                _RECONCILER.stop()
+            _RECONCILER = SessionReconciler(manager, interval=interval)
+        _RECONCILER.start()
+        return _RECONCILER
+
+
+def stop_reconciler() -> None:
+    global _RECONCILER  # type: ignore[global-statement]
+    with _LOCK:
+        reconciler, _RECONCILER = _RECONCILER, None
+    if reconciler is not None:
+        reconciler.stop()
+
+
+def start_warm_pool() -> Optional[WarmPool]:
+    """Keep pre-started shells for the templates in ``VIBESTACK_WARM_POOL``.
+
+    Sessions created through the default manager adopt one when available.
+    """
+    sizes = pool_sizes_from_environment()
+    if not sizes:
+        return None
+    manager = get_manager()
+    with _LOCK:
+        if manager.pool is None:
+            manager.pool = WarmPool(manager, sizes)
+        manager.pool.start()
+        return manager.pool
+
+
+def stop_warm_pool() -> None:
+    with _LOCK:
+        manager = _MANAGER
+        pool = manager.pool if manager is not None else None
+        if manager is not None:
+            manager.pool = None
+    if pool is not None:
+        pool.stop()
+
+
+def _reconciler_for(session_root: Optional[str]) -> Optional[SessionReconciler]:
+    reconciler = _RECONCILER
+    if reconciler is None or not reconciler.running:
+        return None
+    if get_manager(session_root) is not reconciler.manager:
+        return None
+    return reconciler
+
+
+def _observe(session_root: Optional[str], metadata: SessionMetadata) -> None:
+    reconciler = _reconciler_for(session_root)
+    if reconciler is not None:
+        reconciler.observe(metadata)
+
+
+def _observe_stored(session_root: Optional[str], name: str) -> None:
+    reconciler = _reconciler_for(session_root)
+    if reconciler is not None:
+        reconciler.observe_stored(name)
 
 
 def _metadata_to_dict(metadata: SessionMetadata) -> Dict[str, Any]:
@@ -28,14 +165,38 @@ def _metadata_to_dict(metadata: SessionMetadata) -> Dict[str, Any]:
     return payload
 
 
-def list_sessions(session_root: Optional[str] = None) -> List[Dict[str, Any]]:
-    manager = get_manager(session_root)
-    return [_metadata_to_dict(meta) for meta in manager.list_sessions()]
+def _metadata_to_dicts(sessions: List[SessionMetadata]) -> List[Dict[str, Any]]:
+    urls = vibestack_settings.build_session_ui_urls((meta.name, meta.template) for meta in sessions)
+    payloads = []
+    for metadata, url in zip(sessions, urls):
+        payload = metadata.to_api_dict()
+        payload["session_url"] = url
+        payloads.append(payload)
+    return payloads
+
+
+def list_sessions(
+    session_root: Optional[str] = None,
+    *,
+    status: Optional[str | List[str]] = None,
+    template: Optional[str] = None,
+    updated_since: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    reconciler = _reconciler_for(session_root)
+    if reconciler is not None:
+        sessions = reconciler.list_sessions(status=status, template=template, updated_since=updated_since)
+    else:
+        manager = get_manager(session_root)
+        sessions = manager.list_sessions(status=status, template=template, updated_since=updated_since)
+    return _metadata_to_dicts(sessions)
 
 
 def get_session(name: str, session_root: Optional[str] = None) -> Optional[Dict[str, Any]]:
-    manager = get_manager(session_root)
-    metadata = manager.get_session(name)
+    reconciler = _reconciler_for(session_root)
+    if reconciler is not None:
+        metadata = reconciler.get_session(name)
+    else:
+        metadata = get_manager(session_root).get_session(name)
     return _metadata_to_dict(metadata) if metadata else None
 
 
@@ -58,6 +219,7 @@ def create_session(
         working_dir=working_dir,
         description=description,
     )
+    _observe(session_root, metadata)
     return _metadata_to_dict(metadata)
 
 
@@ -67,6 +229,7 @@ def enqueue_one_off(
     *,
     template: str = "script",
     description: Optional[str] = None,
+    priority: Optional[str] = None,
     session_root: Optional[str] = None,
 ) -> Dict[str, Any]:
     manager = get_manager(session_root)
@@ -75,7 +238,9 @@ def enqueue_one_off(
         command,
         template=template,
         description=description,
+        priority=priority,
     )
+    _observe(session_root, metadata)
     return _metadata_to_dict(metadata)
 
 
@@ -87,6 +252,71 @@ def send_text(name: str, text: str, *, enter: bool = True, session_root: Optiona
 def kill_session(name: str, session_root: Optional[str] = None) -> None:
     manager = get_manager(session_root)
     manager.kill_session(name)
+    _observe_stored(session_root, name)
+
+
+def _batch_results(session_root: Optional[str], results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    created = [result["metadata"] for result in results if result.get("metadata") is not None]
+    for metadata in created:
+        _observe(session_root, metadata)
+    payloads = iter(_metadata_to_dicts(created))
+    converted = []
+    for result in results:
+        item = {key: value for key, value in result.items() if key != "metadata"}
+        if result.get("metadata") is not None:
+            item["session"] = next(payloads)
+        converted.append(item)
+    return converted
+
+
+def create_sessions(specs: List[Dict[str, Any]], session_root: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Create several sessions in one call; returns ``{"name", "ok", "error", "session"}`` per spec."""
+
+    manager = get_manager(session_root)
+    return _batch_results(session_root, manager.create_sessions(specs))
+
+
+def kill_sessions(names: List[str], session_root: Optional[str] = None) -> List[Dict[str, Any]]:
+    manager = get_manager(session_root)
+    results = manager.kill_sessions(names)
+    for result in results:
+        _observe_stored(session_root, result["name"])
+    return results
+
+
+def send_texts(items: List[Dict[str, Any]], session_root: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Send ``{"name", "text", "enter"}`` items; returns ``{"name", "ok", "error"}`` per item."""
+
+    manager = get_manager(session_root)
+    return manager.send_texts(items)
+
+
+def broadcast_text(
+    text: str,
+    *,
+    names: Optional[List[str]] = None,
+    template: Optional[str] = None,
+    pattern: Optional[str] = None,
+    enter: bool = True,
+    session_root: Optional[str] = None,
+) -> Dict[str, List[str]]:
+    """Send ``text`` to many sessions at once; see :meth:`SessionManager.broadcast_text`."""
+
+    manager = get_manager(session_root)
+    return manager.broadcast_text(text, names=names, template=template, pattern=pattern, enter=enter)
+
+
+def capture_pane(
+    name: str,
+    *,
+    since_seq: Optional[int] = None,
+    ansi: bool = True,
+    session_root: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Screen of ``name`` with only the lines changed since ``since_seq``; ``None`` if it is not running."""
+
+    manager = get_manager(session_root)
+    return manager.capture_pane(name, since_seq, ansi=ansi)
 
 
 def attach_session(name: str, session_root: Optional[str] = None) -> None:
@@ -99,13 +329,304 @@ def tail_log(name: str, *, lines: int = 200, session_root: Optional[str] = None)
     return manager.tail_log(name, lines=lines)
 
 
-def list_jobs(session_root: Optional[str] = None) -> List[Dict[str, Any]]:
+def read_log(
+    name: str,
+    *,
+    lines: int = 200,
+    offset: Optional[int] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    session_root: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Return ``{"log", "offset", "next_offset"}`` for a tail or an offset read."""
+
+    manager = get_manager(session_root)
+    return manager.read_log(name, lines=lines, offset=offset, max_bytes=max_bytes).to_dict()
+
+
+def read_log_range(
+    name: str,
+    start: int,
+    end: Optional[int] = None,
+    *,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    session_root: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Return ``{"log", "offset", "next_offset"}`` for logical bytes ``[start, end)``."""
+
+    manager = get_manager(session_root)
+    return manager.read_log_range(name, start, end, max_bytes=max_bytes).to_dict()
+
+
+def read_log_lines(
+    name: str,
+    start: int,
+    end: Optional[int] = None,
+    *,
+    max_lines: int = DEFAULT_MAX_LINES,
+    session_root: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Return clean lines ``start..end`` (1-based, inclusive) with ``{"log", "from_line", "to_line", ...}``."""
+
+    manager = get_manager(session_root)
+    return manager.read_log_lines(name, start, end, max_lines=max_lines).to_dict()
+
+
+def search_logs(
+    query: str,
+    *,
+    names: Optional[List[str]] = None,
+    template: Optional[str] = None,
+    regex: bool = False,
+    ignore_case: bool = False,
+    limit: int = 100,
+    session_root: Optional[str] = None,
+) -> Dict[str, Any]:
+    manager = get_manager(session_root)
+    return manager.search_logs(query, names=names, template=template, regex=regex, ignore_case=ignore_case, limit=limit)
+
+
+def list_jobs(
+    session_root: Optional[str] = None,
+    *,
+    status: Optional[str | List[str]] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    after: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    manager = get_manager(session_root)
+    return manager.list_jobs(status=status, limit=limit, offset=offset, after=after)
+
+
+def job_queue(session_root: Optional[str] = None) -> Dict[str, Any]:
+    """Return scheduler queue depth, running counts, limits and the oldest wait."""
+
+    return get_manager(session_root).job_queue()
+
+
+def wait_for_job(
+    job_id: str,
+    *,
+    timeout: Optional[float] = None,
+    session_root: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Block until ``job_id`` completes, fails or stops, or ``timeout`` seconds pass."""
+
     manager = get_manager(session_root)
-    return manager.list_jobs()
+    job = manager.wait_for_job(job_id, timeout=timeout)
+    if job is not None:
+        _observe_stored(session_root, job["session"])
+    return job
+
+
+# ----------------------------------------------------------------------
+# Coroutine variants for the REST and MCP servers
+# ----------------------------------------------------------------------
+async def list_sessions_async(
+    session_root: Optional[str] = None,
+    *,
+    status: Optional[str | List[str]] = None,
+    template: Optional[str] = None,
+    updated_since: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    reconciler = _reconciler_for(session_root)
+    if reconciler is not None and reconciler.ready:
+        sessions = reconciler.list_sessions(status=status, template=template, updated_since=updated_since)
+    else:
+        manager = get_async_manager(session_root)
+        sessions = await manager.list_sessions(status=status, template=template, updated_since=updated_since)
+    return _metadata_to_dicts(sessions)
+
+
+async def get_session_async(name: str, session_root: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    reconciler = _reconciler_for(session_root)
+    metadata = reconciler.lookup(name) if reconciler is not None and reconciler.ready else None
+    if metadata is None:
+        manager = get_async_manager(session_root)
+        metadata = await manager.get_session(name)
+        if metadata is not None and reconciler is not None:
+            reconciler.observe(metadata)
+    return _metadata_to_dict(metadata) if metadata else None
+
+
+async def create_session_async(
+    name: str,
+    *,
+    template: str = "bash",
+    command: Optional[str] = None,
+    command_args: Optional[List[str]] = None,
+    working_dir: Optional[str] = None,
+    description: Optional[str] = None,
+    session_root: Optional[str] = None,
+) -> Dict[str, Any]:
+    manager = get_async_manager(session_root)
+    metadata = await manager.create_session(
+        name,
+        template=template,
+        command=command,
+        command_args=command_args,
+        working_dir=working_dir,
+        description=description,
+    )
+    _observe(session_root, metadata)
+    return _metadata_to_dict(metadata)
+
+
+async def enqueue_one_off_async(
+    name: str,
+    command: str,
+    *,
+    template: str = "script",
+    description: Optional[str] = None,
+    priority: Optional[str] = None,
+    session_root: Optional[str] = None,
+) -> Dict[str, Any]:
+    manager = get_async_manager(session_root)
+    metadata = await manager.enqueue_one_off(
+        name,
+        command,
+        template=template,
+        description=description,
+        priority=priority,
+    )
+    _observe(session_root, metadata)
+    return _metadata_to_dict(metadata)
+
+
+async def send_text_async(name: str, text: str, *, enter: bool = True, session_root: Optional[str] = None) -> None:
+    manager = get_async_manager(session_root)
+    await manager.send_text(name, text, enter=enter)
+
+
+async def kill_session_async(name: str, session_root: Optional[str] = None) -> None:
+    manager = get_async_manager(session_root)
+    await manager.kill_session(name)
+    _observe_stored(session_root, name)
+
+
+async def create_sessions_async(
+    specs: List[Dict[str, Any]],
+    session_root: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    manager = get_async_manager(session_root)
+    return _batch_results(session_root, await manager.create_sessions(specs))
+
+
+async def kill_sessions_async(names: List[str], session_root: Optional[str] = None) -> List[Dict[str, Any]]:
+    manager = get_async_manager(session_root)
+    results = await manager.kill_sessions(names)
+    for result in results:
+        _observe_stored(session_root, result["name"])
+    return results
+
+
+async def send_texts_async(items: List[Dict[str, Any]], session_root: Optional[str] = None) -> List[Dict[str, Any]]:
+    manager = get_async_manager(session_root)
+    return await manager.send_texts(items)
+
+
+async def broadcast_text_async(
+    text: str,
+    *,
+    names: Optional[List[str]] = None,
+    template: Optional[str] = None,
+    pattern: Optional[str] = None,
+    enter: bool = True,
+    session_root: Optional[str] = None,
+) -> Dict[str, List[str]]:
+    manager = get_async_manager(session_root)
+    return await manager.broadcast_text(text, names=names, template=template, pattern=pattern, enter=enter)
+
+
+async def capture_pane_async(
+    name: str,
+    *,
+    since_seq: Optional[int] = None,
+    ansi: bool = True,
+    session_root: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    manager = get_async_manager(session_root)
+    return await manager.capture_pane(name, since_seq, ansi=ansi)
+
+
+async def tail_log_async(name: str, *, lines: int = 200, session_root: Optional[str] = None) -> str:
+    manager = get_async_manager(session_root)
+    return await manager.tail_log(name, lines=lines)
+
+
+async def read_log_async(
+    name: str,
+    *,
+    lines: int = 200,
+    offset: Optional[int] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    session_root: Optional[str] = None,
+) -> Dict[str, Any]:
+    manager = get_async_manager(session_root)
+    return (await manager.read_log(name, lines=lines, offset=offset, max_bytes=max_bytes)).to_dict()
+
+
+async def read_log_range_async(
+    name: str,
+    start: int,
+    end: Optional[int] = None,
+    *,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    session_root: Optional[str] = None,
+) -> Dict[str, Any]:
+    manager = get_async_manager(session_root)
+    return (await manager.read_log_range(name, start, end, max_bytes=max_bytes)).to_dict()
+
+
+async def read_log_lines_async(
+    name: str,
+    start: int,
+    end: Optional[int] = None,
+    *,
+    max_lines: int = DEFAULT_MAX_LINES,
+    session_root: Optional[str] = None,
+) -> Dict[str, Any]:
+    manager = get_async_manager(session_root)
+    return (await manager.read_log_lines(name, start, end, max_lines=max_lines)).to_dict()
+
+
+async def search_logs_async(
+    query: str,
+    *,
+    names: Optional[List[str]] = None,
+    template: Optional[str] = None,
+    regex: bool = False,
+    ignore_case: bool = False,
+    limit: int = 100,
+    session_root: Optional[str] = None,
+) -> Dict[str, Any]:
+    manager = get_async_manager(session_root)
+    return await manager.search_logs(
+        query,
+        names=names,
+        template=template,
+        regex=regex,
+        ignore_case=ignore_case,
+        limit=limit,
+    )
+
+
+async def wait_for_job_async(
+    job_id: str,
+    *,
+    timeout: Optional[float] = None,
+    session_root: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    manager = get_async_manager(session_root)
+    job = await manager.wait_for_job(job_id, timeout=timeout)
+    if job is not None:
+        _observe_stored(session_root, job["session"])
+    return job
 
 
 def list_templates() -> List[Dict[str, Any]]:
     manager = get_manager()
+    # Cheap when nothing changed: only modified template files are re-read.
+    manager.refresh_templates()
     return manager.list_templates()
 
 
@@ -133,16 +654,49 @@ def delete_template(name: str) -> None:
 
 __all__ = [
     "get_manager",
+    "get_async_manager",
+    "start_reconciler",
+    "stop_reconciler",
+    "start_warm_pool",
+    "stop_warm_pool",
     "list_sessions",
     "get_session",
     "create_session",
     "enqueue_one_off",
     "send_text",
     "kill_session",
+    "create_sessions",
+    "kill_sessions",
+    "send_texts",
+    "broadcast_text",
+    "capture_pane",
     "attach_session",
     "tail_log",
+    "read_log",
+    "read_log_range",
+    "read_log_lines",
+    "search_logs",
     "list_jobs",
+    "job_queue",
+    "wait_for_job",
     "list_templates",
     "save_template",
     "delete_template",
+    "list_sessions_async",
+    "get_session_async",
+    "create_session_async",
+    "enqueue_one_off_async",
+    "send_text_async",
+    "kill_session_async",
+    "create_sessions_async",
+    "kill_sessions_async",
+    "send_texts_async",
+    "broadcast_text_async",
+    "capture_pane_async",
+    "tail_log_async",
+    "read_log_async",
+    "read_log_range_async",
+    "read_log_lines_async",
+    "search_logs_async",
+    "wait_for_job_async",
 ]
@@ -0,0 +1,165 @@
+"""Bounded in-memory event store for resumable streamable-HTTP sessions.
+
+With an event store configured the MCP transport tags every SSE event with an
+id, and a client whose stream drops can reconnect with ``Last-Event-ID`` to be
+sent what it missed. Streams are keyed by JSON-RPC request id, which every MCP
+session numbers from the start, so :class:`BoundedEventStore` keeps each
+session's streams apart (see :meth:`BoundedEventStore.for_session`) and bounds
+memory three ways: the newest ``retention`` events per stream, at most
+``max_streams`` streams, and streams idle for ``ttl`` seconds are dropped.
+"""
+
+from __future__ import annotations
+
+import collections
+import itertools
+import secrets
+import time
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Hashable, Optional, Tuple
+
+from mcp.server.streamable_http import EventCallback, EventId, EventMessage, EventStore, StreamId
+from mcp.types import JSONRPCMessage
+
+DEFAULT_RETENTION = 256
+DEFAULT_MAX_STREAMS = 1000
+DEFAULT_TTL = 900.0
+
+_StreamKey = Tuple[Optional[Hashable], StreamId]
+
+
+@dataclass
+class _Stream:
+    stream_id: StreamId
+    touched: float
+    # (event id, message) oldest first; ``None`` marks a priming event.
+    events: Deque[Tuple[EventId, Optional[JSONRPCMessage]]] = field(default_factory=collections.deque)
+
+
+class BoundedEventStore(EventStore):
+    """Keeps recent events per stream so clients can resume with ``Last-Event-ID``.
+
+    Event ids start with a random prefix chosen per store, so ids handed out
+    before a restart are never mistaken for current ones; a client resuming
+    from an unknown, evicted or expired id is told nothing can be replayed.
+    """
+
+    def __init__(
+        self,
+        *,
+        retention: int = DEFAULT_RETENTION,
+        max_streams: int = DEFAULT_MAX_STREAMS,
+        ttl: float = DEFAULT_TTL,
+    ) -> None:
+        self.retention = max(1, retention)
+        self.max_streams = max(1, max_streams)
+        self.ttl = max(0.0, ttl)
+        self._prefix = secrets.token_hex(4)
+        self._counter = itertools.count(1)
+        # Least recently active first.
+        self._streams: "collections.OrderedDict[_StreamKey, _Stream]" = collections.OrderedDict()
+        self._index: Dict[EventId, _StreamKey] = {}
+
+    # ------------------------------------------------------------------
+    # EventStore
+    # ------------------------------------------------------------------
+    async def store_event(self, stream_id: StreamId, message: Optional[JSONRPCMessage]) -> EventId:
+        return self._store(None, stream_id, message)
+
+    async def replay_events_after(self, last_event_id: EventId, send_callback: EventCallback) -> Optional[StreamId]:
+        return await self._replay(None, last_event_id, send_callback)
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+    def for_session(self, session_id: Hashable) -> EventStore:
+        """Return a view of this store whose streams belong to ``session_id`` alone."""
+
+        return _SessionEventStore(self, session_id)
+
+    def forget_session(self, session_id: Hashable) -> None:
+        """Drop every stream recorded for ``session_id``."""
+
+        for key in [key for key in self._streams if key[0] == session_id]:
+            self._drop(key)
+
+    @property
+    def stream_count(self) -> int:
+        return len(self._streams)
+
+    @property
+    def event_count(self) -> int:
+        return len(self._index)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _store(self, session_id: Optional[Hashable], stream_id: StreamId, message: Optional[JSONRPCMessage]) -> EventId:
+        now = time.monotonic()
+        self._expire(now)
+        key = (session_id, stream_id)
+        stream = self._streams.get(key)
+        if stream is None:
+            stream = self._streams[key] = _Stream(stream_id=stream_id, touched=now)
+            while len(self._streams) > self.max_streams:
+                self._drop(next(iter(self._streams)))
+        else:
+            stream.touched = now
+            self._streams.move_to_end(key)
+        event_id = f"{self._prefix}-{next(self._counter)}"
+        stream.events.append((event_id, message))
+        self._index[event_id] = key
+        while len(stream.events) > self.retention:
+            evicted, _ = stream.events.popleft()
+            self._index.pop(evicted, None)
+        return event_id
+
+    async def _replay(
+        self,
+        session_id: Optional[Hashable],
+        last_event_id: EventId,
+        send_callback: EventCallback,
+    ) -> Optional[StreamId]:
+        self._expire(time.monotonic())
+        key = self._index.get(last_event_id)
+        if key is None or key[0] != session_id:
+            return None
+        stream = self._streams[key]
+        # Copy first: sending yields to the event loop, where new events may arrive.
+        events = list(stream.events)
+        position = next(index for index, (event_id, _) in enumerate(events) if event_id == last_event_id)
+        for event_id, message in events[position + 1:]:
+            if message is not None:
+                await send_callback(EventMessage(message, event_id))
+        return stream.stream_id
+
+    def _expire(self, now: float) -> None:
+        if not self.ttl:
+            return
+        while self._streams:
+            key, stream = next(iter(self._streams.items()))
+            if now - stream.touched < self.ttl:
+                break
+            self._drop(key)
+
+    def _drop(self, key: _StreamKey) -> None:
+        stream = self._streams.pop(key, None)
+        if stream is None:
+            return
+        for event_id, _ in stream.events:
+            self._index.pop(event_id, None)
+
+
+class _SessionEventStore(EventStore):
+    def __init__(self, store: BoundedEventStore, session_id: Hashable) -> None:
+        self._store = store
+        self._session_id = session_id
+
+    async def store_event(self, stream_id: StreamId, message: Optional[JSONRPCMessage]) -> EventId:
+        return self._store._store(self._session_id, stream_id, message)
+
+    async def replay_events_after(self, last_event_id: EventId, send_callback: EventCallback) -> Optional[StreamId]:
+        return await self._store._replay(self._session_id, last_event_id, send_callback)
+
+
+__all__ = ["BoundedEventStore", "DEFAULT_MAX_STREAMS", "DEFAULT_RETENTION", "DEFAULT_TTL"]
@@ -0,0 +1,191 @@
+"""MCP resources for session logs and status, with change subscriptions.
+
+Each session is exposed as two resources::
+
+    vibestack://sessions/{name}/log      recent output (``?lines=N`` or ``?offset=N``)
+    vibestack://sessions/{name}/status   session metadata
+
+Clients that ``resources/subscribe`` to one receive ``notifications/resources/updated``
+when the log grows or the session's status changes, then read the resource
+for the new content. :class:`SubscriptionHub` polls on behalf of every
+subscriber: one :class:`~vibestack.sessions.logs.LogFollower` per followed log
+and one session listing per tick for status, however many clients subscribe.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import parse_qs, quote, unquote
+
+import anyio
+from pydantic import AnyUrl
+
+from vibestack import api as vibestack_api
+from vibestack.sessions.logs import LogFollower
+
+logger = logging.getLogger(__name__)
+
+LOG_URI_TEMPLATE = "vibestack://sessions/{name}/log"
+STATUS_URI_TEMPLATE = "vibestack://sessions/{name}/status"
+DEFAULT_POLL_INTERVAL = 1.0
+
+_URI = re.compile(r"^vibestack://sessions/(?P<name>[^/?#]+)/(?P<kind>log|status)(?:\?(?P<query>[^#]*))?$")
+
+
+@dataclass(frozen=True)
+class SessionResource:
+    """A parsed ``vibestack://sessions/...`` URI."""
+
+    name: str
+    kind: str
+    query: str = ""
+
+    @property
+    def uri(self) -> str:
+        """Canonical URI without the query; subscriptions are keyed by it."""
+
+        return f"vibestack://sessions/{quote(self.name, safe='')}/{self.kind}"
+
+    def param(self, key: str) -> Optional[str]:
+        values = parse_qs(self.query).get(key)
+        return values[-1] if values else None
+
+
+def parse_uri(uri: Any) -> SessionResource:
+    """Parse a session resource URI; raises :class:`ValueError` for anything else."""
+
+    match = _URI.match(str(uri))
+    if match is None:
+        raise ValueError(f"Unknown resource: {uri}")
+    return SessionResource(name=unquote(match.group("name")), kind=match.group("kind"), query=match.group("query") or "")
+
+
+def resource_uris(name: str) -> Dict[str, str]:
+    encoded = quote(name, safe="")
+    return {
+        "log": LOG_URI_TEMPLATE.format(name=encoded),
+        "status": STATUS_URI_TEMPLATE.format(name=encoded),
+    }
+
+
+class SubscriptionHub:
+    """Tracks resource subscriptions per MCP session and notifies them of changes.
+
+    Subscribers are held weakly, so a client that goes away without
+    unsubscribing is dropped once its session is collected; a failed
+    notification drops it straight away. The polling task sleeps while there
+    are no subscriptions.
+    """
+
+    def __init__(self, *, interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        self.interval = max(0.05, interval)
+        self._subscribers: Dict[str, "weakref.WeakSet[Any]"] = {}
+        self._followers: Dict[str, LogFollower] = {}
+        self._statuses: Dict[str, Optional[str]] = {}
+        self._wakeup: Optional[anyio.Event] = None
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+    async def subscribe(self, resource: SessionResource, session: Any) -> None:
+        """Subscribe ``session`` (an MCP ``ServerSession``) to ``resource``.
+
+        Raises :class:`ValueError` if the VibeStack session does not exist.
+        """
+
+        metadata = await vibestack_api.get_session_async(resource.name)
+        if metadata is None:
+            raise ValueError(f"Session '{resource.name}' not found")
+        uri = resource.uri
+        if resource.kind == "log" and uri not in self._followers:
+            log_path = Path(metadata["log_path"])
+            follower = LogFollower(log_path)
+            await anyio.to_thread.run_sync(follower.check)  # start from the current end
+            self._followers[uri] = follower
+        elif resource.kind == "status":
+            self._statuses.setdefault(uri, metadata.get("status"))
+        self._subscribers.setdefault(uri, weakref.WeakSet()).add(session)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def unsubscribe(self, resource: SessionResource, session: Any) -> None:
+        subscribers = self._subscribers.get(resource.uri)
+        if subscribers is not None:
+            subscribers.discard(session)
+        self._prune()
+
+    @property
+    def subscription_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+    async def run(self) -> None:
+        """Poll followed logs and statuses until cancelled."""
+
+        while True:
+            self._prune()
+            if not self._subscribers:
+                self._wakeup = anyio.Event()
+                await self._wakeup.wait()
+                continue
+            try:
+                await self.poll()
+            except Exception:  # pragma: no cover - keep following after unexpected errors
+                logger.exception("Resource subscription poll failed")
+            await anyio.sleep(self.interval)
+
+    async def poll(self) -> List[str]:
+        """Check every subscribed resource once and notify subscribers; returns the changed URIs."""
+
+        changed: List[str] = []
+        followers = list(self._followers.items())
+        if followers:
+            grown = await anyio.to_thread.run_sync(lambda: [uri for uri, follower in followers if follower.check()])
+            changed.extend(grown)
+        if self._statuses:
+            sessions = await vibestack_api.list_sessions_async()
+            current = {resource_uris(item["name"])["status"]: item.get("status") for item in sessions}
+            for uri, previous in list(self._statuses.items()):
+                status = current.get(uri)
+                if status != previous:
+                    self._statuses[uri] = status
+                    changed.append(uri)
+        for uri in changed:
+            await self._notify(uri)
+        return changed
+
+    async def _notify(self, uri: str) -> None:
+        subscribers = self._subscribers.get(uri)
+        if not subscribers:
+            return
+        for session in list(subscribers):
+            try:
+                await session.send_resource_updated(AnyUrl(uri))
+            except Exception:
+                logger.debug("Dropping subscriber of %s after a failed notification", uri, exc_info=True)
+                subscribers.discard(session)
+
+    def _prune(self) -> None:
+        stale: Set[str] = {uri for uri, subscribers in self._subscribers.items() if not subscribers}
+        for uri in stale:
+            self._subscribers.pop(uri, None)
+            self._followers.pop(uri, None)
+            self._statuses.pop(uri, None)
+
+
+__all__ = [
+    "DEFAULT_POLL_INTERVAL",
+    "LOG_URI_TEMPLATE",
+    "STATUS_URI_TEMPLATE",
+    "SessionResource",
+    "SubscriptionHub",
+    "parse_uri",
+    "resource_uris",
+]
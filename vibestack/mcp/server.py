@@ -1,6 +1,7 @@
 """Streamable HTTP MCP server exposing VibeStack session controls."""
 from __future__ import annotations
 
+import base64
 import contextlib
 import functools
 import json
@@ -12,15 +13,27 @@ from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
 import anyio
 import mcp.types as types
 from mcp import McpError
-from mcp.server.lowlevel import Server
+from mcp.server.lowlevel import NotificationOptions, Server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
 from starlette.applications import Starlette
 from starlette.middleware.cors import CORSMiddleware
-from starlette.routing import Mount
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route
 from starlette.types import Receive, Scope, Send
 
 from vibestack import api as vibestack_api
+from vibestack import metrics
 from vibestack import settings as vibestack_settings
+from vibestack.mcp.events import DEFAULT_MAX_STREAMS, DEFAULT_RETENTION, DEFAULT_TTL, BoundedEventStore
+from vibestack.mcp.resources import (
+    LOG_URI_TEMPLATE,
+    STATUS_URI_TEMPLATE,
+    SubscriptionHub,
+    parse_uri,
+    resource_uris,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +59,29 @@ def _env_bool(name: str, default: bool = False) -> bool:
     return value.lower() in {"1", "true", "yes", "on"}
 
 
+# Tool results go straight into model context; indentation only costs tokens.
+JSON_INDENT = _env_int("VIBESTACK_MCP_JSON_INDENT", 0)
+
+TOOL_CALLS = metrics.REGISTRY.counter("vibestack_mcp_tool_calls_total", "MCP tool calls, by tool.", ["tool"])
+TOOL_ERRORS = metrics.REGISTRY.counter(
+    "vibestack_mcp_tool_errors_total",
+    "MCP tool calls that failed, by tool; unknown tool names are counted as '(unknown)'.",
+    ["tool"],
+)
+TOOL_DURATION = metrics.REGISTRY.histogram(
+    "vibestack_mcp_tool_duration_seconds", "MCP tool call latency in seconds, by tool.", ["tool"]
+)
+TOOL_IN_FLIGHT = metrics.REGISTRY.gauge(
+    "vibestack_mcp_tool_calls_in_flight", "MCP tool calls currently running, by tool.", ["tool"]
+)
+OFFLOAD_QUEUED = metrics.REGISTRY.gauge(
+    "vibestack_mcp_offload_queued", "Blocking calls from MCP tools waiting for a worker thread."
+)
+OFFLOAD_RUNNING = metrics.REGISTRY.gauge(
+    "vibestack_mcp_offload_running", "Blocking calls from MCP tools running on worker threads."
+)
+
+
 def _build_session_url(name: str, template: Optional[str]) -> str:
     base_override = os.environ.get("VIBESTACK_SESSION_FOLLOW_BASE")
     if base_override is not None:
@@ -67,12 +103,83 @@ def _augment_session(metadata: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def _augment_sessions(items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    return [_augment_session(item) for item in items]
+    payloads = [dict(item) for item in items]
+    base_override = os.environ.get("VIBESTACK_SESSION_FOLLOW_BASE")
+    # vibestack.api already attached URLs for the configured base; only an override
+    # needs them rebuilt, and then the base is resolved once for the whole listing.
+    pending = [
+        payload
+        for payload in payloads
+        if payload.get("name") and (base_override is not None or not payload.get("session_url"))
+    ]
+    if pending:
+        urls = vibestack_settings.build_session_ui_urls(
+            ((payload["name"], payload.get("template")) for payload in pending),
+            base_url=base_override,
+        )
+        for payload, url in zip(pending, urls):
+            payload["session_url"] = url
+    return payloads
+
+
+def _dump_json(payload: Any) -> str:
+    if JSON_INDENT > 0:
+        return json.dumps(payload, indent=JSON_INDENT, sort_keys=True)
+    return json.dumps(payload, separators=(",", ":"), sort_keys=True)
 
 
 def _as_json(payload: Any) -> List[types.ContentBlock]:
-    serialized = json.dumps(payload, indent=2, sort_keys=True)
-    return [types.TextContent(type="text", text=serialized)]
+    return [types.TextContent(type="text", text=_dump_json(payload))]
+
+
+def _coerce_fields(value: Any) -> Optional[List[str]]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.split(",")
+    fields = [str(item).strip() for item in value if str(item).strip()]
+    return fields or None
+
+
+def _project(payload: Any, fields: Optional[List[str]]) -> Any:
+    """Keep only ``fields`` of a record (or of each record in a list)."""
+
+    if fields is None:
+        return payload
+    if isinstance(payload, list):
+        return [_project(item, fields) for item in payload]
+    if isinstance(payload, dict):
+        return {key: payload[key] for key in fields if key in payload}
+    return payload
+
+
+def _encode_cursor(key: str) -> str:
+    return base64.urlsafe_b64encode(key.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: Any) -> Optional[str]:
+    if cursor is None or cursor == "":
+        return None
+    try:
+        return base64.b64decode(str(cursor).encode("ascii"), altchars=b"-_", validate=True).decode("utf-8")
+    except (ValueError, UnicodeError):
+        raise McpError(types.ErrorData(code=types.INVALID_PARAMS, message="Invalid cursor")) from None
+
+
+def _coerce_limit(value: Any) -> Optional[int]:
+    if not value:
+        return None
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        raise McpError(types.ErrorData(code=types.INVALID_PARAMS, message="Invalid limit")) from None
+
+
+def _coerce_offset(value: Any) -> int:
+    try:
+        return max(0, int(value or 0))
+    except (TypeError, ValueError):
+        raise McpError(types.ErrorData(code=types.INVALID_PARAMS, message="Invalid offset")) from None
 
 
 def _as_text(message: str) -> List[types.ContentBlock]:
@@ -115,29 +222,61 @@ async def _run_sync(func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> A
     if kwargs:
         # functools.partial preserves argument semantics for thread offloading.
         func = functools.partial(func, *args, **kwargs)
-        return await anyio.to_thread.run_sync(func)
-    return await anyio.to_thread.run_sync(func, *args)
+        args = ()
+    started = False
+
+    def run() -> Any:
+        nonlocal started
+        started = True
+        OFFLOAD_QUEUED.dec()
+        with OFFLOAD_RUNNING.track():
+            return func(*args)
+
+    OFFLOAD_QUEUED.inc()
+    try:
+        return await anyio.to_thread.run_sync(run)
+    finally:
+        if not started:  # cancelled before a worker thread picked it up
+            OFFLOAD_QUEUED.dec()
 
 
 async def _handle_list_sessions(arguments: Dict[str, Any]) -> List[types.ContentBlock]:
     session_root = _coerce_session_root(arguments.get("session_root"))
-    sessions = await _run_sync(vibestack_api.list_sessions, session_root=session_root)
-    return _as_json(_augment_sessions(sessions))
+    fields = _coerce_fields(arguments.get("fields"))
+    sessions = await vibestack_api.list_sessions_async(
+        session_root=session_root,
+        status=arguments.get("status") or None,
+        template=arguments.get("template") or None,
+        updated_since=arguments.get("updated_since") or None,
+    )
+    limit = _coerce_limit(arguments.get("limit"))
+    after = _decode_cursor(arguments.get("cursor"))
+    if limit is None and after is None:
+        return _as_json(_project(_augment_sessions(sessions), fields))
+    # Sessions are listed by name, so a cursor holding the last name seen stays
+    # valid when sessions are created or removed between pages.
+    sessions = sorted(sessions, key=lambda item: item.get("name") or "")
+    if after is not None:
+        sessions = [item for item in sessions if (item.get("name") or "") > after]
+    page = sessions if limit is None else sessions[:limit]
+    next_cursor = _encode_cursor(page[-1].get("name") or "") if len(page) < len(sessions) else None
+    return _as_json({"sessions": _project(_augment_sessions(page), fields), "next_cursor": next_cursor})
 
 
 async def _handle_get_session(arguments: Dict[str, Any]) -> List[types.ContentBlock]:
     name = arguments["name"]
     session_root = _coerce_session_root(arguments.get("session_root"))
-    session = await _run_sync(vibestack_api.get_session, name, session_root=session_root)
-    return _as_json(_augment_session(session) if session else None)
+    session = await vibestack_api.get_session_async(name, session_root=session_root)
+    if session is None:
+        return _as_json(None)
+    return _as_json(_project(_augment_session(session), _coerce_fields(arguments.get("fields"))))
 
 
 async def _handle_create_session(arguments: Dict[str, Any]) -> List[types.ContentBlock]:
     name = arguments["name"]
     template_name = arguments.get("template") or DEFAULT_TEMPLATE
     session_root = _coerce_session_root(arguments.get("session_root"))
-    metadata = await _run_sync(
-        vibestack_api.create_session,
+    metadata = await vibestack_api.create_session_async(
         name,
         template=template_name,
         command=arguments.get("command"),
@@ -156,8 +295,7 @@ async def _handle_create_session(arguments: Dict[str, Any]) -> List[types.Conten
             if delay_ms > 0:
                 await anyio.sleep(delay_ms / 1000.0)
         
-        await _run_sync(
-            vibestack_api.send_text,
+        await vibestack_api.send_text_async(
             name,
             prompt,
             enter=True,
@@ -166,6 +304,76 @@ async def _handle_create_session(arguments: Dict[str, Any]) -> List[types.Conten
     return _as_json(_augment_session(metadata))
 
 
+async def _handle_batch_create_sessions(arguments: Dict[str, Any]) -> List[types.ContentBlock]:
+    session_root = _coerce_session_root(arguments.get("session_root"))
+    items = arguments.get("sessions") or []
+    specs = []
+    prompts: Dict[str, str] = {}
+    for item in items:
+        spec = {key: item[key] for key in ("name", "template", "command", "command_args", "working_dir", "description") if item.get(key) is not None}
+        spec.setdefault("template", DEFAULT_TEMPLATE)
+        specs.append(spec)
+        if item.get("prompt") and item.get("name"):
+            prompts[str(item["name"])] = str(item["prompt"])
+    results = await vibestack_api.create_sessions_async(specs, session_root=session_root)
+    created = {result["name"]: result for result in results if result["ok"]}
+    pending = [name for name in prompts if name in created]
+    if pending:
+        templates = {t.get("name"): t for t in await _run_sync(vibestack_api.list_templates)}
+        delay_ms = max(
+            (templates.get(created[name]["session"].get("template"), {}).get("prompt_delay_ms", 0) for name in pending),
+            default=0,
+        )
+        if delay_ms > 0:
+            await anyio.sleep(delay_ms / 1000.0)
+        sent = await vibestack_api.send_texts_async(
+            [{"name": name, "text": prompts[name], "enter": True} for name in pending],
+            session_root=session_root,
+        )
+        for outcome in sent:
+            created[outcome["name"]]["prompt_sent"] = outcome["ok"]
+    for result in results:
+        if result.get("session"):
+            result["session"] = _augment_session(result["session"])
+    return _as_json(results)
+
+
+async def _handle_batch_kill_sessions(arguments: Dict[str, Any]) -> List[types.ContentBlock]:
+    session_root = _coerce_session_root(arguments.get("session_root"))
+    names = [str(name) for name in arguments.get("names") or []]
+    return _as_json(await vibestack_api.kill_sessions_async(names, session_root=session_root))
+
+
+async def _handle_batch_send_input(arguments: Dict[str, Any]) -> List[types.ContentBlock]:
+    session_root = _coerce_session_root(arguments.get("session_root"))
+    items = [
+        {
+            "name": str(item.get("name") or ""),
+            "text": str(item.get("text") or ""),
+            "enter": _coerce_enter_flag(item.get("enter"), default=True),
+        }
+        for item in arguments.get("items") or []
+    ]
+    return _as_json(await vibestack_api.send_texts_async(items, session_root=session_root))
+
+
+async def _handle_broadcast_input(arguments: Dict[str, Any]) -> List[types.ContentBlock]:
+    session_root = _coerce_session_root(arguments.get("session_root"))
+    names = arguments.get("names")
+    try:
+        result = await vibestack_api.broadcast_text_async(
+            str(arguments.get("text") or ""),
+            names=[str(name) for name in names] if names is not None else None,
+            template=arguments.get("template"),
+            pattern=arguments.get("pattern"),
+            enter=_coerce_enter_flag(arguments.get("enter"), default=True),
+            session_root=session_root,
+        )
+    except ValueError as exc:
+        raise McpError(types.ErrorData(code=types.INVALID_PARAMS, message=str(exc))) from exc
+    return _as_json(result)
+
+
 async def _handle_send_input(arguments: Dict[str, Any]) -> List[types.ContentBlock]:
     name = arguments["name"]
     session_root = _coerce_session_root(arguments.get("session_root"))
@@ -179,8 +387,7 @@ async def _handle_send_input(arguments: Dict[str, Any]) -> List[types.ContentBlo
         raw_text = ""
     text = str(raw_text)
     enter = _coerce_enter_flag(arguments.get("enter"), default=True)
-    await _run_sync(
-        vibestack_api.send_text,
+    await vibestack_api.send_text_async(
         name,
         text,
         enter=enter,
@@ -192,39 +399,121 @@ async def _handle_send_input(arguments: Dict[str, Any]) -> List[types.ContentBlo
 async def _handle_tail_log(arguments: Dict[str, Any]) -> List[types.ContentBlock]:
     name = arguments["name"]
     lines = int(arguments.get("lines", 200) or 200)
+    offset = arguments.get("offset")
     session_root = _coerce_session_root(arguments.get("session_root"))
-    log_output = await _run_sync(
-        vibestack_api.tail_log,
+    if arguments.get("from_line") is not None or arguments.get("to_line") is not None:
+        to_line = arguments.get("to_line")
+        chunk = await vibestack_api.read_log_lines_async(
+            name,
+            int(arguments.get("from_line") or 1),
+            int(to_line) if to_line is not None else None,
+            max_lines=lines,
+            session_root=session_root,
+        )
+        return _as_json(chunk)
+    chunk = await vibestack_api.read_log_async(
         name,
         lines=lines,
+        offset=int(offset) if offset is not None else None,
         session_root=session_root,
     )
-    return _as_json({"log": log_output})
+    return _as_json(chunk)
+
+
+async def _handle_capture_pane(arguments: Dict[str, Any]) -> List[types.ContentBlock]:
+    name = arguments["name"]
+    since_seq = arguments.get("since_seq")
+    session_root = _coerce_session_root(arguments.get("session_root"))
+    screen = await vibestack_api.capture_pane_async(
+        name,
+        since_seq=int(since_seq) if since_seq is not None else None,
+        ansi=bool(arguments.get("ansi", False)),
+        session_root=session_root,
+    )
+    if screen is None:
+        raise McpError(
+            types.ErrorData(code=types.INVALID_PARAMS, message=f"Session '{name}' is not running"),
+        )
+    return _as_json(screen)
+
+
+async def _handle_search_logs(arguments: Dict[str, Any]) -> List[types.ContentBlock]:
+    session_root = _coerce_session_root(arguments.get("session_root"))
+    names = arguments.get("names")
+    try:
+        result = await vibestack_api.search_logs_async(
+            str(arguments.get("query") or ""),
+            names=[str(name) for name in names] if names is not None else None,
+            template=arguments.get("template"),
+            regex=bool(arguments.get("regex", False)),
+            ignore_case=bool(arguments.get("ignore_case", False)),
+            limit=int(arguments.get("limit", 50) or 50),
+            session_root=session_root,
+        )
+    except ValueError as exc:
+        raise McpError(types.ErrorData(code=types.INVALID_PARAMS, message=str(exc))) from exc
+    return _as_json(result)
 
 
 async def _handle_kill_session(arguments: Dict[str, Any]) -> List[types.ContentBlock]:
     name = arguments["name"]
     session_root = _coerce_session_root(arguments.get("session_root"))
-    await _run_sync(vibestack_api.kill_session, name, session_root=session_root)
+    await vibestack_api.kill_session_async(name, session_root=session_root)
     return _as_text("session terminated")
 
 
 async def _handle_list_jobs(arguments: Dict[str, Any]) -> List[types.ContentBlock]:
     session_root = _coerce_session_root(arguments.get("session_root"))
-    jobs = await _run_sync(vibestack_api.list_jobs, session_root=session_root)
-    return _as_json(jobs)
+    fields = _coerce_fields(arguments.get("fields"))
+    limit = _coerce_limit(arguments.get("limit"))
+    after = _decode_cursor(arguments.get("cursor"))
+    offset = _coerce_offset(arguments.get("offset"))
+    try:
+        jobs = await _run_sync(
+            vibestack_api.list_jobs,
+            session_root=session_root,
+            status=arguments.get("status") or None,
+            # One extra job tells whether another page follows.
+            limit=limit + 1 if limit else None,
+            offset=offset,
+            after=after,
+        )
+    except ValueError:
+        # The job behind the cursor is gone; an empty page would read as the end of the list.
+        raise McpError(types.ErrorData(code=types.INVALID_PARAMS, message="Invalid cursor")) from None
+    if limit is None and after is None:
+        return _as_json(_project(jobs, fields))
+    page = jobs if limit is None else jobs[:limit]
+    next_cursor = _encode_cursor(page[-1]["id"]) if len(page) < len(jobs) else None
+    return _as_json({"jobs": _project(page, fields), "next_cursor": next_cursor})
+
+
+async def _handle_wait_for_job(arguments: Dict[str, Any]) -> List[types.ContentBlock]:
+    job_id = arguments["job_id"]
+    session_root = _coerce_session_root(arguments.get("session_root"))
+    timeout = arguments.get("timeout")
+    job = await vibestack_api.wait_for_job_async(
+        job_id,
+        timeout=float(timeout) if timeout is not None else 30.0,
+        session_root=session_root,
+    )
+    if job is None:
+        raise McpError(
+            types.ErrorData(code=types.INVALID_PARAMS, message=f"Job '{job_id}' not found"),
+        )
+    return _as_json(job)
 
 
 async def _handle_enqueue_one_off(arguments: Dict[str, Any]) -> List[types.ContentBlock]:
     name = arguments["name"]
     command = arguments["command"]
     session_root = _coerce_session_root(arguments.get("session_root"))
-    metadata = await _run_sync(
-        vibestack_api.enqueue_one_off,
+    metadata = await vibestack_api.enqueue_one_off_async(
         name,
         command,
         template=arguments.get("template", "script"),
         description=arguments.get("description"),
+        priority=arguments.get("priority"),
         session_root=session_root,
     )
     return _as_json(_augment_session(metadata))
@@ -233,7 +522,7 @@ async def _handle_enqueue_one_off(arguments: Dict[str, Any]) -> List[types.Conte
 async def _handle_get_session_url(arguments: Dict[str, Any]) -> List[types.ContentBlock]:
     name = arguments["name"]
     session_root = _coerce_session_root(arguments.get("session_root"))
-    session = await _run_sync(vibestack_api.get_session, name, session_root=session_root)
+    session = await vibestack_api.get_session_async(name, session_root=session_root)
     if not session:
         raise McpError(
             types.ErrorData(code=types.INVALID_PARAMS, message=f"Session '{name}' not found"),
@@ -274,17 +563,52 @@ class ToolDefinition:
     handler: ToolHandler
 
 
+_FIELDS_PROPERTY: Dict[str, Any] = {
+    "anyOf": [
+        {"type": "string"},
+        {"type": "array", "items": {"type": "string"}},
+    ],
+    "description": "Only return these top-level fields of each record (e.g. ['name', 'status']).",
+}
+
+_CURSOR_PROPERTY: Dict[str, Any] = {
+    "type": "string",
+    "description": "next_cursor from the previous page; omit it to start from the beginning.",
+}
+
+
 TOOL_DEFINITIONS: List[ToolDefinition] = [
     ToolDefinition(
         name="list_sessions",
-        description="List known VibeStack sessions.",
+        description=(
+            "List known VibeStack sessions. Pass limit (and then cursor) to page through them; "
+            "paged results are {sessions, next_cursor}."
+        ),
         schema={
             "type": "object",
             "properties": {
+                "status": {
+                    "anyOf": [
+                        {"type": "string"},
+                        {"type": "array", "items": {"type": "string"}},
+                    ],
+                    "description": "Only return sessions in these states (e.g. 'running').",
+                },
+                "template": {
+                    "type": "string",
+                    "description": "Only return sessions created from this template.",
+                },
+                "updated_since": {
+                    "type": "string",
+                    "description": "Only return sessions updated at or after this ISO timestamp.",
+                },
+                "fields": _FIELDS_PROPERTY,
+                "limit": {"type": "integer", "minimum": 1},
+                "cursor": _CURSOR_PROPERTY,
                 "session_root": {
                     "type": "string",
                     "description": "Optional override for the session root directory.",
-                }
+                },
             },
         },
         handler=_handle_list_sessions,
@@ -297,6 +621,7 @@ TOOL_DEFINITIONS: List[ToolDefinition] = [
             "required": ["name"],
             "properties": {
                 "name": {"type": "string"},
+                "fields": _FIELDS_PROPERTY,
                 "session_root": {
                     "type": "string",
                     "description": "Optional override for the session root directory.",
@@ -338,6 +663,95 @@ TOOL_DEFINITIONS: List[ToolDefinition] = [
         },
         handler=_handle_create_session,
     ),
+    ToolDefinition(
+        name="batch_create_sessions",
+        description=(
+            "Create several sessions in one call (e.g. fanning out to many Codex agents). "
+            "Returns one result per session with ok/error, and sends each optional prompt once started."
+        ),
+        schema={
+            "type": "object",
+            "required": ["sessions"],
+            "properties": {
+                "sessions": {
+                    "type": "array",
+                    "minItems": 1,
+                    "items": {
+                        "type": "object",
+                        "required": ["name"],
+                        "properties": {
+                            "name": {"type": "string"},
+                            "template": {"type": "string"},
+                            "command": {"type": "string"},
+                            "working_dir": {"type": "string"},
+                            "description": {"type": "string"},
+                            "prompt": {"type": "string"},
+                        },
+                    },
+                },
+                "session_root": {"type": "string"},
+            },
+        },
+        handler=_handle_batch_create_sessions,
+    ),
+    ToolDefinition(
+        name="batch_kill_sessions",
+        description="Terminate several sessions in one call; returns one result per name.",
+        schema={
+            "type": "object",
+            "required": ["names"],
+            "properties": {
+                "names": {"type": "array", "minItems": 1, "items": {"type": "string"}},
+                "session_root": {"type": "string"},
+            },
+        },
+        handler=_handle_batch_kill_sessions,
+    ),
+    ToolDefinition(
+        name="broadcast_input",
+        description=(
+            "Send the same text to many sessions at once (e.g. 'git pull', or 'C-c' with enter=false to interrupt). "
+            "Select sessions by names, template and/or a shell-style name pattern; selectors narrow each other."
+        ),
+        schema={
+            "type": "object",
+            "required": ["text"],
+            "properties": {
+                "text": {"type": "string"},
+                "enter": {"type": "boolean", "default": True},
+                "names": {"type": "array", "items": {"type": "string"}},
+                "template": {"type": "string"},
+                "pattern": {"type": "string", "description": "e.g. 'agent-*'"},
+                "session_root": {"type": "string"},
+            },
+        },
+        handler=_handle_broadcast_input,
+    ),
+    ToolDefinition(
+        name="batch_send_input",
+        description="Send text to several sessions in one call; returns one result per item.",
+        schema={
+            "type": "object",
+            "required": ["items"],
+            "properties": {
+                "items": {
+                    "type": "array",
+                    "minItems": 1,
+                    "items": {
+                        "type": "object",
+                        "required": ["name", "text"],
+                        "properties": {
+                            "name": {"type": "string"},
+                            "text": {"type": "string"},
+                            "enter": {"type": "boolean", "default": True},
+                        },
+                    },
+                },
+                "session_root": {"type": "string"},
+            },
+        },
+        handler=_handle_batch_send_input,
+    ),
     ToolDefinition(
         name="send_input",
         description="Send text to an existing session's terminal.",
@@ -369,11 +783,61 @@ TOOL_DEFINITIONS: List[ToolDefinition] = [
             "properties": {
                 "name": {"type": "string"},
                 "lines": {"type": "integer", "minimum": 1, "default": 200},
+                "offset": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "description": "Return output written after this byte offset (use next_offset from a previous call).",
+                },
+                "from_line": {
+                    "type": "integer",
+                    "description": "Return clean, escape-free lines from this 1-based line number (negative counts from the end).",
+                },
+                "to_line": {"type": "integer", "minimum": 1, "description": "Last clean line to return (inclusive)."},
                 "session_root": {"type": "string"},
             },
         },
         handler=_handle_tail_log,
     ),
+    ToolDefinition(
+        name="capture_pane",
+        description=(
+            "Read what a session's terminal currently shows (useful for TUIs). Pass the returned seq back as "
+            "since_seq to receive only the rows that changed; full=true means every row is included."
+        ),
+        schema={
+            "type": "object",
+            "required": ["name"],
+            "properties": {
+                "name": {"type": "string"},
+                "since_seq": {"type": "integer"},
+                "ansi": {"type": "boolean", "default": False, "description": "Keep colour escape sequences."},
+                "session_root": {"type": "string"},
+            },
+        },
+        handler=_handle_capture_pane,
+    ),
+    ToolDefinition(
+        name="search_logs",
+        description=(
+            "Search the escape-free text of session logs across sessions, grep-style. "
+            "Each match has session and line; read around it with tail_log from_line/to_line. "
+            "Output not indexed yet is not searched and is counted in pending_bytes."
+        ),
+        schema={
+            "type": "object",
+            "required": ["query"],
+            "properties": {
+                "query": {"type": "string", "minLength": 1},
+                "regex": {"type": "boolean", "default": False},
+                "ignore_case": {"type": "boolean", "default": False},
+                "names": {"type": "array", "items": {"type": "string"}},
+                "template": {"type": "string"},
+                "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 50},
+                "session_root": {"type": "string"},
+            },
+        },
+        handler=_handle_search_logs,
+    ),
     ToolDefinition(
         name="kill_session",
         description="Terminate a session if it is running.",
@@ -389,18 +853,52 @@ TOOL_DEFINITIONS: List[ToolDefinition] = [
     ),
     ToolDefinition(
         name="list_jobs",
-        description="List queued one-off jobs.",
+        description=(
+            "List queued one-off jobs. Pass limit (and then cursor) to page through them; "
+            "paged results are {jobs, next_cursor}."
+        ),
         schema={
             "type": "object",
             "properties": {
+                "status": {
+                    "anyOf": [
+                        {"type": "string"},
+                        {"type": "array", "items": {"type": "string"}},
+                    ],
+                    "description": "Only return jobs in these states (e.g. 'running').",
+                },
+                "fields": _FIELDS_PROPERTY,
+                "limit": {"type": "integer", "minimum": 1},
+                "cursor": _CURSOR_PROPERTY,
+                "offset": {"type": "integer", "minimum": 0, "default": 0},
                 "session_root": {"type": "string"},
             },
         },
         handler=_handle_list_jobs,
     ),
+    ToolDefinition(
+        name="wait_for_job",
+        description=(
+            "Wait for a one-off job to finish and return its record. Returns early with the "
+            "current status if the timeout expires first."
+        ),
+        schema={
+            "type": "object",
+            "required": ["job_id"],
+            "properties": {
+                "job_id": {"type": "string"},
+                "timeout": {"type": "number", "minimum": 0, "maximum": 600, "default": 30},
+                "session_root": {"type": "string"},
+            },
+        },
+        handler=_handle_wait_for_job,
+    ),
     ToolDefinition(
         name="enqueue_one_off",
-        description="Queue a one-off command using the session manager.",
+        description=(
+            "Queue a one-off command using the session manager. It starts immediately when a "
+            "concurrency slot is free and stays 'queued' otherwise."
+        ),
         schema={
             "type": "object",
             "required": ["name", "command"],
@@ -409,6 +907,12 @@ TOOL_DEFINITIONS: List[ToolDefinition] = [
                 "command": {"type": "string"},
                 "template": {"type": "string", "default": "script"},
                 "description": {"type": "string"},
+                "priority": {
+                    "type": "string",
+                    "enum": ["high", "normal", "low"],
+                    "default": "normal",
+                    "description": "Scheduling class used when jobs are waiting for a free slot.",
+                },
                 "session_root": {"type": "string"},
             },
         },
@@ -452,7 +956,21 @@ TOOL_DEFINITIONS: List[ToolDefinition] = [
 
 TOOL_REGISTRY: Dict[str, ToolDefinition] = {item.name: item for item in TOOL_DEFINITIONS}
 
-server = Server(
+class _VibeStackServer(Server):
+    """Advertises ``resources.subscribe``, which the low-level server always reports as off."""
+
+    def get_capabilities(
+        self,
+        notification_options: NotificationOptions,
+        experimental_capabilities: Dict[str, Dict[str, Any]],
+    ) -> types.ServerCapabilities:
+        capabilities = super().get_capabilities(notification_options, experimental_capabilities)
+        if capabilities.resources is not None and types.SubscribeRequest in self.request_handlers:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+
+server = _VibeStackServer(
     name=os.environ.get("VIBESTACK_MCP_NAME", "vibestack"),
     version=os.environ.get("VIBESTACK_MCP_VERSION"),
     instructions=(
@@ -501,9 +1019,12 @@ server = Server(
         "- Use descriptive session names (e.g., 'api-debug-20250101', not 'test')\n"
         "- Include context in prompts (file paths, error messages, specific goals)\n"
         "- Check tail_log before sending follow-up commands to see latest output\n"
+        "- To follow a session, subscribe to the vibestack://sessions/<name>/log or /status resource "
+        "instead of polling tail_log or get_session\n"
         "- Use get_session_url to generate shareable links to sessions\n"
         "- Clean up finished sessions with kill_session to free resources\n"
-        "- For batch jobs, use enqueue_one_off instead of create_session\n\n"
+        "- For batch jobs, use enqueue_one_off instead of create_session\n"
+        "- Use wait_for_job with the returned job_id instead of polling list_jobs\n\n"
         
         "## Environment Details\n"
         "Container: Ubuntu 22.04 with XFCE4 desktop (full variant)\n"
@@ -534,6 +1055,7 @@ async def list_tools() -> List[types.Tool]:
 async def call_tool(name: str, arguments: Dict[str, Any] | None) -> List[types.ContentBlock]:
     definition = TOOL_REGISTRY.get(name)
     if definition is None:
+        TOOL_ERRORS.inc("(unknown)")
         raise McpError(
             types.ErrorData(
                 code=types.INVALID_PARAMS,
@@ -541,7 +1063,110 @@ async def call_tool(name: str, arguments: Dict[str, Any] | None) -> List[types.C
             )
         )
     args = arguments or {}
-    return await definition.handler(args)
+    TOOL_CALLS.inc(name)
+    with TOOL_IN_FLIGHT.track(name), TOOL_DURATION.time(name):
+        try:
+            return await definition.handler(args)
+        except Exception:
+            TOOL_ERRORS.inc(name)
+            raise
+
+
+RESOURCE_HUB = SubscriptionHub(interval=_env_int("VIBESTACK_MCP_RESOURCE_POLL_MS", 1000) / 1000)
+
+
+def _resource_error(message: str) -> McpError:
+    return McpError(types.ErrorData(code=types.INVALID_PARAMS, message=message))
+
+
+@server.list_resources()
+async def list_resources() -> List[types.Resource]:
+    sessions = await vibestack_api.list_sessions_async()
+    resources: List[types.Resource] = []
+    for session in sessions:
+        name = session.get("name")
+        if not name:
+            continue
+        uris = resource_uris(name)
+        resources.append(
+            types.Resource(
+                uri=uris["log"],
+                name=f"{name} log",
+                description=f"Recent console output of session '{name}' ({session.get('status')}).",
+                mimeType="application/json",
+            )
+        )
+        resources.append(
+            types.Resource(
+                uri=uris["status"],
+                name=f"{name} status",
+                description=f"Metadata and status of session '{name}'.",
+                mimeType="application/json",
+            )
+        )
+    return resources
+
+
+@server.list_resource_templates()
+async def list_resource_templates() -> List[types.ResourceTemplate]:
+    return [
+        types.ResourceTemplate(
+            uriTemplate=LOG_URI_TEMPLATE,
+            name="Session log",
+            description=(
+                "Recent console output as {log, offset, next_offset}. Add ?lines=N for the last N lines "
+                "(default 200) or ?offset=N to read on from a previous next_offset."
+            ),
+            mimeType="application/json",
+        ),
+        types.ResourceTemplate(
+            uriTemplate=STATUS_URI_TEMPLATE,
+            name="Session status",
+            description="Session metadata, including status; subscribe to be notified when it changes.",
+            mimeType="application/json",
+        ),
+    ]
+
+
+@server.read_resource()
+async def read_resource(uri: Any) -> List[ReadResourceContents]:
+    try:
+        resource = parse_uri(uri)
+    except ValueError as exc:
+        raise _resource_error(str(exc)) from None
+    if resource.kind == "status":
+        session = await vibestack_api.get_session_async(resource.name)
+        if session is None:
+            raise _resource_error(f"Session '{resource.name}' not found")
+        payload: Any = _augment_session(session)
+    else:
+        offset = resource.param("offset")
+        try:
+            payload = await vibestack_api.read_log_async(
+                resource.name,
+                lines=int(resource.param("lines") or 200),
+                offset=int(offset) if offset is not None else None,
+            )
+        except ValueError as exc:
+            raise _resource_error(str(exc)) from None
+    return [ReadResourceContents(content=_dump_json(payload), mime_type="application/json")]
+
+
+@server.subscribe_resource()
+async def subscribe_resource(uri: Any) -> None:
+    try:
+        await RESOURCE_HUB.subscribe(parse_uri(uri), server.request_context.session)
+    except ValueError as exc:
+        raise _resource_error(str(exc)) from None
+
+
+@server.unsubscribe_resource()
+async def unsubscribe_resource(uri: Any) -> None:
+    try:
+        resource = parse_uri(uri)
+    except ValueError as exc:
+        raise _resource_error(str(exc)) from None
+    RESOURCE_HUB.unsubscribe(resource, server.request_context.session)
 
 
 def _allowed_origins() -> List[str]:
@@ -551,11 +1176,54 @@ def _allowed_origins() -> List[str]:
     return origins or ["*"]
 
 
-SESSION_MANAGER = StreamableHTTPSessionManager(
+# The per-session event store below hooks private methods of the mcp session
+# manager; fail at import rather than silently share one store between sessions.
+for _hook in ("_admit_session", "_discard_session"):
+    if not callable(getattr(StreamableHTTPSessionManager, _hook, None)):
+        raise ImportError(
+            f"mcp.server.streamable_http_manager.StreamableHTTPSessionManager has no {_hook}(); "
+            "install the mcp version pinned in the Dockerfiles"
+        )
+
+
+class _ResumableSessionManager(StreamableHTTPSessionManager):
+    """Gives each MCP session its own view of the shared event store.
+
+    Stream ids are request ids, which every session numbers from the start, so
+    without a per-session view one client's ``Last-Event-ID`` could replay
+    another session's events.
+    """
+
+    def _admit_session(self, requestor):  # type: ignore[override]
+        transport = super()._admit_session(requestor)
+        if transport is not None and isinstance(self.event_store, BoundedEventStore):
+            transport._event_store = self.event_store.for_session(transport.mcp_session_id)
+        return transport
+
+    async def _discard_session(self, session_id, transport):  # type: ignore[override]
+        await super()._discard_session(session_id, transport)
+        if isinstance(self.event_store, BoundedEventStore):
+            self.event_store.forget_session(session_id)
+
+
+def _build_event_store(stateless: bool) -> Optional[BoundedEventStore]:
+    retention = _env_int("VIBESTACK_MCP_EVENT_RETENTION", DEFAULT_RETENTION)
+    if stateless or retention <= 0:
+        return None
+    return BoundedEventStore(
+        retention=retention,
+        max_streams=_env_int("VIBESTACK_MCP_EVENT_STREAMS", DEFAULT_MAX_STREAMS),
+        ttl=float(_env_int("VIBESTACK_MCP_EVENT_TTL", int(DEFAULT_TTL))),
+    )
+
+
+_STATELESS = _env_bool("VIBESTACK_MCP_STATELESS", False)
+
+SESSION_MANAGER = _ResumableSessionManager(
     app=server,
-    event_store=None,
+    event_store=_build_event_store(_STATELESS),
     json_response=_env_bool("VIBESTACK_MCP_JSON_RESPONSE", False),
-    stateless=_env_bool("VIBESTACK_MCP_STATELESS", False),
+    stateless=_STATELESS,
 )
 
 
@@ -580,13 +1248,28 @@ async def _handle_streamable_http(scope: Scope, receive: Receive, send: Send) ->
 
 @contextlib.asynccontextmanager
 async def _lifespan(_: Starlette):
-    async with SESSION_MANAGER.run():
-        logger.info("VibeStack MCP server ready (streamable-http)")
-        yield
-        logger.info("VibeStack MCP server shutting down")
+    vibestack_api.start_reconciler()
+    vibestack_api.start_warm_pool()
+    try:
+        async with SESSION_MANAGER.run(), anyio.create_task_group() as task_group:
+            task_group.start_soon(RESOURCE_HUB.run)
+            logger.info("VibeStack MCP server ready (streamable-http)")
+            yield
+            logger.info("VibeStack MCP server shutting down")
+            task_group.cancel_scope.cancel()
+    finally:
+        vibestack_api.stop_warm_pool()
+        vibestack_api.stop_reconciler()
 
 
-_routes = [Mount("/", app=_handle_streamable_http)]
+async def _metrics_endpoint(_: Request) -> Response:
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+_routes = [
+    Route("/metrics", _metrics_endpoint, methods=["GET"]),
+    Mount("/", app=_handle_streamable_http),
+]
 
 _starlette_app = Starlette(debug=_env_bool("VIBESTACK_MCP_DEBUG", False), routes=_routes, lifespan=_lifespan)
 
@@ -1,14 +1,32 @@
 """FastAPI application exposing the VibeStack Python API via REST."""
 from __future__ import annotations
 
+import contextlib
 import json
-from typing import Any, Dict, List, Optional
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from fastapi import APIRouter, FastAPI, HTTPException, Query, Request, Response, status
+import anyio
+from fastapi import APIRouter, FastAPI, Header, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from vibestack import api as vibestack_api
+from vibestack import metrics
+from vibestack.sessions.logindex import DEFAULT_MAX_LINES
+from vibestack.sessions.logs import LogChunk, LogFollower, tail_lines
+
+SSE_KEEPALIVE_SECONDS = 15.0
+
+REQUESTS = metrics.REGISTRY.counter(
+    "vibestack_rest_requests_total", "REST API requests, by method, route and status code.", ["method", "route", "status"]
+)
+REQUEST_DURATION = metrics.REGISTRY.histogram(
+    "vibestack_rest_request_duration_seconds", "REST API request latency in seconds, by method and route.", ["method", "route"]
+)
 
 
 class SessionResponse(BaseModel):
@@ -40,7 +58,7 @@ class SessionResponse(BaseModel):
         extra = "ignore"
 
 
-class SessionCreateRequest(BaseModel):
+class SessionSpec(BaseModel):
     name: str = Field(..., min_length=1, description="Unique session identifier")
     template: str = Field("bash", description="Template to base the session on")
     command: Optional[str] = Field(None, description="Command override for the template")
@@ -49,17 +67,114 @@ class SessionCreateRequest(BaseModel):
     )
     working_dir: Optional[str] = Field(None, description="Working directory for the session before commands run")
     description: Optional[str] = Field(None, description="Optional human readable summary")
+
+    class Config:
+        extra = "forbid"
+
+
+class SessionCreateRequest(SessionSpec):
     session_root: Optional[str] = Field(
         None,
         description="Optional override for the session root directory",
     )
 
+
+class SessionBatchCreateRequest(BaseModel):
+    sessions: List[SessionSpec] = Field(..., min_length=1, max_length=200)
+    session_root: Optional[str] = Field(None, description="Optional override for the session root directory")
+
     class Config:
         extra = "forbid"
 
 
+class SessionBatchKillRequest(BaseModel):
+    names: List[str] = Field(..., min_length=1, max_length=500)
+    session_root: Optional[str] = Field(None, description="Optional override for the session root directory")
+
+    class Config:
+        extra = "forbid"
+
+
+class SessionBatchInputItem(BaseModel):
+    name: str = Field(..., min_length=1)
+    text: str = Field(..., min_length=1, description="Payload to send to the tmux session")
+    enter: bool = Field(True, description="Send an enter key after the payload")
+
+    class Config:
+        extra = "forbid"
+
+
+class SessionBatchSendRequest(BaseModel):
+    items: List[SessionBatchInputItem] = Field(..., min_length=1, max_length=500)
+    session_root: Optional[str] = Field(None, description="Optional override for the session root directory")
+
+    class Config:
+        extra = "forbid"
+
+
+class SessionBroadcastRequest(BaseModel):
+    text: str = Field(..., min_length=1, description="Payload to send to every selected session")
+    enter: bool = Field(True, description="Send an enter key after the payload")
+    names: Optional[List[str]] = Field(None, max_length=500, description="Explicit session names")
+    template: Optional[str] = Field(None, description="Only sessions created from this template")
+    pattern: Optional[str] = Field(None, description="Shell-style session name pattern, e.g. 'agent-*'")
+    session_root: Optional[str] = Field(None, description="Optional override for the session root directory")
+
+    class Config:
+        extra = "forbid"
+
+
+class SessionBroadcastResponse(BaseModel):
+    sessions: List[str] = Field(..., description="Sessions that received the payload")
+    missing: List[str] = Field(..., description="Requested names without a running tmux session")
+
+
+class BatchItemResult(BaseModel):
+    name: str
+    ok: bool
+    error: Optional[str] = None
+    session: Optional[SessionResponse] = None
+
+
 class SessionTailResponse(BaseModel):
     log: str
+    offset: Optional[int] = Field(None, description="Byte offset where the returned text starts")
+    next_offset: Optional[int] = Field(None, description="Pass back as offset to read output written afterwards")
+    from_line: Optional[int] = Field(None, description="First clean line returned (line reads only)")
+    to_line: Optional[int] = Field(None, description="Last clean line returned (line reads only)")
+    total_lines: Optional[int] = Field(None, description="Clean lines indexed so far (line reads only)")
+    first_available_line: Optional[int] = Field(None, description="Oldest line still retained (line reads only)")
+    pending_bytes: Optional[int] = Field(None, description="Raw output not yet indexed into lines (line reads only)")
+
+
+class LogSearchMatch(BaseModel):
+    session: str
+    line: int = Field(..., description="1-based clean line number; read around it with ?from=&to=")
+    text: str
+
+
+class LogSearchResponse(BaseModel):
+    matches: List[LogSearchMatch]
+    sessions_searched: int
+    truncated: bool = Field(..., description="The limit was reached; more lines may match")
+    pending_bytes: int = Field(0, description="Raw output not yet indexed, and so not searched")
+
+
+class ScreenLine(BaseModel):
+    index: int = Field(..., description="Row on the visible screen, starting at 0")
+    text: str
+
+
+class SessionScreenResponse(BaseModel):
+    name: str
+    seq: int = Field(..., description="Pass back as since_seq to receive only later changes")
+    since_seq: Optional[int] = None
+    full: bool = Field(..., description="True when every row is included rather than a diff")
+    width: int
+    height: int
+    cursor_x: int
+    cursor_y: int
+    lines: List[ScreenLine]
 
 
 class SessionInputRequest(BaseModel):
@@ -75,6 +190,18 @@ class OneOffJobRequest(BaseModel):
     command: str = Field(..., min_length=1, description="Command to execute")
     template: str = Field("script", description="Template used to run the one-off command")
     description: Optional[str] = Field(None, description="Optional job description")
+    priority: Optional[str] = Field(None, description="Scheduling class: 'high', 'normal' (default) or 'low'")
+    session_root: Optional[str] = Field(
+        None,
+        description="Optional override for the session root directory",
+    )
+
+    class Config:
+        extra = "forbid"
+
+
+class JobWaitRequest(BaseModel):
+    timeout: float = Field(30.0, ge=0, le=600, description="Seconds to wait before returning the job as it stands")
     session_root: Optional[str] = Field(
         None,
         description="Optional override for the session root directory",
@@ -112,11 +239,26 @@ class JobRecord(BaseModel):
     created_at: str
     updated_at: str
     message: Optional[str] = None
+    session_type: Optional[str] = None
+    priority: Optional[str] = None
+    started_at: Optional[str] = None
+    wait_seconds: Optional[float] = Field(None, description="Seconds spent queued (so far, if still queued)")
+    queue_position: Optional[int] = Field(None, description="1-based dispatch position while queued")
 
     class Config:
         extra = "ignore"
 
 
+class JobQueueResponse(BaseModel):
+    queued: int
+    running: int
+    max_concurrency: int = Field(..., description="Concurrent one-off jobs allowed; 0 means unlimited")
+    template_limits: Dict[str, int]
+    by_priority: Dict[str, int]
+    by_template: Dict[str, Dict[str, int]]
+    oldest_wait_seconds: Optional[float] = None
+
+
 router = APIRouter(prefix="/api", tags=["vibestack"])
 link_router = APIRouter(prefix="/link", tags=["vibestack-link"])
 
@@ -175,28 +317,41 @@ async def _gather_request_payload(request: Request) -> Dict[str, Any]:
 
 
 @router.get("/sessions", response_model=List[SessionResponse])
-def list_sessions(session_root: Optional[str] = Query(None)) -> List[Dict[str, Any]]:
+async def list_sessions(
+    session_root: Optional[str] = Query(None),
+    status_filter: Optional[List[str]] = Query(None, alias="status", description="Only return sessions in these states"),
+    template: Optional[str] = Query(None, description="Only return sessions created from this template"),
+    updated_since: Optional[str] = Query(
+        None,
+        description="Only return sessions updated at or after this ISO timestamp",
+    ),
+) -> List[Dict[str, Any]]:
     """Return a list of known sessions."""
 
-    return vibestack_api.list_sessions(session_root=session_root)
+    return await vibestack_api.list_sessions_async(
+        session_root=session_root,
+        status=status_filter,
+        template=template,
+        updated_since=updated_since,
+    )
 
 
 @router.get("/sessions/{name}", response_model=SessionResponse)
-def get_session(name: str, session_root: Optional[str] = Query(None)) -> Dict[str, Any]:
+async def get_session(name: str, session_root: Optional[str] = Query(None)) -> Dict[str, Any]:
     """Return metadata for a single session."""
 
-    session = vibestack_api.get_session(name, session_root=session_root)
+    session = await vibestack_api.get_session_async(name, session_root=session_root)
     if session is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
     return session
 
 
 @router.post("/sessions", response_model=SessionResponse, status_code=status.HTTP_201_CREATED)
-def create_session(request: SessionCreateRequest) -> Dict[str, Any]:
+async def create_session(request: SessionCreateRequest) -> Dict[str, Any]:
     """Create a new session using the configured template."""
 
     try:
-        return vibestack_api.create_session(
+        return await vibestack_api.create_session_async(
             request.name,
             template=request.template,
             command=request.command,
@@ -209,70 +364,321 @@ def create_session(request: SessionCreateRequest) -> Dict[str, Any]:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
+@router.post("/sessions:batchCreate", response_model=List[BatchItemResult])
+async def batch_create_sessions(request: SessionBatchCreateRequest) -> List[Dict[str, Any]]:
+    """Create many sessions with one existence check and one job-journal write."""
+
+    specs = [
+        {
+            key: value
+            for key, value in {
+                "name": spec.name,
+                "template": spec.template,
+                "command": spec.command,
+                "command_args": spec.command_args,
+                "working_dir": spec.working_dir,
+                "description": spec.description,
+            }.items()
+            if value is not None
+        }
+        for spec in request.sessions
+    ]
+    return await vibestack_api.create_sessions_async(specs, session_root=request.session_root)
+
+
+@router.post("/sessions:batchKill", response_model=List[BatchItemResult])
+async def batch_kill_sessions(request: SessionBatchKillRequest) -> List[Dict[str, Any]]:
+    """Terminate many sessions; queued jobs among them are cancelled."""
+
+    return await vibestack_api.kill_sessions_async(request.names, session_root=request.session_root)
+
+
+@router.post("/sessions:batchSend", response_model=List[BatchItemResult])
+async def batch_send_input(request: SessionBatchSendRequest) -> List[Dict[str, Any]]:
+    """Send input to many sessions, reporting delivery per item."""
+
+    items = [{"name": item.name, "text": item.text, "enter": item.enter} for item in request.items]
+    return await vibestack_api.send_texts_async(items, session_root=request.session_root)
+
+
+@router.post("/sessions:broadcast", response_model=SessionBroadcastResponse)
+async def broadcast_session_input(request: SessionBroadcastRequest) -> Dict[str, List[str]]:
+    """Send the same input to many sessions with one chained tmux command."""
+
+    try:
+        return await vibestack_api.broadcast_text_async(
+            request.text,
+            names=request.names,
+            template=request.template,
+            pattern=request.pattern,
+            enter=request.enter,
+            session_root=request.session_root,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
 @router.delete("/sessions/{name}")
-def delete_session(name: str, session_root: Optional[str] = Query(None)) -> None:
+async def delete_session(name: str, session_root: Optional[str] = Query(None)) -> None:
     """Terminate an existing session."""
 
-    session = vibestack_api.get_session(name, session_root=session_root)
+    session = await vibestack_api.get_session_async(name, session_root=session_root)
     if session is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
-    vibestack_api.kill_session(name, session_root=session_root)
+    await vibestack_api.kill_session_async(name, session_root=session_root)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.post("/sessions/{name}/input", response_model=MessageResponse)
-def send_session_input(
+async def send_session_input(
     name: str,
     request: SessionInputRequest,
     session_root: Optional[str] = Query(None),
 ) -> MessageResponse:
     """Send text to the tmux session backing a VibeStack session."""
 
-    session = vibestack_api.get_session(name, session_root=session_root)
+    session = await vibestack_api.get_session_async(name, session_root=session_root)
     if session is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
-    vibestack_api.send_text(name, request.text, enter=request.enter, session_root=session_root)
+    await vibestack_api.send_text_async(name, request.text, enter=request.enter, session_root=session_root)
     return MessageResponse(message="input queued")
 
 
 @router.get("/sessions/{name}/log", response_model=SessionTailResponse)
-def tail_session_log(
+async def tail_session_log(
     name: str,
     lines: int = Query(200, ge=1, le=2000, description="Number of log lines to retrieve"),
+    offset: Optional[int] = Query(
+        None,
+        ge=0,
+        description="Return output written after this byte offset instead of the last lines",
+    ),
+    max_bytes: int = Query(256 * 1024, ge=1, le=4 * 1024 * 1024, description="Cap for offset reads"),
+    from_line: Optional[int] = Query(
+        None,
+        alias="from",
+        description="Return clean, escape-free lines starting here (1-based; negative counts from the end)",
+    ),
+    to_line: Optional[int] = Query(None, alias="to", ge=1, description="Last clean line to return (inclusive)"),
     session_root: Optional[str] = Query(None),
 ) -> SessionTailResponse:
-    """Return the last ``lines`` of the session log."""
+    """Return the last ``lines`` of the session log, everything after ``offset``, or clean lines ``from..to``."""
 
+    if from_line is not None or to_line is not None:
+        try:
+            chunk = await vibestack_api.read_log_lines_async(
+                name,
+                from_line if from_line is not None else 1,
+                to_line,
+                max_lines=lines if to_line is None else DEFAULT_MAX_LINES,
+                session_root=session_root,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+        return SessionTailResponse(**chunk)
     try:
-        log_output = vibestack_api.tail_log(name, lines=lines, session_root=session_root)
+        chunk = await vibestack_api.read_log_async(
+            name,
+            lines=lines,
+            offset=offset,
+            max_bytes=max_bytes,
+            session_root=session_root,
+        )
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
-    return SessionTailResponse(log=log_output)
+    return SessionTailResponse(**chunk)
+
+
+@router.get("/logs/search", response_model=LogSearchResponse)
+async def search_session_logs(
+    q: str = Query(..., min_length=1, description="Text to look for (a regular expression with regex=true)"),
+    regex: bool = Query(False),
+    ignore_case: bool = Query(False),
+    names: Optional[List[str]] = Query(None, alias="name", description="Limit to these sessions (repeatable)"),
+    template: Optional[str] = Query(None, description="Limit to sessions created from this template"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of matching lines"),
+    session_root: Optional[str] = Query(None),
+) -> Dict[str, Any]:
+    """Search the clean text of session logs across sessions."""
+
+    try:
+        return await vibestack_api.search_logs_async(
+            q,
+            names=names,
+            template=template,
+            regex=regex,
+            ignore_case=ignore_case,
+            limit=limit,
+            session_root=session_root,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+@router.get("/sessions/{name}/screen", response_model=SessionScreenResponse)
+async def capture_session_screen(
+    name: str,
+    since_seq: Optional[int] = Query(None, description="seq from a previous response; only changed rows are returned"),
+    ansi: bool = Query(True, description="Keep colour and attribute escape sequences"),
+    session_root: Optional[str] = Query(None),
+) -> Dict[str, Any]:
+    """Return the visible pane contents, or only the rows changed since ``since_seq``."""
+
+    screen = await vibestack_api.capture_pane_async(name, since_seq=since_seq, ansi=ansi, session_root=session_root)
+    if screen is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not running")
+    return screen
+
+
+@router.get("/sessions/{name}/log/range", response_model=SessionTailResponse)
+async def read_session_log_range(
+    name: str,
+    start: int = Query(..., ge=0, description="First logical byte offset to return"),
+    end: Optional[int] = Query(None, ge=0, description="Logical byte offset to stop before"),
+    max_bytes: int = Query(256 * 1024, ge=1, le=4 * 1024 * 1024, description="Cap for the returned slice"),
+    session_root: Optional[str] = Query(None),
+) -> SessionTailResponse:
+    """Return a byte range of the session log, reading through rotated segments.
+
+    ``offset`` in the response may be later than ``start`` when the requested
+    bytes have already aged out of the retained segments.
+    """
+
+    try:
+        chunk = await vibestack_api.read_log_range_async(
+            name,
+            start,
+            end,
+            max_bytes=max_bytes,
+            session_root=session_root,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    return SessionTailResponse(**chunk)
+
+
+def _format_sse(chunk: LogChunk, event: str = "log") -> str:
+    # JSON keeps carriage returns intact; raw SSE data lines would treat them as breaks.
+    data = json.dumps(chunk.to_dict(), separators=(",", ":"))
+    return f"id: {chunk.next_offset}\nevent: {event}\ndata: {data}\n\n"
+
+
+async def _follow_log(
+    request: Request,
+    follower: LogFollower,
+    backfill: Optional[LogChunk],
+    poll_interval: float,
+) -> AsyncIterator[str]:
+    if backfill is not None and backfill.text:
+        yield _format_sse(backfill)
+    last_sent = time.monotonic()
+    while not await request.is_disconnected():
+        previous_offset = follower.offset
+        # Idle ticks cost two stats on the loop; reading (possibly from a compressed
+        # segment) happens in a worker thread.
+        chunk = await anyio.to_thread.run_sync(follower.poll) if follower.pending() else None
+        if chunk is not None:
+            yield _format_sse(chunk, event="reset" if chunk.offset != previous_offset else "log")
+            last_sent = time.monotonic()
+            continue
+        if time.monotonic() - last_sent >= SSE_KEEPALIVE_SECONDS:
+            yield ": keep-alive\n\n"
+            last_sent = time.monotonic()
+        await anyio.sleep(poll_interval)
+
+
+@router.get("/sessions/{name}/log/stream")
+async def stream_session_log(
+    name: str,
+    request: Request,
+    offset: Optional[int] = Query(None, ge=0, description="Byte offset to resume from"),
+    lines: int = Query(200, ge=0, le=2000, description="Lines to replay first when starting fresh"),
+    poll_interval: float = Query(0.5, ge=0.05, le=10.0, description="Seconds between log polls"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    session_root: Optional[str] = Query(None),
+) -> StreamingResponse:
+    """Stream appended log output as Server-Sent Events.
+
+    Every event carries ``{"log", "offset", "next_offset"}`` as JSON and uses
+    ``next_offset`` as its id, so reconnecting clients resume via ``Last-Event-ID``.
+    A ``reset`` event means the log restarted and the client should clear its view.
+    """
+
+    session = await vibestack_api.get_session_async(name, session_root=session_root)
+    if session is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+    log_path = Path(session["log_path"])
+    start = offset
+    if last_event_id is not None and last_event_id.strip().isdigit():
+        start = int(last_event_id.strip())
+    backfill: Optional[LogChunk] = None
+    if start is None:
+        backfill = await anyio.to_thread.run_sync(tail_lines, log_path, lines)
+        start = backfill.next_offset
+    follower = LogFollower(log_path, start)
+    return StreamingResponse(
+        _follow_log(request, follower, backfill, poll_interval),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/jobs", response_model=List[JobRecord])
-def list_jobs(session_root: Optional[str] = Query(None)) -> List[Dict[str, Any]]:
+def list_jobs(
+    session_root: Optional[str] = Query(None),
+    status_filter: Optional[List[str]] = Query(None, alias="status", description="Only return jobs in these states"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of jobs to return"),
+    offset: int = Query(0, ge=0, description="Number of matching jobs to skip"),
+) -> List[Dict[str, Any]]:
     """Return the current job queue."""
 
-    return vibestack_api.list_jobs(session_root=session_root)
+    return vibestack_api.list_jobs(
+        session_root=session_root,
+        status=status_filter,
+        limit=limit,
+        offset=offset,
+    )
 
 
 @router.post("/jobs", response_model=SessionResponse, status_code=status.HTTP_201_CREATED)
-def enqueue_one_off(request: OneOffJobRequest) -> Dict[str, Any]:
+async def enqueue_one_off(request: OneOffJobRequest) -> Dict[str, Any]:
     """Enqueue a one-off job using the session manager."""
 
     try:
-        return vibestack_api.enqueue_one_off(
+        return await vibestack_api.enqueue_one_off_async(
             request.name,
             request.command,
             template=request.template,
             description=request.description,
+            priority=request.priority,
             session_root=request.session_root,
         )
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
+@router.get("/jobs/queue", response_model=JobQueueResponse)
+def job_queue(session_root: Optional[str] = Query(None)) -> Dict[str, Any]:
+    """Return scheduler queue depth, concurrency limits and the oldest queued wait."""
+
+    return vibestack_api.job_queue(session_root=session_root)
+
+
+@router.post("/jobs/{job_id}/wait", response_model=JobRecord)
+async def wait_for_job(job_id: str, request: Optional[JobWaitRequest] = None) -> Dict[str, Any]:
+    """Block until the job finishes or the timeout expires, then return its record."""
+
+    request = request or JobWaitRequest()
+    job = await vibestack_api.wait_for_job_async(
+        job_id,
+        timeout=request.timeout,
+        session_root=request.session_root,
+    )
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
 @router.get("/templates", response_model=List[Dict[str, Any]])
 def list_templates() -> List[Dict[str, Any]]:
     """Return built-in and user-provided templates."""
@@ -319,7 +725,7 @@ async def link_tail_log(link_id: str, request: Request) -> SessionTailResponse:
     lines = _coerce_int(payload.get("lines"), 200)
     session_root = payload.get("session_root")
     try:
-        log_output = vibestack_api.tail_log(name, lines=lines, session_root=session_root)
+        log_output = await vibestack_api.tail_log_async(name, lines=lines, session_root=session_root)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
     return SessionTailResponse(log=log_output)
@@ -341,14 +747,62 @@ async def link_send_input(link_id: str, request: Request) -> MessageResponse:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="text is required")
     enter = _coerce_bool(payload.get("enter"), default=True)
     session_root = payload.get("session_root")
-    vibestack_api.send_text(name, str(text), enter=enter, session_root=session_root)
+    await vibestack_api.send_text_async(name, str(text), enter=enter, session_root=session_root)
     return MessageResponse(message="input queued")
 
 
+class _RequestMetricsMiddleware:
+    """Times every HTTP request under its route template, so ``/sessions/{name}`` is one series."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or "(unmatched)"
+            REQUEST_DURATION.observe(time.perf_counter() - started, scope["method"], route)
+            REQUESTS.inc(scope["method"], route, str(status_code))
+
+
+def metrics_endpoint() -> Response:
+    """Prometheus metrics for this process: requests, tmux and storage calls, sessions and logs.
+
+    Session gauges come from the reconciler's latest pass, so a scrape never scans tmux or logs.
+    """
+
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    vibestack_api.start_reconciler()
+    vibestack_api.start_warm_pool()
+    try:
+        yield
+    finally:
+        vibestack_api.stop_warm_pool()
+        vibestack_api.stop_reconciler()
+
+
 app = FastAPI(
     title="VibeStack REST API",
     description="HTTP interface for the VibeStack session manager",
     version="1.0.0",
+    lifespan=_lifespan,
 )
 
 app.add_middleware(
@@ -358,6 +812,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(_RequestMetricsMiddleware)
 
 app.include_router(router)
 app.include_router(link_router)
+app.add_api_route("/metrics", metrics_endpoint, methods=["GET"], include_in_schema=False)
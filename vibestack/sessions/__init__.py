@@ -2,10 +2,12 @@
 
 from . import codex_config
 from .codex_config import CodexConfigManager, MCPServerConfig
+from .aio import AsyncSessionManager
 from .manager import SessionManager
 from .models import SessionMetadata, SessionStatus, SessionType
 
 __all__ = [
+    "AsyncSessionManager",
     "CodexConfigManager",
     "codex_config",
     "MCPServerConfig",
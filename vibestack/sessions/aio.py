@@ -0,0 +1,478 @@
+"""Coroutine interface to :class:`~vibestack.sessions.manager.SessionManager`.
+
+The REST and MCP servers run on an event loop. Driving the synchronous manager
+from there means parking a worker thread on every ``tmux`` subprocess, and many
+polling agents exhaust the thread pool. :class:`AsyncSessionManager` reuses the
+manager's planning and bookkeeping but awaits tmux itself, either with
+:func:`asyncio.create_subprocess_exec` or through the control-mode client's
+futures.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Awaitable, Dict, List, Optional, Set, Tuple
+
+from . import logindex, logs
+from .manager import SessionManager
+from .models import SessionMetadata, SessionType
+from .tmux import TmuxControlClient, TmuxControlUnavailable, TmuxResult, record_command
+
+
+class AsyncSessionManager:
+    """Async counterpart of :class:`SessionManager` sharing its storage and templates.
+
+    tmux calls are awaited directly. Everything else that touches the disk (metadata
+    and job storage behind ``flock``, session directories and scripts, log reads
+    that may decompress a rotated segment) and starting the control client run in
+    worker threads, so the event loop never blocks on them.
+    """
+
+    def __init__(self, manager: Optional[SessionManager] = None, *, session_root: Optional[str | Path] = None) -> None:
+        self.manager = manager or SessionManager(session_root=session_root)
+        self.storage = self.manager.storage
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    async def list_sessions(
+        self,
+        *,
+        status: Optional[str | List[str]] = None,
+        template: Optional[str] = None,
+        updated_since: Optional[str] = None,
+    ) -> List[SessionMetadata]:
+        sessions = await asyncio.to_thread(
+            self.storage.list_sessions, status=status, template=template, updated_since=updated_since
+        )
+        await self._refresh_statuses(sessions, await self._snapshot_tmux())
+        if any(metadata.status == "queued" for metadata in sessions):
+            await asyncio.to_thread(self.manager.scheduler.dispatch)
+        if status is not None:
+            wanted = {status} if isinstance(status, str) else set(status)
+            sessions = [metadata for metadata in sessions if metadata.status in wanted]
+        return sessions
+
+    async def get_session(self, name: str) -> Optional[SessionMetadata]:
+        metadata = await asyncio.to_thread(self.storage.load, name)
+        if metadata and metadata.status == "queued":
+            await asyncio.to_thread(self.manager.scheduler.dispatch)
+            metadata = await asyncio.to_thread(self.storage.load, name)
+        if metadata:
+            await self._refresh_statuses([metadata], await self._snapshot_tmux())
+        return metadata
+
+    async def create_session(
+        self,
+        name: str,
+        *,
+        template: str = "bash",
+        command: Optional[str] = None,
+        command_args: Optional[List[str]] = None,
+        session_type: Optional[SessionType] = None,
+        description: Optional[str] = None,
+        working_dir: Optional[str | Path] = None,
+        env: Optional[Dict[str, str]] = None,
+    ) -> SessionMetadata:
+        if await self._session_exists(name):
+            raise ValueError(f"tmux session '{name}' already exists")
+        metadata, resolved_working_dir, merged_env = await asyncio.to_thread(
+            self.manager._prepare_session,
+            name,
+            template=template,
+            command=command,
+            command_args=command_args,
+            session_type=session_type,
+            description=description,
+            working_dir=working_dir,
+            env=env,
+        )
+        await self._start_session(metadata, resolved_working_dir, merged_env)
+        await asyncio.to_thread(self.manager._mark_launched, metadata)
+        return metadata
+
+    async def create_sessions(self, specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Async :meth:`SessionManager.create_sessions`."""
+
+        live = await self._live_session_names()
+        results, prepared, jobs = await asyncio.to_thread(self.manager._prepare_batch, specs, live)
+        await asyncio.to_thread(self.storage.add_jobs, jobs)
+        outcomes = await self._run_parallel(
+            [self._start_session(metadata, working_dir, env) for _, metadata, working_dir, env in prepared]
+        )
+        return await asyncio.to_thread(self.manager._finish_batch, results, prepared, outcomes)
+
+    async def kill_sessions(self, names: List[str]) -> List[Dict[str, Any]]:
+        """Async :meth:`SessionManager.kill_sessions`."""
+
+        names = list(dict.fromkeys(names))
+        live = await self._live_session_names()
+        targets = [name for name in names if name in live]
+        errors = await self._run_parallel([self._run_tmux(["kill-session", "-t", name]) for name in targets])
+        outcomes = dict(zip(targets, errors))
+        killed = [name for name in targets if outcomes[name] is None]
+        await asyncio.to_thread(self.manager._mark_killed_many, killed)
+        results: List[Dict[str, Any]] = []
+        for name in names:
+            if name in outcomes:
+                error = outcomes[name]
+                results.append({"name": name, "ok": error is None, "error": None if error is None else str(error)})
+            else:
+                cancelled = await asyncio.to_thread(self.manager.scheduler.cancel, name)
+                results.append({"name": name, "ok": cancelled, "error": None if cancelled else "session not found"})
+        if killed:
+            await asyncio.to_thread(self.manager.scheduler.dispatch)
+        return results
+
+    async def send_texts(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Async :meth:`SessionManager.send_texts`."""
+
+        live = await self._live_session_names()
+        results: List[Dict[str, Any]] = []
+        pending: List[Tuple[int, List[Tuple[List[str], Optional[bytes]]]]] = []
+        for item in items:
+            name = str(item.get("name") or "")
+            results.append({"name": name, "ok": False, "error": None})
+            if name not in live:
+                results[-1]["error"] = "session not found"
+                continue
+            commands = self.manager._input_commands([name], str(item.get("text") or ""), enter=bool(item.get("enter", True)))
+            if commands:
+                pending.append((len(results) - 1, commands))
+            else:
+                results[-1]["ok"] = True
+        errors = await self._run_parallel([self._deliver_input(commands) for _, commands in pending])
+        for (index, _), error in zip(pending, errors):
+            results[index]["ok"] = error is None
+            results[index]["error"] = None if error is None else str(error)
+        return results
+
+    async def broadcast_text(
+        self,
+        text: str,
+        *,
+        names: Optional[List[str]] = None,
+        template: Optional[str] = None,
+        pattern: Optional[str] = None,
+        enter: bool = True,
+    ) -> Dict[str, List[str]]:
+        """Async :meth:`SessionManager.broadcast_text`."""
+
+        live = await self._live_session_names()
+        # Selecting by template reads every session's metadata.
+        targets, missing = await asyncio.to_thread(self.manager._broadcast_targets, live, names, template, pattern)
+        await self._deliver_input(self.manager._input_commands(targets, text, enter=enter))
+        return {"sessions": targets, "missing": missing}
+
+    async def enqueue_one_off(
+        self,
+        name: str,
+        command: str,
+        *,
+        template: str = "script",
+        description: Optional[str] = None,
+        working_dir: Optional[str | Path] = None,
+        env: Optional[Dict[str, str]] = None,
+        priority: Optional[str] = None,
+    ) -> SessionMetadata:
+        metadata = await asyncio.to_thread(
+            self.manager._queue_one_off,
+            name,
+            command,
+            template=template,
+            description=description,
+            working_dir=working_dir,
+            env=env,
+            priority=self.manager.scheduler.normalize_priority(priority),
+        )
+        # Dispatch waits on the scheduler lock file and may launch several jobs.
+        await asyncio.to_thread(self.manager.scheduler.dispatch)
+        return await asyncio.to_thread(self.storage.load, name) or metadata
+
+    async def send_text(self, name: str, text: str, *, enter: bool = True) -> None:
+        await self._deliver_input(self.manager._input_commands([name], text, enter=enter))
+
+    async def capture_pane(
+        self,
+        name: str,
+        since_seq: Optional[int] = None,
+        *,
+        ansi: bool = True,
+    ) -> Optional[Dict[str, Any]]:
+        result = await self._execute_tmux(self.manager._capture_pane_args(name, ansi=ansi), capture=True)
+        if result.returncode != 0:
+            return None
+        return self.manager._screen_update(name, result.stdout, since_seq, ansi=ansi)
+
+    async def kill_session(self, name: str) -> None:
+        if not await self._session_exists(name):
+            await asyncio.to_thread(self.manager.scheduler.cancel, name)
+            return
+        await self._run_tmux(["kill-session", "-t", name])
+        await asyncio.to_thread(self.manager._mark_killed, name)
+        await asyncio.to_thread(self.manager.scheduler.dispatch)
+
+    async def tail_log(self, name: str, lines: int = 200) -> str:
+        return (await self.read_log(name, lines=lines)).text
+
+    async def read_log(
+        self,
+        name: str,
+        *,
+        lines: int = 200,
+        offset: Optional[int] = None,
+        max_bytes: int = logs.DEFAULT_MAX_BYTES,
+    ) -> logs.LogChunk:
+        return await asyncio.to_thread(self.manager.read_log, name, lines=lines, offset=offset, max_bytes=max_bytes)
+
+    async def read_log_range(
+        self,
+        name: str,
+        start: int,
+        end: Optional[int] = None,
+        *,
+        max_bytes: int = logs.DEFAULT_MAX_BYTES,
+    ) -> logs.LogChunk:
+        return await asyncio.to_thread(self.manager.read_log_range, name, start, end, max_bytes=max_bytes)
+
+    async def read_log_lines(
+        self,
+        name: str,
+        start: int,
+        end: Optional[int] = None,
+        *,
+        max_lines: int = logindex.DEFAULT_MAX_LINES,
+    ) -> logindex.LineRange:
+        return await asyncio.to_thread(self.manager.read_log_lines, name, start, end, max_lines=max_lines)
+
+    async def search_logs(
+        self,
+        query: str,
+        *,
+        names: Optional[List[str]] = None,
+        template: Optional[str] = None,
+        regex: bool = False,
+        ignore_case: bool = False,
+        limit: int = 100,
+    ) -> Dict[str, Any]:
+        # Indexing and scanning are file and CPU work, so they run in a worker thread.
+        return await asyncio.to_thread(
+            self.manager.search_logs,
+            query,
+            names=names,
+            template=template,
+            regex=regex,
+            ignore_case=ignore_case,
+            limit=limit,
+        )
+
+    async def list_jobs(
+        self,
+        *,
+        status: Optional[str | List[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.manager.list_jobs, status=status, limit=limit, offset=offset, after=after)
+
+    async def job_queue(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.manager.job_queue)
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.manager.get_job, job_id)
+
+    async def wait_for_job(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Await :meth:`SessionManager.wait_for_job` semantics without holding a thread."""
+
+        manager = self.manager
+        deadline = None if timeout is None else time.monotonic() + max(0.0, timeout)
+        while True:
+            job, metadata = await asyncio.to_thread(manager._pending_job, job_id)
+            if metadata is not None:
+                finished = await asyncio.to_thread(manager._result_path(metadata).exists)
+                await self._refresh_statuses([metadata], {} if finished else await self._snapshot_tmux())
+                job = await asyncio.to_thread(manager.get_job, job_id)
+            if job is None or metadata is None or job.get("status") in manager.JOB_TERMINAL_STATUSES:
+                return manager.scheduler.annotate([job])[0] if job is not None else None
+            if job.get("status") == "queued":
+                await asyncio.to_thread(manager.scheduler.dispatch)
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return manager.scheduler.annotate([job])[0]
+            wait = manager.JOB_WAIT_SLICE_SECONDS if remaining is None else min(remaining, manager.JOB_WAIT_SLICE_SECONDS)
+            await self._wait_for_channel(manager.job_channel(job_id), wait)
+
+    def close(self) -> None:
+        self.manager.close()
+
+    # ------------------------------------------------------------------
+    # tmux plumbing
+    # ------------------------------------------------------------------
+    async def _start_session(self, metadata: SessionMetadata, working_dir: str | Path, env: Dict[str, str]) -> None:
+        warm = self.manager._claim_warm(metadata)
+        if warm is not None and (
+            await self._execute_tmux(["rename-session", "-t", warm.name, metadata.name], capture=True)
+        ).returncode:
+            warm = None
+        # Planning creates the session directory, log file and one-off script.
+        plan = await asyncio.to_thread(
+            self.manager._launch_plan, metadata, working_dir=working_dir, extra_env=env or None, warm=warm
+        )
+        for args, command_env in plan:
+            await self._run_tmux(args, env=command_env)
+
+    async def _refresh_statuses(self, sessions: List[SessionMetadata], snapshot: Dict[str, Dict[str, Any]]) -> None:
+        # Status transitions are persisted, so they go through storage.
+        def refresh() -> None:
+            for metadata in sessions:
+                self.manager._refresh_status(metadata, snapshot)
+
+        await asyncio.to_thread(refresh)
+
+    async def _submit_control(
+        self,
+        command: List[str],
+        env: Optional[Dict[str, str]],
+    ) -> Optional[Tuple[TmuxControlClient, "Future[TmuxResult]"]]:
+        manager = self.manager
+        client = manager._control
+        if (
+            manager.control_mode
+            and env is None
+            and (client is None or not client.alive)
+            and time.monotonic() >= manager._control_retry_at
+        ):
+            # Starting the client waits for tmux to answer; once it runs, submitting is a pipe write.
+            await asyncio.to_thread(manager._control_client)
+        return manager._submit_control(command, env)
+
+    async def _live_session_names(self) -> Set[str]:
+        return set((await self._capture_tmux(["list-sessions", "-F", "#{session_name}"])).splitlines())
+
+    async def _run_parallel(self, calls: List[Awaitable[None]]) -> List[Optional[Exception]]:
+        """Await ``calls`` at most ``batch_concurrency`` at a time; returns each exception or ``None``."""
+
+        semaphore = asyncio.Semaphore(self.manager.batch_concurrency)
+
+        async def guarded(call: Awaitable[None]) -> Optional[Exception]:
+            async with semaphore:
+                try:
+                    await call
+                except Exception as exc:  # noqa: BLE001 - reported per item
+                    return exc
+                return None
+
+        return list(await asyncio.gather(*(guarded(call) for call in calls)))
+
+    async def _session_exists(self, name: str) -> bool:
+        return (await self._execute_tmux(["has-session", "-t", name], capture=True)).returncode == 0
+
+    async def _wait_for_channel(self, channel: str, timeout: float) -> bool:
+        started = time.monotonic()
+        process = await asyncio.create_subprocess_exec(
+            "tmux",
+            "wait-for",
+            channel,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            returncode = await asyncio.wait_for(process.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+        if returncode != 0:
+            await asyncio.sleep(max(0.0, min(timeout, 0.5) - (time.monotonic() - started)))
+        return returncode == 0
+
+    async def _snapshot_tmux(self) -> Dict[str, Dict[str, Any]]:
+        # The three listings are independent, so issue them together.
+        outputs = await asyncio.gather(
+            *(self._capture_tmux(list(query)) for query in self.manager.SNAPSHOT_QUERIES)
+        )
+        if not outputs[0]:
+            return {}
+        return self.manager._parse_snapshot(*outputs)
+
+    async def _capture_tmux(self, args: List[str], env: Optional[Dict[str, str]] = None) -> str:
+        result = await self._execute_tmux(args, env=env, capture=True)
+        if result.returncode != 0:
+            return ""
+        return result.stdout.strip()
+
+    async def _deliver_input(self, commands: List[Tuple[List[str], Optional[bytes]]]) -> None:
+        for args, stdin in commands:
+            if stdin is None:
+                await self._run_tmux(args)
+                continue
+            started = time.perf_counter()
+            process = await asyncio.create_subprocess_exec(
+                "tmux",
+                *args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            await process.communicate(stdin)
+            record_command(args, "subprocess", time.perf_counter() - started, process.returncode == 0)
+            if process.returncode != 0:
+                buffer = args[args.index("-b") + 1]
+                await self._execute_tmux(["delete-buffer", "-b", buffer], capture=True)
+                raise RuntimeError(f"tmux command failed: tmux {' '.join(args)}")
+
+    async def _run_tmux(self, args: List[str], env: Optional[Dict[str, str]] = None) -> None:
+        command = ["tmux", *args] if args and args[0] != "tmux" else args
+        result = await self._execute_tmux(command, env=env, capture=False)
+        if result.returncode != 0:
+            raise RuntimeError(f"tmux command failed: {' '.join(command)}")
+
+    async def _execute_tmux(
+        self,
+        args: List[str],
+        env: Optional[Dict[str, str]] = None,
+        *,
+        capture: bool,
+    ) -> TmuxResult:
+        command = ["tmux", *args] if args and args[0] != "tmux" else args
+        started = time.perf_counter()
+        submitted = await self._submit_control(command, env)
+        result: Optional[TmuxResult] = None
+        try:
+            if submitted is not None:
+                client, future = submitted
+                try:
+                    result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=client.timeout)
+                except TmuxControlUnavailable as exc:
+                    raise RuntimeError(f"tmux command interrupted: {' '.join(command)}") from exc
+                except asyncio.TimeoutError as exc:
+                    raise RuntimeError(f"tmux command timed out: {' '.join(command)}") from exc
+                return result
+            pipe = asyncio.subprocess.PIPE if capture else None
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                env=env,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=pipe,
+                stderr=pipe,
+            )
+            stdout, _ = await process.communicate()
+            result = TmuxResult(
+                returncode=process.returncode if process.returncode is not None else -1,
+                stdout=stdout.decode("utf-8", errors="replace") if stdout else "",
+            )
+            return result
+        finally:
+            transport = "subprocess" if submitted is None else "control"
+            ok = result is not None and result.returncode == 0
+            record_command(command, transport, time.perf_counter() - started, ok)
+
+
+__all__ = ["AsyncSessionManager"]
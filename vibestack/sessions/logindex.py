@@ -0,0 +1,383 @@
+"""Clean, line-numbered text alongside a session's raw console log.
+
+``console.log`` holds what ``pipe-pane`` saw: colour escapes, cursor movement and
+carriage-return redraws. :class:`LogIndex` follows it by logical offset (so it
+keeps working across rotation) and appends every completed line, rendered to
+plain text, to ``console.log.text``. ``console.log.text.json`` records how much
+raw output has been consumed and the byte offset of every ``checkpoint``-th
+line, so reading lines ``N..M`` seeks to the nearest checkpoint instead of
+scanning the file. Indexing is incremental: the session reconciler keeps it
+current in the background, and a read or search only indexes up to a byte
+budget itself, reporting what is still ``pending_bytes``.
+
+The text copy is capped separately from the raw log (``max_bytes``, 16 MiB by
+default), so it adds at most that much disk per session on top of the raw
+log and its segments.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import fcntl
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from . import logrotate, logs
+
+CHECKPOINT_LINES = 256
+# Rendered text is smaller than the raw output it comes from, so a quarter of the
+# raw rotation size still covers most of a live log.
+DEFAULT_MAX_TEXT_BYTES = logrotate.DEFAULT_MAX_BYTES // 4
+# Raw bytes a single read or search indexes before answering from what is indexed.
+DEFAULT_INDEX_BUDGET = 8 * 1024 * 1024
+DEFAULT_MAX_LINES = 2000
+_READ_SIZE = 1024 * 1024
+_INDEX_VERSION = 1
+
+_ESCAPE = (
+    r"\x1b\[[0-?]*[ -/]*[@-~]"  # CSI: colours, cursor movement, erase
+    r"|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)?"  # OSC: window titles, hyperlinks
+    r"|\x1b[PX^_][^\x1b]*(?:\x1b\\)?"  # DCS/SOS/PM/APC strings
+    r"|\x1b[ -/]*[0-~]"  # two-byte and charset sequences
+)
+_ESCAPES = re.compile(_ESCAPE)
+_CONTROLS = re.compile(r"[\x00-\x08\x0b-\x1f\x7f]")
+_TOKENS = re.compile(rf"(?P<esc>{_ESCAPE})|(?P<ctl>[\x00-\x08\x0b-\x1f\x7f])|(?P<text>[^\x00-\x08\x0b-\x1f\x7f]+)")
+# Anything that moves the cursor within a line needs the slower cell rendering.
+_MOTION = re.compile(r"[\r\x08]|\x1b\[[0-9;]*[CDGK]")
+
+
+def render_line(raw: str) -> str:
+    """Render one raw terminal line to the text it leaves on screen.
+
+    Escape sequences are dropped; carriage returns, backspaces and the
+    ``CSI C/D/G/K`` cursor and erase sequences are applied, so progress bars
+    and prompt redraws collapse to their final state.
+    """
+
+    raw = raw.rstrip("\r")
+    if not _MOTION.search(raw):
+        return _CONTROLS.sub("", _ESCAPES.sub("", raw)).rstrip()
+    cells: List[str] = []
+    cursor = 0
+    for match in _TOKENS.finditer(raw):
+        text = match.group("text")
+        if text is not None:
+            if cursor > len(cells):
+                cells.extend(" " * (cursor - len(cells)))
+            cells[cursor:cursor + len(text)] = text
+            cursor += len(text)
+            continue
+        control = match.group("ctl")
+        if control is not None:
+            if control == "\r":
+                cursor = 0
+            elif control == "\x08":
+                cursor = max(0, cursor - 1)
+            continue
+        sequence = match.group("esc")
+        if not sequence.startswith("\x1b[") or sequence[-1] not in "CDGK":
+            continue
+        params = sequence[2:-1]
+        count = int(params) if params.isdigit() else 0
+        if sequence[-1] == "C":
+            cursor += max(1, count)
+        elif sequence[-1] == "D":
+            cursor = max(0, cursor - max(1, count))
+        elif sequence[-1] == "G":
+            cursor = max(0, count - 1)
+        elif count == 0:
+            del cells[cursor:]
+        elif count == 1:
+            cells[:cursor] = " " * min(cursor, len(cells))
+        else:
+            cells = [" "] * min(cursor, len(cells))
+    return "".join(cells).rstrip()
+
+
+@dataclass
+class LineRange:
+    """Clean lines ``first..last`` (1-based, inclusive) of a session log."""
+
+    text: str
+    first: int
+    last: int
+    total: int
+    first_available: int
+    pending_bytes: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "log": self.text,
+            "from_line": self.first,
+            "to_line": self.last,
+            "total_lines": self.total,
+            "first_available_line": self.first_available,
+            "pending_bytes": self.pending_bytes,
+        }
+
+
+def _empty_state() -> Dict[str, Any]:
+    return {
+        "version": _INDEX_VERSION,
+        "raw_offset": 0,
+        "lines": 0,
+        "first_line": 1,
+        "text_size": 0,
+        "checkpoints": [],
+    }
+
+
+class LogIndex:
+    """Incrementally maintained plain-text copy of ``log_path`` with a sparse line index.
+
+    Line numbers are absolute: they keep counting when old raw segments are
+    rotated away or the text copy is trimmed past ``max_bytes`` (the oldest
+    half is dropped), and ``first_available`` tells readers where it now starts.
+    """
+
+    def __init__(
+        self,
+        log_path: Path,
+        *,
+        checkpoint: int = CHECKPOINT_LINES,
+        max_bytes: int = DEFAULT_MAX_TEXT_BYTES,
+    ) -> None:
+        self.log_path = Path(log_path)
+        self.text_path = self.log_path.with_name(f"{self.log_path.name}.text")
+        self.state_path = self.log_path.with_name(f"{self.log_path.name}.text.json")
+        self.lock_path = self.log_path.with_name(f".{self.log_path.name}.text.lock")
+        self.checkpoint = max(1, checkpoint)
+        self.max_bytes = max(0, max_bytes)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def update(self, budget: Optional[int] = None) -> Dict[str, Any]:
+        """Index raw output written since the last call; returns the index state.
+
+        At most ``budget`` raw bytes are indexed (all of them when ``None``). The
+        returned state adds ``indexed_bytes`` for this call and ``pending_bytes``
+        left over when the budget ran out.
+        """
+
+        with self._locked():
+            return self._update(budget)
+
+    def read_lines(
+        self,
+        start: int,
+        end: Optional[int] = None,
+        *,
+        max_lines: int = DEFAULT_MAX_LINES,
+        budget: Optional[int] = DEFAULT_INDEX_BUDGET,
+    ) -> LineRange:
+        """Return lines ``start..end`` (1-based, inclusive), at most ``max_lines`` of them.
+
+        ``start`` before the first retained line begins there instead; a negative
+        ``start`` counts back from the newest line (``-1`` is the last line).
+        """
+
+        with self._locked():
+            state = self._update(budget)
+            pending = int(state["pending_bytes"])
+            total = int(state["lines"])
+            first_available = int(state["first_line"])
+            if start < 0:
+                start = total + start + 1
+            start = max(start, first_available)
+            stop = total if end is None else min(end, total)
+            stop = min(stop, start + max(0, max_lines) - 1)
+            if stop < start:
+                return LineRange(
+                    text="", first=start, last=start - 1, total=total, first_available=first_available, pending_bytes=pending
+                )
+            selected = [text for _, text in self._iter_lines(state, start, stop)]
+        return LineRange(
+            text="\n".join(selected),
+            first=start,
+            last=start + len(selected) - 1,
+            total=total,
+            first_available=first_available,
+            pending_bytes=pending,
+        )
+
+    def search(
+        self,
+        matcher: Callable[[str], bool],
+        *,
+        limit: int = 100,
+        budget: Optional[int] = DEFAULT_INDEX_BUDGET,
+    ) -> List[Dict[str, Any]]:
+        """Return ``{"line", "text"}`` for up to ``limit`` lines accepted by ``matcher``.
+
+        Only indexed text is searched; see :meth:`update` for ``budget``.
+        """
+
+        matches: List[Dict[str, Any]] = []
+        with self._locked():
+            state = self._update(budget)
+            if limit <= 0:
+                return matches
+            for number, text in self._iter_lines(state, int(state["first_line"]), int(state["lines"])):
+                if matcher(text):
+                    matches.append({"line": number, "text": text})
+                    if len(matches) >= limit:
+                        break
+        return matches
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock_path.open("a+") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return _empty_state()
+        if not isinstance(state, dict) or state.get("version") != _INDEX_VERSION:
+            return _empty_state()
+        return state
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        tmp_path = self.state_path.with_name(f".{self.state_path.name}.tmp")
+        tmp_path.write_text(json.dumps(state, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, self.state_path)
+
+    def _update(self, budget: Optional[int] = None) -> Dict[str, Any]:
+        state = self._load_state()
+        state.update(indexed_bytes=0, pending_bytes=0)
+        view = logs._open_view(self.log_path)
+        if view is None:
+            return state
+        with view:
+            if view.end < state["raw_offset"]:
+                state = _empty_state()  # the log was replaced; start over
+                state.update(indexed_bytes=0, pending_bytes=0)
+            raw_offset = max(int(state["raw_offset"]), view.start)
+            if raw_offset >= view.end and raw_offset == state["raw_offset"]:
+                return state
+            limit = view.end if budget is None else min(view.end, raw_offset + max(0, budget))
+            indexed_from = raw_offset
+            with self.text_path.open("ab") as text_file:
+                # Drop anything written after the last saved state (an interrupted update).
+                text_file.truncate(int(state["text_size"]))
+                text_file.seek(0, os.SEEK_END)
+                while raw_offset < limit:
+                    data = view.read(raw_offset, min(_READ_SIZE, limit - raw_offset))
+                    if not data:
+                        break
+                    cut = data.rfind(b"\n") + 1
+                    if cut == 0:
+                        if raw_offset + len(data) >= view.end:
+                            break  # wait for the rest of the line
+                        if len(data) < _READ_SIZE and raw_offset > indexed_from:
+                            break  # out of budget mid-line; resume from its start
+                        cut = len(data)  # an overlong line is split at the read size or budget
+                    block = data[:cut].decode("utf-8", errors="replace")
+                    raw_lines = block.split("\n")
+                    if block.endswith("\n"):
+                        raw_lines.pop()
+                    for raw_line in raw_lines:
+                        self._append_line(state, text_file, render_line(raw_line))
+                    raw_offset += cut
+            state["raw_offset"] = raw_offset
+            pending = view.end - raw_offset if limit < view.end else 0
+        if self.max_bytes and state["text_size"] > self.max_bytes:
+            self._trim(state)
+        state.pop("indexed_bytes", None)
+        state.pop("pending_bytes", None)
+        self._save_state(state)
+        state.update(indexed_bytes=raw_offset - indexed_from, pending_bytes=pending)
+        return state
+
+    def _append_line(self, state: Dict[str, Any], text_file: Any, text: str) -> None:
+        number = int(state["lines"]) + 1
+        if (number - 1) % self.checkpoint == 0 or not state["checkpoints"]:
+            state["checkpoints"].append([number, int(state["text_size"])])
+        encoded = text.encode("utf-8") + b"\n"
+        text_file.write(encoded)
+        state["lines"] = number
+        state["text_size"] = int(state["text_size"]) + len(encoded)
+
+    def _trim(self, state: Dict[str, Any]) -> None:
+        target = int(state["text_size"]) - self.max_bytes // 2
+        keep = [entry for entry in state["checkpoints"] if entry[1] >= target]
+        if not keep:
+            return
+        first_line, cut = keep[0]
+        tmp_path = self.text_path.with_name(f".{self.text_path.name}.tmp")
+        with self.text_path.open("rb") as source, tmp_path.open("wb") as destination:
+            source.seek(cut)
+            while True:
+                block = source.read(_READ_SIZE)
+                if not block:
+                    break
+                destination.write(block)
+        os.replace(tmp_path, self.text_path)
+        state["checkpoints"] = [[line, offset - cut] for line, offset in keep]
+        state["first_line"] = first_line
+        state["text_size"] = int(state["text_size"]) - cut
+
+    def _iter_lines(self, state: Dict[str, Any], start: int, stop: int) -> Iterator[Tuple[int, str]]:
+        checkpoints = state["checkpoints"]
+        if not checkpoints or start > stop:
+            return
+        position = bisect.bisect_right([line for line, _ in checkpoints], start) - 1
+        number, offset = checkpoints[max(0, position)]
+        try:
+            handle = self.text_path.open("rb")
+        except FileNotFoundError:
+            return
+        with handle:
+            handle.seek(offset)
+            for raw in handle:
+                if number > stop:
+                    break
+                if number >= start:
+                    yield number, raw.decode("utf-8", errors="replace").rstrip("\n")
+                number += 1
+
+
+def compile_matcher(query: str, *, regex: bool = False, ignore_case: bool = False) -> Callable[[str], bool]:
+    """Return a predicate for ``query`` as a substring or, with ``regex``, a regular expression.
+
+    Raises :class:`ValueError` for an invalid regular expression.
+    """
+
+    if regex:
+        try:
+            pattern = re.compile(query, re.IGNORECASE if ignore_case else 0)
+        except re.error as exc:
+            raise ValueError(f"Invalid regular expression: {exc}") from exc
+        return lambda line: pattern.search(line) is not None
+    if ignore_case:
+        needle = query.casefold()
+        return lambda line: needle in line.casefold()
+    return lambda line: query in line
+
+
+__all__ = [
+    "CHECKPOINT_LINES",
+    "DEFAULT_INDEX_BUDGET",
+    "DEFAULT_MAX_TEXT_BYTES",
+    "DEFAULT_MAX_LINES",
+    "LineRange",
+    "LogIndex",
+    "compile_matcher",
+    "render_line",
+]
@@ -0,0 +1,263 @@
+"""Size-capped, compressing writer for session console logs.
+
+When ``VIBESTACK_LOG_MAX_BYTES`` is set, tmux ``pipe-pane`` feeds pane output
+into this module's CLI instead of ``cat`` (one writer process per live session).
+When the live ``console.log`` reaches ``--max-bytes`` it is renamed to a numbered
+segment and a fresh live file is started; a background thread then compresses
+the segment (``console.log.<n>.gz`` or ``.zst``) so pane output never waits on
+it. ``console.log.segments.json`` records, for every retained segment, the
+range of *logical* byte offsets it covers, plus where the live file starts, so
+readers in :mod:`vibestack.sessions.logs` can address the log as one stream.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import sys
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional
+
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore[assignment]
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_KEEP_SEGMENTS = 10
+DEFAULT_CODEC = "gzip"
+_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst", "none": ""}
+
+
+def index_path(log_path: Path) -> Path:
+    return log_path.with_name(f"{log_path.name}.segments.json")
+
+
+def load_index(log_path: Path) -> Dict[str, Any]:
+    """Return the segment index for ``log_path`` (an empty one if never rotated)."""
+
+    try:
+        payload = json.loads(index_path(log_path).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        payload = {}
+    if not isinstance(payload, dict):
+        payload = {}
+    payload.setdefault("segments", [])
+    payload.setdefault("live_start", 0)
+    payload.setdefault("live_inode", None)
+    payload.setdefault("next_segment", 1)
+    return payload
+
+
+def _write_index(log_path: Path, payload: Dict[str, Any]) -> None:
+    destination = index_path(log_path)
+    tmp_path = destination.with_name(f".{destination.name}.tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    os.replace(tmp_path, destination)
+
+
+def resolve_codec(codec: Optional[str]) -> str:
+    selected = (codec or DEFAULT_CODEC).strip().lower()
+    if selected in {"zst", "zstandard"}:
+        selected = "zstd"
+    if selected in {"gz"}:
+        selected = "gzip"
+    if selected == "zstd" and zstandard is None:
+        return "gzip"
+    return selected if selected in _EXTENSIONS else DEFAULT_CODEC
+
+
+def open_segment(log_path: Path, segment: Dict[str, Any]) -> Optional[BinaryIO]:
+    """Open ``segment`` as a stream of decompressed bytes, or ``None`` if it has been removed.
+
+    Compressed streams only seek forwards, by decompressing and discarding, so
+    nothing beyond the decoder's buffers is held in memory.
+    """
+
+    path = log_path.with_name(segment["file"])
+    try:
+        handle = path.open("rb")
+    except FileNotFoundError:
+        return None
+    codec = segment.get("codec", "none")
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=handle, mode="rb")  # type: ignore[return-value]
+    if codec == "zstd":
+        if zstandard is None:
+            handle.close()
+            raise RuntimeError("zstandard is required to read zstd log segments")
+        return zstandard.ZstdDecompressor().stream_reader(handle, closefd=True)
+    return handle
+
+
+class RotatingLogWriter:
+    """Appends to ``log_path`` and rolls it into compressed segments past ``max_bytes``."""
+
+    def __init__(
+        self,
+        log_path: Path,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        keep: int = DEFAULT_KEEP_SEGMENTS,
+        codec: Optional[str] = None,
+    ) -> None:
+        self.log_path = log_path
+        self.max_bytes = max_bytes
+        self.keep = max(0, keep)
+        self.codec = resolve_codec(codec)
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = self.log_path.open("ab")
+        self._size = self._handle.tell()
+        # Guards the index, which the writer and the compression thread both update.
+        self._index_lock = threading.Lock()
+        self._compressor: Optional[threading.Thread] = None
+        if self.max_bytes > 0:
+            # Pin the live file's inode up front so readers can detect the first rotation.
+            index = load_index(self.log_path)
+            inode = os.fstat(self._handle.fileno()).st_ino
+            if index["live_inode"] != inode:
+                index["live_inode"] = inode
+                _write_index(self.log_path, index)
+
+    def write(self, data: bytes) -> None:
+        self._handle.write(data)
+        self._handle.flush()
+        self._size += len(data)
+        if self.max_bytes > 0 and self._size >= self.max_bytes:
+            self.rotate()
+
+    def close(self) -> None:
+        self._handle.close()
+        self.wait_for_compression()
+
+    def wait_for_compression(self) -> None:
+        if self._compressor is not None:
+            self._compressor.join()
+            self._compressor = None
+
+    def rotate(self) -> None:
+        self._handle.close()
+        with self._index_lock:
+            index = load_index(self.log_path)
+            size = self.log_path.stat().st_size
+            number = int(index["next_segment"])
+            # The segment is published uncompressed and compressed in the background.
+            raw_name = f"{self.log_path.name}.{number}"
+            raw_path = self.log_path.with_name(raw_name)
+
+            # Create the new live file before publishing the index so readers can tell,
+            # by inode, whether the console.log they opened matches the index they read.
+            next_live = self.log_path.with_name(f".{self.log_path.name}.next")
+            next_live.write_bytes(b"")
+            raw_path.unlink(missing_ok=True)  # left behind by a writer that died mid-rotation
+            os.link(self.log_path, raw_path)
+            segments: List[Dict[str, Any]] = list(index["segments"])
+            segments.append(
+                {
+                    "file": raw_name,
+                    "start": int(index["live_start"]),
+                    "end": int(index["live_start"]) + size,
+                    "codec": "none",
+                }
+            )
+            dropped = segments[: max(0, len(segments) - self.keep)]
+            index.update(
+                {
+                    "segments": segments[len(dropped):],
+                    "live_start": int(index["live_start"]) + size,
+                    "live_inode": next_live.stat().st_ino,
+                    "next_segment": number + 1,
+                }
+            )
+            _write_index(self.log_path, index)
+            os.replace(next_live, self.log_path)
+            for segment in dropped:
+                self.log_path.with_name(segment["file"]).unlink(missing_ok=True)
+        self._handle = self.log_path.open("ab")
+        self._size = 0
+        if self.codec != "none" and any(segment["file"] == raw_name for segment in index["segments"]):
+            # One compression at a time; a log filling faster than that waits here.
+            self.wait_for_compression()
+            self._compressor = threading.Thread(
+                target=self._compress_segment, args=(raw_name,), name="vibestack-log-compress", daemon=True
+            )
+            self._compressor.start()
+
+    def _compress_segment(self, raw_name: str) -> None:
+        raw_path = self.log_path.with_name(raw_name)
+        name = f"{raw_name}{_EXTENSIONS[self.codec]}"
+        destination = self.log_path.with_name(name)
+        self._compress(raw_path, destination)
+        with self._index_lock:
+            index = load_index(self.log_path)
+            for segment in index["segments"]:
+                if segment["file"] == raw_name:
+                    segment.update({"file": name, "codec": self.codec})
+                    _write_index(self.log_path, index)
+                    break
+            else:  # rotated out while compressing
+                destination.unlink(missing_ok=True)
+            raw_path.unlink(missing_ok=True)
+
+    def _compress(self, source: Path, destination: Path) -> None:
+        tmp_path = destination.with_name(f".{destination.name}.tmp")
+        with source.open("rb") as src, tmp_path.open("wb") as raw_dst:
+            if self.codec == "gzip":
+                with gzip.GzipFile(fileobj=raw_dst, mode="wb") as dst:
+                    shutil.copyfileobj(src, dst)
+            elif self.codec == "zstd":
+                zstandard.ZstdCompressor().copy_stream(src, raw_dst)
+            else:
+                shutil.copyfileobj(src, raw_dst)
+        os.replace(tmp_path, destination)
+
+
+def pipe_command(
+    log_path: Path,
+    *,
+    max_bytes: int,
+    keep: int = DEFAULT_KEEP_SEGMENTS,
+    codec: Optional[str] = None,
+) -> List[str]:
+    """Return the argv that runs the rotating writer for ``log_path``."""
+
+    return [
+        sys.executable,
+        "-m",
+        "vibestack.sessions.logrotate",
+        "--max-bytes",
+        str(max_bytes),
+        "--keep",
+        str(keep),
+        "--codec",
+        resolve_codec(codec),
+        str(log_path),
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Append stdin to a size-capped, rotating log")
+    parser.add_argument("log_path")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES)
+    parser.add_argument("--keep", type=int, default=DEFAULT_KEEP_SEGMENTS)
+    parser.add_argument("--codec", default=DEFAULT_CODEC, choices=["gzip", "zstd", "none"])
+    args = parser.parse_args(argv)
+
+    writer = RotatingLogWriter(Path(args.log_path), max_bytes=args.max_bytes, keep=args.keep, codec=args.codec)
+    try:
+        while True:
+            data = os.read(0, 65536)
+            if not data:
+                break
+            writer.write(data)
+    finally:
+        writer.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,410 @@
+"""Helpers for reading session console logs without loading them whole.
+
+Offsets are *logical*: once :mod:`vibestack.sessions.logrotate` has rolled part of
+a log into compressed segments, offsets keep counting from the first byte ever
+written, and reads span the retained segments and the live ``console.log``.
+"""
+
+from __future__ import annotations
+
+import collections
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from . import logrotate
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+DEFAULT_MAX_BYTES = 256 * 1024
+_OPEN_RETRIES = 3
+# Decompressed segment data is cached in blocks, never whole segments: at most
+# _SEGMENT_CACHE_BLOCKS * _SEGMENT_BLOCK_SIZE bytes (1 MiB) per process, plus a few
+# open decompression streams so sequential reads resume instead of starting over.
+_SEGMENT_BLOCK_SIZE = 64 * 1024
+_SEGMENT_CACHE_BLOCKS = 16
+_SEGMENT_STREAMS = 4
+
+
+@dataclass
+class LogChunk:
+    """Decoded slice of a log file.
+
+    ``offset`` is the byte position the text starts at and ``next_offset`` the
+    position just past it, which callers hand back to continue reading.
+    """
+
+    text: str
+    offset: int
+    next_offset: int
+
+    def to_dict(self) -> dict:
+        return {"log": self.text, "offset": self.offset, "next_offset": self.next_offset}
+
+
+def _complete_utf8_length(data: bytes) -> int:
+    """Return the length of ``data`` without a trailing, incomplete UTF-8 sequence."""
+
+    length = len(data)
+    for back in range(1, min(4, length) + 1):
+        byte = data[length - back]
+        if byte & 0b1100_0000 == 0b1000_0000:
+            continue  # continuation byte, keep looking for the lead byte
+        if byte & 0b1000_0000 == 0:
+            return length
+        if byte & 0b1110_0000 == 0b1100_0000:
+            needed = 2
+        elif byte & 0b1111_0000 == 0b1110_0000:
+            needed = 3
+        elif byte & 0b1111_1000 == 0b1111_0000:
+            needed = 4
+        else:
+            return length
+        return length if back >= needed else length - back
+    return length
+
+
+_SegmentKey = Tuple[str, str, int]
+
+_segment_lock = threading.Lock()
+_segment_blocks_cache: "collections.OrderedDict[Tuple[_SegmentKey, int], bytes]" = collections.OrderedDict()
+_segment_streams: "collections.OrderedDict[_SegmentKey, Tuple[BinaryIO, int]]" = collections.OrderedDict()
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    parts: List[bytes] = []
+    while size > 0:
+        data = stream.read(size)
+        if not data:
+            break
+        parts.append(data)
+        size -= len(data)
+    return b"".join(parts)
+
+
+def _segment_blocks(log_path: Path, segment: Dict[str, Any], mtime_ns: int, first: int, last: int) -> List[bytes]:
+    """Return decompressed blocks ``first..last`` of ``segment``, streaming only what is missing.
+
+    Blocks just before ``first`` are decoded and cached on the way, so reading
+    backwards from the end of a segment (as :func:`tail_lines` does) mostly hits
+    the cache; a stream left at or before ``first`` is resumed rather than reopened.
+    """
+
+    key: _SegmentKey = (str(log_path), segment["file"], mtime_ns)
+    wanted = range(first, last + 1)
+    with _segment_lock:
+        cached = [_segment_blocks_cache.get((key, index)) for index in wanted]
+        if all(block is not None for block in cached):
+            for index in wanted:
+                _segment_blocks_cache.move_to_end((key, index))
+            return cached  # type: ignore[return-value]
+        begin = max(0, first - max(0, _SEGMENT_CACHE_BLOCKS - len(wanted)))
+        reusable = _segment_streams.pop(key, None)
+    if reusable is not None and reusable[1] <= first * _SEGMENT_BLOCK_SIZE:
+        stream, position = reusable
+        begin = max(begin, position // _SEGMENT_BLOCK_SIZE)
+    else:
+        if reusable is not None:
+            reusable[0].close()
+        opened = logrotate.open_segment(log_path, segment)
+        if opened is None:
+            return [b"" for _ in wanted]
+        stream, position = opened, 0
+    blocks: Dict[int, bytes] = {}
+    try:
+        # Forward-only for compressed streams: decode and discard up to ``begin``.
+        while position < begin * _SEGMENT_BLOCK_SIZE:
+            skipped = stream.read(min(_SEGMENT_BLOCK_SIZE, begin * _SEGMENT_BLOCK_SIZE - position))
+            if not skipped:
+                break
+            position += len(skipped)
+        for index in range(begin, last + 1):
+            block = _read_exact(stream, _SEGMENT_BLOCK_SIZE)
+            position += len(block)
+            blocks[index] = block
+            if len(block) < _SEGMENT_BLOCK_SIZE:
+                break
+    except Exception:
+        stream.close()
+        raise
+    with _segment_lock:
+        for index, block in blocks.items():
+            _segment_blocks_cache[(key, index)] = block
+            _segment_blocks_cache.move_to_end((key, index))
+        while len(_segment_blocks_cache) > _SEGMENT_CACHE_BLOCKS:
+            _segment_blocks_cache.popitem(last=False)
+        stale = [entry[0] for entry in [_segment_streams.pop(key, None)] if entry is not None]
+        _segment_streams[key] = (stream, position)
+        while len(_segment_streams) > _SEGMENT_STREAMS:
+            stale.append(_segment_streams.popitem(last=False)[1][0])
+    for stale_stream in stale:
+        stale_stream.close()
+    return [blocks.get(index, b"") for index in wanted]
+
+
+class _LogView:
+    """Logical byte view over a log's retained segments plus its live file."""
+
+    def __init__(self, path: Path, handle: BinaryIO, index: Dict[str, Any]) -> None:
+        self.path = path
+        self.handle = handle
+        self.segments: List[Dict[str, Any]] = index["segments"]
+        self.live_start = int(index["live_start"])
+        self.start = int(self.segments[0]["start"]) if self.segments else self.live_start
+        handle.seek(0, os.SEEK_END)
+        self.end = self.live_start + handle.tell()
+
+    def __enter__(self) -> "_LogView":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.handle.close()
+
+    def read(self, offset: int, size: int) -> bytes:
+        parts: List[bytes] = []
+        while size > 0 and offset < self.end:
+            if offset >= self.live_start:
+                self.handle.seek(offset - self.live_start)
+                data = self.handle.read(size)
+            else:
+                data = self._read_segment(offset, size)
+            if not data:
+                break
+            parts.append(data)
+            offset += len(data)
+            size -= len(data)
+        return b"".join(parts)
+
+    def _read_segment(self, offset: int, size: int) -> bytes:
+        for segment in self.segments:
+            if segment["start"] <= offset < segment["end"]:
+                try:
+                    mtime_ns = self.path.with_name(segment["file"]).stat().st_mtime_ns
+                except FileNotFoundError:
+                    return b""
+                relative = offset - segment["start"]
+                size = min(size, segment["end"] - offset)
+                first = relative // _SEGMENT_BLOCK_SIZE
+                last = (relative + size - 1) // _SEGMENT_BLOCK_SIZE
+                data = b"".join(_segment_blocks(self.path, segment, mtime_ns, first, last))
+                skip = relative - first * _SEGMENT_BLOCK_SIZE
+                return data[skip : skip + size]
+        return b""
+
+
+def _open_view(path: Path) -> Optional[_LogView]:
+    """Open ``path`` together with a segment index that matches the opened file.
+
+    The rotating writer publishes the inode of the new live file before swapping it
+    in, so a mismatch means a rotation happened between reading the index and
+    opening the file; retrying picks up the consistent pair.
+    """
+
+    for attempt in range(_OPEN_RETRIES):
+        index = logrotate.load_index(path)
+        try:
+            handle = path.open("rb")
+        except FileNotFoundError:
+            return None
+        expected = index.get("live_inode")
+        if expected is None or os.fstat(handle.fileno()).st_ino == expected or attempt == _OPEN_RETRIES - 1:
+            return _LogView(path, handle, index)
+        handle.close()
+        time.sleep(0.01)
+    return None
+
+
+def log_bounds(path: Path) -> Tuple[int, int]:
+    """Return the first retained and the end logical offsets of ``path``."""
+
+    view = _open_view(path)
+    if view is None:
+        return 0, 0
+    with view:
+        return view.start, view.end
+
+
+def disk_usage(path: Path) -> int:
+    """Return the bytes ``path`` occupies on disk: the live file plus its retained segments."""
+
+    total = 0
+    files = [path] + [path.with_name(segment["file"]) for segment in logrotate.load_index(path)["segments"]]
+    for file_path in files:
+        try:
+            total += file_path.stat().st_size
+        except FileNotFoundError:
+            continue
+    return total
+
+
+def tail_lines(path: Path, lines: int, *, block_size: int = DEFAULT_BLOCK_SIZE) -> LogChunk:
+    """Return the last ``lines`` lines of ``path`` by reading blocks backwards from EOF.
+
+    Lines are split with :meth:`bytes.splitlines` (``\\n``, ``\\r\\n`` and ``\\r``), so
+    the result matches ``"\\n".join(text.splitlines()[-lines:])`` for console output,
+    but only the bytes that hold those lines (plus at most one block) are read and
+    each block is scanned once. Rotated segments are only decompressed when the live
+    file is too short.
+    """
+
+    view = _open_view(path)
+    if view is None:
+        return LogChunk(text="", offset=0, next_offset=0)
+    with view:
+        end = view.end
+        if lines <= 0 or end == view.start:
+            return LogChunk(text="", offset=end, next_offset=end)
+        position = end
+        blocks: List[bytes] = []
+        newlines = 0
+        first_newline = -1  # logical offset of the earliest newline read so far
+        trailing_partial: Optional[bool] = None
+        while position > view.start:
+            read_size = min(block_size, position - view.start)
+            position -= read_size
+            block = view.read(position, read_size)
+            blocks.append(block)
+            if trailing_partial is None and block:
+                trailing_partial = not block.endswith(b"\n")
+            count = block.count(b"\n")
+            if count:
+                newlines += count
+                first_newline = position + block.find(b"\n")
+            # Lines wholly after the earliest newline; each holds at least one split line.
+            if first_newline >= 0 and newlines - 1 + bool(trailing_partial) >= lines:
+                break
+        buffer = b"".join(reversed(blocks))
+        # Only split from just after a newline so every line is complete.
+        start = 0 if position == view.start else first_newline + 1 - position
+    parts = buffer[start:].splitlines(keepends=True)
+    skipped = sum(len(part) for part in parts[:-lines])
+    selected = b"".join(parts[-lines:]).splitlines()
+    return LogChunk(
+        text=b"\n".join(selected).decode("utf-8", errors="replace"),
+        offset=position + start + skipped,
+        next_offset=end,
+    )
+
+
+def _decode_chunk(data: bytes, start: int) -> LogChunk:
+    usable = _complete_utf8_length(data)
+    if usable == 0 and data:
+        usable = len(data)  # never stall on undecodable bytes
+    return LogChunk(
+        text=data[:usable].decode("utf-8", errors="replace"),
+        offset=start,
+        next_offset=start + usable,
+    )
+
+
+def read_from(path: Path, offset: int, *, max_bytes: int = DEFAULT_MAX_BYTES) -> LogChunk:
+    """Return up to ``max_bytes`` of ``path`` starting at logical byte ``offset``.
+
+    An offset past the end of the log means it was replaced, so reading starts over
+    from the oldest retained byte; so does an offset that rotation already dropped.
+    A trailing partial UTF-8 sequence is left for the next call instead of being
+    decoded as a replacement character.
+    """
+
+    view = _open_view(path)
+    if view is None:
+        return LogChunk(text="", offset=0, next_offset=0)
+    with view:
+        start = offset if view.start <= offset <= view.end else view.start
+        data = view.read(start, max(0, max_bytes))
+    return _decode_chunk(data, start)
+
+
+def read_range(path: Path, start: int, end: Optional[int] = None, *, max_bytes: int = DEFAULT_MAX_BYTES) -> LogChunk:
+    """Return logical bytes ``[start, end)`` of ``path``, capped at ``max_bytes``.
+
+    Unlike :func:`read_from` the range is clamped rather than restarted: a ``start``
+    older than the retained segments begins at the oldest byte still available.
+    """
+
+    view = _open_view(path)
+    if view is None:
+        return LogChunk(text="", offset=0, next_offset=0)
+    with view:
+        begin = min(max(start, view.start), view.end)
+        stop = view.end if end is None else min(max(end, begin), view.end)
+        data = view.read(begin, min(stop - begin, max(0, max_bytes)))
+    return _decode_chunk(data, begin)
+
+
+class LogFollower:
+    """Offset-polling follower for a single session log.
+
+    Each :meth:`poll` stats the live file and its segment index and returns the
+    output appended since the previous call (or ``None``), so idle polls cost two
+    ``stat`` calls. :meth:`pending` is that check alone, for callers that want to
+    hand the read itself to a worker thread.
+    """
+
+    def __init__(self, path: Path, offset: int = 0, *, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = path
+        self.offset = offset
+        self.max_bytes = max_bytes
+        self._index_path = logrotate.index_path(path)
+        self._index_stamp: Optional[int] = None
+        self._live_start = 0
+
+    def _current_live_start(self) -> int:
+        try:
+            stamp = self._index_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            stamp = None
+        if stamp != self._index_stamp:
+            self._index_stamp = stamp
+            self._live_start = int(logrotate.load_index(self.path)["live_start"]) if stamp is not None else 0
+        return self._live_start
+
+    def pending(self) -> bool:
+        """Return whether :meth:`poll` has output to read, without reading it."""
+
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return False
+        return self._current_live_start() + size != self.offset
+
+    def poll(self) -> Optional[LogChunk]:
+        if not self.pending():
+            return None
+        chunk = read_from(self.path, self.offset, max_bytes=self.max_bytes)
+        if chunk.next_offset == self.offset and chunk.offset == self.offset:
+            return None
+        self.offset = chunk.next_offset
+        return chunk
+
+    def check(self) -> bool:
+        """Return whether output was appended since the last call, without reading it.
+
+        The follower moves to the current end, so watchers that only need to
+        know *that* the log grew pay the same two ``stat`` calls as an idle poll.
+        """
+
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return False
+        end = self._current_live_start() + size
+        if end == self.offset:
+            return False
+        self.offset = end
+        return True
+
+
+__all__ = [
+    "DEFAULT_BLOCK_SIZE",
+    "DEFAULT_MAX_BYTES",
+    "LogChunk",
+    "LogFollower",
+    "disk_usage",
+    "log_bounds",
+    "read_from",
+    "read_range",
+    "tail_lines",
+]
@@ -1,95 +1,181 @@
 from __future__ import annotations
 
+import fnmatch
 import json
 import os
 import shlex
 import shutil
 import subprocess
+import threading
+import time
 import uuid
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
+from . import logindex, logrotate, logs
 from .codex_config import CodexConfigManager
 from .models import ISO_FORMAT, SessionMetadata, SessionType
-from .storage import SessionStorage
+from .pool import WarmPool, WarmSession
+from .scheduler import JobScheduler
+from .screen import ScreenTracker
+from .storage import SessionStorage, open_storage
+from .templates import DEFAULT_TEMPLATES, TemplateRegistry
+from .tmux import (
+    TmuxControlClient,
+    TmuxControlUnavailable,
+    TmuxResult,
+    chain_commands,
+    escape_argument,
+    record_command,
+)
+
+
+def _env_flag(name: str) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return False
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
 
 
 class SessionManager:
     """Coordinates tmux session lifecycle and persistence."""
 
-    DEFAULT_TEMPLATES: Dict[str, Dict[str, Any]] = {
-        "bash": {
-            "command": "printf 'Welcome to VibeStack\\n'",
-            "label": "Welcome shell",
-            "default_type": SessionType.LONG_RUNNING.value,
-            "include_files": [
-                {"source": "AGENTS.md", "target": "AGENTS.md"},
-                {"source": "TASKS.md", "target": "TASKS.md"},
-            ],
-        },
-        "codex": {
-            "command": "codex",
-            "label": "Codex CLI",
-            "default_type": SessionType.LONG_RUNNING.value,
-            "include_files": [
-                {"source": "AGENTS.md", "target": "AGENTS.md"},
-                {"source": "TASKS.md", "target": "TASKS.md"},
-            ],
-            "command_args": [
-                "--model",
-                "gpt-5-codex",
-                "--sandbox",
-                "danger-full-access",
-                "--ask-for-approval",
-                "never",
-            ],
-        },
-        "script": {
-            "command": "bash --login",
-            "label": "One-off script",
-            "default_type": SessionType.ONE_OFF.value,
-            "hidden": True,
-        },
-    }
-
-    def __init__(self, session_root: Optional[Path | str] = None) -> None:
-        repo_root = Path(os.environ.get("VIBESTACK_HOME") or Path.cwd())
+    DEFAULT_TEMPLATES: Dict[str, Dict[str, Any]] = DEFAULT_TEMPLATES
+
+    # Commands that need the caller's terminal and can never go through control mode.
+    INTERACTIVE_TMUX_COMMANDS = {"attach-session", "attach", "a"}
+    CONTROL_RETRY_SECONDS = 5.0
+    # Job states that end a wait_for_job call.
+    JOB_TERMINAL_STATUSES = frozenset({"completed", "failed", "stopped"})
+    # Upper bound on one tmux wait-for before the job is re-checked, in case a
+    # signal was lost (e.g. the tmux server exited with the last session).
+    JOB_WAIT_SLICE_SECONDS = 5.0
+    # Server-wide listings behind :meth:`_snapshot_tmux`: sessions, panes, clients.
+    SNAPSHOT_QUERIES: Tuple[Tuple[str, ...], ...] = (
+        (
+            "list-sessions",
+            "-F",
+            "#{session_name}\t#{session_attached}\t#{session_last_attached}",
+        ),
+        (
+            "list-panes",
+            "-a",
+            "-F",
+            "#{session_name}\t#{window_active}\t#{pane_id}\t#{pane_index}\t#{pane_active}\t#{pane_current_command}\t#{pane_current_path}",
+        ),
+        (
+            "list-clients",
+            "-F",
+            "#{session_name}\t#{client_tty}\t#{client_last_activity}\t#{client_width}\t#{client_height}",
+        ),
+    )
+
+    def __init__(
+        self,
+        session_root: Optional[Path | str] = None,
+        *,
+        control_mode: Optional[bool] = None,
+        templates: Optional[TemplateRegistry] = None,
+    ) -> None:
         root = Path(
             session_root
             or os.environ.get("VIBESTACK_SESSION_ROOT")
             or Path.home() / "sessions"
         )
-        self.repo_root = repo_root
-        self.storage = SessionStorage(root)
-        default_template_dir = repo_root / "vibestack" / "templates"
-        template_dir_env = os.environ.get("VIBESTACK_TEMPLATE_DIR")
-        self.template_dir = Path(template_dir_env) if template_dir_env else default_template_dir
-        user_template_dir_env = os.environ.get("VIBESTACK_USER_TEMPLATE_DIR")
-        self.user_template_dir = Path(user_template_dir_env) if user_template_dir_env else Path.home() / ".vibestack" / "templates"
-        default_asset_dir = repo_root / "vibestack" / "assets"
-        asset_dir_env = os.environ.get("VIBESTACK_ASSET_DIR")
-        self.asset_dir = Path(asset_dir_env) if asset_dir_env else default_asset_dir
-        user_asset_dir_env = os.environ.get("VIBESTACK_USER_ASSET_DIR")
-        self.user_asset_dir = Path(user_asset_dir_env) if user_asset_dir_env else Path.home() / ".vibestack" / "assets"
-        self.template_dir.mkdir(parents=True, exist_ok=True)
-        self.user_template_dir.mkdir(parents=True, exist_ok=True)
-        self.asset_dir.mkdir(parents=True, exist_ok=True)
-        self.user_asset_dir.mkdir(parents=True, exist_ok=True)
-        self.template_sources: Dict[str, str] = {key: "built-in" for key in self.DEFAULT_TEMPLATES}
-        self.templates = self._load_templates()
+        self.storage: SessionStorage = open_storage(root)
+        self.template_registry = templates or TemplateRegistry.from_environment(self.DEFAULT_TEMPLATES)
+        self.control_mode = _env_flag("VIBESTACK_TMUX_CONTROL") if control_mode is None else control_mode
+        self._control: Optional[TmuxControlClient] = None
+        self._control_lock = threading.Lock()
+        self._control_retry_at = 0.0
+        # Rotation is opt-in: it runs a Python writer per live session instead of ``cat``.
+        self.log_max_bytes = _env_int("VIBESTACK_LOG_MAX_BYTES", 0)
+        self.log_keep_segments = _env_int("VIBESTACK_LOG_KEEP_SEGMENTS", logrotate.DEFAULT_KEEP_SEGMENTS)
+        self.log_compression = os.environ.get("VIBESTACK_LOG_COMPRESSION")
+        # Cap on each session's indexed text copy, and raw bytes one read or search indexes.
+        self.log_text_max_bytes = _env_int("VIBESTACK_LOG_TEXT_MAX_BYTES", logindex.DEFAULT_MAX_TEXT_BYTES)
+        self.log_index_budget = _env_int("VIBESTACK_LOG_INDEX_BUDGET", logindex.DEFAULT_INDEX_BUDGET)
+        # Parallel tmux launches/kills/sends per batch call.
+        self.batch_concurrency = max(1, _env_int("VIBESTACK_BATCH_CONCURRENCY", 8))
+        # Input larger than this many bytes is pasted from a tmux buffer instead of typed.
+        self.paste_threshold = max(0, _env_int("VIBESTACK_PASTE_THRESHOLD", 1024))
+        self.scheduler = JobScheduler(self)
+        self.screens = ScreenTracker()
+        # Optional pool of pre-started shells; set by long-lived servers (see WarmPool).
+        self.pool: Optional[WarmPool] = None
+
+    # Template state lives in the (possibly shared) registry.
+    @property
+    def repo_root(self) -> Path:
+        return self.template_registry.repo_root
+
+    @property
+    def template_dir(self) -> Path:
+        return self.template_registry.template_dir
+
+    @property
+    def user_template_dir(self) -> Path:
+        return self.template_registry.user_template_dir
+
+    @property
+    def asset_dir(self) -> Path:
+        return self.template_registry.asset_dir
+
+    @property
+    def user_asset_dir(self) -> Path:
+        return self.template_registry.user_asset_dir
+
+    @property
+    def templates(self) -> Dict[str, Dict[str, Any]]:
+        return self.template_registry.templates
+
+    @property
+    def template_sources(self) -> Dict[str, str]:
+        return self.template_registry.sources
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
-    def list_sessions(self) -> List[SessionMetadata]:
-        sessions = self.storage.list_sessions()
+    def list_sessions(
+        self,
+        *,
+        status: Optional[str | List[str]] = None,
+        template: Optional[str] = None,
+        updated_since: Optional[str] = None,
+    ) -> List[SessionMetadata]:
+        sessions = self.storage.list_sessions(status=status, template=template, updated_since=updated_since)
+        snapshot = self._snapshot_tmux()
+        queued = False
         for metadata in sessions:
-            self._refresh_status(metadata)
+            self._refresh_status(metadata, snapshot)
+            queued = queued or metadata.status == "queued"
+        if queued:
+            self.scheduler.dispatch()
+        if status is not None:
+            # Refreshing may move a session out of the requested states.
+            wanted = {status} if isinstance(status, str) else set(status)
+            sessions = [metadata for metadata in sessions if metadata.status in wanted]
         return sessions
 
     def get_session(self, name: str) -> Optional[SessionMetadata]:
         metadata = self.storage.load(name)
+        if metadata and metadata.status == "queued":
+            # Pollers of a queued job may be the only thing left to start it.
+            self.scheduler.dispatch()
+            metadata = self.storage.load(name)
         if metadata:
             self._refresh_status(metadata)
         return metadata
@@ -101,8 +187,98 @@ class SessionManager:
             raise ValueError(f"tmux session '{name}' not found")
         self._run_tmux(["attach-session", "-t", name])
 
-    def list_jobs(self) -> List[Dict[str, str]]:
-        return self.storage.list_jobs()
+    def list_jobs(
+        self,
+        *,
+        status: Optional[str | List[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return job records annotated with ``wait_seconds`` and, if queued, ``queue_position``."""
+
+        return self.scheduler.annotate(self.storage.list_jobs(status=status, limit=limit, offset=offset, after=after))
+
+    def job_queue(self) -> Dict[str, Any]:
+        """Return queue depth, running counts, limits and the oldest queued wait."""
+
+        return self.scheduler.queue_stats()
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.storage.get_job(job_id)
+        return self.scheduler.annotate([job])[0] if job is not None else None
+
+    @staticmethod
+    def job_channel(job_id: str) -> str:
+        """Name of the ``tmux wait-for`` channel a one-off job signals when it exits.
+
+        tmux latches a signal nobody is waiting for until the next ``wait-for`` on
+        the channel, so a job that ends just before :meth:`wait_for_job` starts
+        waiting still wakes it. A job nobody waits on leaves its latched channel
+        (a name and a flag) on the tmux server until the server exits.
+        """
+
+        return f"vibestack-job-{job_id}"
+
+    def wait_for_job(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Block until ``job_id`` finishes or ``timeout`` seconds pass, then return the job.
+
+        One-off scripts signal :meth:`job_channel` on exit, so the wait ends as soon
+        as the job does. The returned record may still be ``running`` if the timeout
+        expired; ``None`` means the job does not exist.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + max(0.0, timeout)
+        while True:
+            job, metadata = self._pending_job(job_id)
+            if metadata is not None:
+                self._refresh_status(metadata, {} if self._result_path(metadata).exists() else None)
+                job = self.storage.get_job(job_id)
+            if job is None or metadata is None or job.get("status") in self.JOB_TERMINAL_STATUSES:
+                return self.scheduler.annotate([job])[0] if job is not None else None
+            if job.get("status") == "queued":
+                self.scheduler.dispatch()
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return self.scheduler.annotate([job])[0]
+            wait = self.JOB_WAIT_SLICE_SECONDS if remaining is None else min(remaining, self.JOB_WAIT_SLICE_SECONDS)
+            self._wait_for_channel(self.job_channel(job_id), wait)
+
+    def _pending_job(self, job_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[SessionMetadata]]:
+        """Return the job plus its session metadata while the job is still unfinished."""
+
+        job = self.storage.get_job(job_id)
+        if job is None or job.get("status") in self.JOB_TERMINAL_STATUSES:
+            return job, None
+        metadata = self.storage.load(str(job.get("session") or ""))
+        if metadata is None or metadata.job_id != job_id:
+            return job, None
+        return job, metadata
+
+    def _result_path(self, metadata: SessionMetadata) -> Path:
+        return self.storage.session_dir(metadata.name) / "result.json"
+
+    def _wait_for_channel(self, channel: str, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for ``channel``; returns whether it was signalled."""
+
+        # A dedicated client: wait-for would stall every other command on the control client.
+        process = subprocess.Popen(
+            ["tmux", "wait-for", channel],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        started = time.monotonic()
+        try:
+            returncode = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            return False
+        if returncode != 0:
+            # No tmux server to wait on; avoid spinning until the deadline.
+            time.sleep(max(0.0, min(timeout, 0.5) - (time.monotonic() - started)))
+        return returncode == 0
 
     def create_session(
         self,
@@ -118,6 +294,308 @@ class SessionManager:
     ) -> SessionMetadata:
         if self._session_exists(name):
             raise ValueError(f"tmux session '{name}' already exists")
+        metadata, resolved_working_dir, merged_env = self._prepare_session(
+            name,
+            template=template,
+            command=command,
+            command_args=command_args,
+            session_type=session_type,
+            description=description,
+            working_dir=working_dir,
+            env=env,
+        )
+        self._start_session(metadata, resolved_working_dir, merged_env)
+        self._mark_launched(metadata)
+        return metadata
+
+    def _start_session(self, metadata: SessionMetadata, working_dir: str | Path, env: Dict[str, str]) -> None:
+        warm = self._claim_warm(metadata)
+        if warm is not None and self._execute_tmux(["rename-session", "-t", warm.name, metadata.name], capture=True).returncode:
+            warm = None  # the idle session vanished; start a fresh one instead
+        self._launch_session(metadata, working_dir=working_dir, extra_env=env or None, warm=warm)
+
+    # ------------------------------------------------------------------
+    # Batch operations
+    # ------------------------------------------------------------------
+    # Keys accepted in a create_sessions spec besides ``name``.
+    BATCH_CREATE_FIELDS = ("template", "command", "command_args", "description", "working_dir", "env")
+
+    def create_sessions(self, specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create several sessions; returns one ``{"name", "ok", "error", "metadata"}`` per spec.
+
+        Existence is checked against one ``list-sessions`` call, all job records are
+        written with one journal append, and launches run ``batch_concurrency`` at a
+        time. A failing item does not affect the others.
+        """
+
+        results, prepared, jobs = self._prepare_batch(specs, self._live_session_names())
+        self.storage.add_jobs(jobs)
+        outcomes = self._run_parallel(
+            lambda item: self._start_session(item[1], item[2], item[3]),
+            prepared,
+        )
+        return self._finish_batch(results, prepared, outcomes)
+
+    def kill_sessions(self, names: Iterable[str]) -> List[Dict[str, Any]]:
+        """Kill several sessions; queued jobs among them are cancelled instead."""
+
+        names = list(dict.fromkeys(names))
+        live = self._live_session_names()
+        targets = [name for name in names if name in live]
+        outcomes = dict(zip(targets, self._run_parallel(lambda name: self._run_tmux(["kill-session", "-t", name]), targets)))
+        killed = [name for name in targets if outcomes[name] is None]
+        self._mark_killed_many(killed)
+        results: List[Dict[str, Any]] = []
+        for name in names:
+            if name in outcomes and outcomes[name] is not None:
+                results.append({"name": name, "ok": False, "error": str(outcomes[name])})
+            elif name in outcomes:
+                results.append({"name": name, "ok": True, "error": None})
+            else:
+                cancelled = self.scheduler.cancel(name)
+                results.append({"name": name, "ok": cancelled, "error": None if cancelled else "session not found"})
+        if killed:
+            self.scheduler.dispatch()
+        return results
+
+    def send_texts(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send ``{"name", "text", "enter"}`` items; sessions are checked with one tmux call."""
+
+        live = self._live_session_names()
+        results: List[Dict[str, Any]] = []
+        pending: List[Tuple[int, List[Tuple[List[str], Optional[bytes]]]]] = []
+        for item in items:
+            name = str(item.get("name") or "")
+            results.append({"name": name, "ok": False, "error": None})
+            if name not in live:
+                results[-1]["error"] = "session not found"
+                continue
+            commands = self._input_commands([name], str(item.get("text") or ""), enter=bool(item.get("enter", True)))
+            if commands:
+                pending.append((len(results) - 1, commands))
+            else:
+                results[-1]["ok"] = True
+        outcomes = self._run_parallel(lambda entry: self._deliver_input(entry[1]), pending)
+        for (index, _), error in zip(pending, outcomes):
+            results[index]["ok"] = error is None
+            results[index]["error"] = None if error is None else str(error)
+        return results
+
+    # Sessions addressed per chained tmux invocation, keeping argv well below ARG_MAX.
+    BROADCAST_CHUNK_SIZE = 64
+
+    def broadcast_text(
+        self,
+        text: str,
+        *,
+        names: Optional[Iterable[str]] = None,
+        template: Optional[str] = None,
+        pattern: Optional[str] = None,
+        enter: bool = True,
+    ) -> Dict[str, List[str]]:
+        """Send ``text`` to every matching live session with one chained tmux command.
+
+        Sessions are selected by explicit ``names``, by ``template`` and/or by a
+        shell-style name ``pattern``; the selectors narrow each other. Returns the
+        ``sessions`` that received the text and the requested names that are not
+        running (``missing``).
+        """
+
+        targets, missing = self._broadcast_targets(self._live_session_names(), names, template, pattern)
+        self._deliver_input(self._input_commands(targets, text, enter=enter))
+        return {"sessions": targets, "missing": missing}
+
+    def _broadcast_targets(
+        self,
+        live: Set[str],
+        names: Optional[Iterable[str]],
+        template: Optional[str],
+        pattern: Optional[str],
+    ) -> Tuple[List[str], List[str]]:
+        if names is None and template is None and pattern is None:
+            raise ValueError("names, template or pattern is required")
+        if names is not None:
+            candidates = list(dict.fromkeys(str(name) for name in names))
+        else:
+            candidates = [metadata.name for metadata in self.storage.list_sessions(template=template)]
+        if names is not None and template is not None:
+            templated = {metadata.name for metadata in self.storage.list_sessions(template=template)}
+            candidates = [name for name in candidates if name in templated]
+        if pattern is not None:
+            candidates = [name for name in candidates if fnmatch.fnmatchcase(name, pattern)]
+        targets = [name for name in candidates if name in live]
+        missing = [name for name in candidates if name not in live] if names is not None else []
+        return targets, missing
+
+    def _input_commands(self, targets: List[str], text: str, *, enter: bool) -> List[Tuple[List[str], Optional[bytes]]]:
+        """Plan delivering ``text`` to ``targets`` as ``(args, stdin)`` tmux invocations.
+
+        Small inputs become chained ``send-keys``; inputs above ``paste_threshold``
+        are loaded once into a buffer from stdin and pasted into every target.
+        """
+
+        size = self.BROADCAST_CHUNK_SIZE
+        chunks = [targets[start:start + size] for start in range(0, len(targets), size)]
+        if self.paste_threshold and len(text.encode("utf-8")) > self.paste_threshold:
+            return [self._paste_args(chunk, text, enter=enter) for chunk in chunks]
+        planned: List[Tuple[List[str], Optional[bytes]]] = []
+        for chunk in chunks:
+            commands = [args for args in (self._send_keys_args(name, text, enter=enter) for name in chunk) if args]
+            if commands:
+                planned.append((chain_commands(commands), None))
+        return planned
+
+    @staticmethod
+    def _paste_args(names: List[str], text: str, *, enter: bool = True) -> Tuple[List[str], bytes]:
+        """Translate ``text`` into ``load-buffer``/``paste-buffer`` commands plus the stdin to feed them.
+
+        ``paste-buffer -p`` uses bracketed paste when the application asked for it, so
+        multi-line prompts arrive as one paste instead of line-by-line keystrokes. A
+        trailing newline becomes a separate ``Enter``, outside the bracketed paste.
+        """
+
+        normalized_text = text.replace("\r\n", "\n").replace("\r", "\n")
+        submit = enter or normalized_text.endswith("\n")
+        if normalized_text.endswith("\n"):
+            normalized_text = normalized_text[:-1]
+        buffer = f"vibestack-paste-{uuid.uuid4().hex[:12]}"
+        commands = [["load-buffer", "-b", buffer, "-"]]
+        for name in names:
+            target = f"{name}:0.0"
+            commands.append(["paste-buffer", "-p", "-b", buffer, "-t", target])
+            if submit:
+                commands.append(["send-keys", "-t", target, "Enter"])
+        commands.append(["delete-buffer", "-b", buffer])
+        return chain_commands(commands), normalized_text.encode("utf-8")
+
+    def _deliver_input(self, commands: List[Tuple[List[str], Optional[bytes]]]) -> None:
+        for args, stdin in commands:
+            if stdin is None:
+                self._run_tmux(args)
+            else:
+                self._run_tmux_input(args, stdin)
+
+    def _run_tmux_input(self, args: List[str], stdin: bytes) -> None:
+        """Run ``args`` as a subprocess fed ``stdin``; control mode cannot pass input."""
+
+        command = ["tmux", *args]
+        started = time.perf_counter()
+        result = subprocess.run(command, input=stdin, capture_output=True)
+        record_command(command, "subprocess", time.perf_counter() - started, result.returncode == 0)
+        if result.returncode != 0:
+            # The trailing delete-buffer never ran; do not leave the payload behind.
+            buffer = args[args.index("-b") + 1]
+            subprocess.run(["tmux", "delete-buffer", "-b", buffer], capture_output=True)
+            raise RuntimeError(f"tmux command failed: {' '.join(command)}")
+
+    def _live_session_names(self) -> Set[str]:
+        return set(self._capture_tmux(["list-sessions", "-F", "#{session_name}"]).splitlines())
+
+    def _run_parallel(self, func: Callable[[Any], Any], items: List[Any]) -> List[Optional[Exception]]:
+        """Run ``func`` over ``items`` with bounded concurrency; returns each item's exception or ``None``."""
+
+        def call(item: Any) -> Optional[Exception]:
+            try:
+                func(item)
+            except Exception as exc:  # noqa: BLE001 - reported per item
+                return exc
+            return None
+
+        if len(items) <= 1:
+            return [call(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.batch_concurrency, len(items))) as executor:
+            return list(executor.map(call, items))
+
+    def _prepare_batch(
+        self,
+        specs: List[Dict[str, Any]],
+        live: Set[str],
+    ) -> Tuple[List[Dict[str, Any]], List[Tuple[int, SessionMetadata, str | Path, Dict[str, str]]], List[Dict[str, Any]]]:
+        """Validate and provision every spec, collecting job records instead of writing them."""
+
+        results: List[Dict[str, Any]] = []
+        prepared: List[Tuple[int, SessionMetadata, str | Path, Dict[str, str]]] = []
+        jobs: List[Dict[str, Any]] = []
+        seen: Set[str] = set()
+        for index, spec in enumerate(specs):
+            name = str(spec.get("name") or "")
+            results.append({"name": name, "ok": False, "error": None, "metadata": None})
+            try:
+                if not name:
+                    raise ValueError("name is required")
+                unknown = set(spec) - {"name", *self.BATCH_CREATE_FIELDS}
+                if unknown:
+                    raise ValueError(f"unsupported fields: {', '.join(sorted(unknown))}")
+                if name in live or name in seen:
+                    raise ValueError(f"tmux session '{name}' already exists")
+                seen.add(name)
+                metadata, working_dir, env = self._prepare_session(
+                    name,
+                    template=spec.get("template") or "bash",
+                    command=spec.get("command"),
+                    command_args=spec.get("command_args"),
+                    session_type=None,
+                    description=spec.get("description"),
+                    working_dir=spec.get("working_dir"),
+                    env=spec.get("env"),
+                    jobs=jobs,
+                )
+            except (ValueError, OSError) as exc:
+                results[index]["error"] = str(exc)
+                continue
+            prepared.append((index, metadata, working_dir, env))
+        return results, prepared, jobs
+
+    def _finish_batch(
+        self,
+        results: List[Dict[str, Any]],
+        prepared: List[Tuple[int, SessionMetadata, str | Path, Dict[str, str]]],
+        outcomes: List[Optional[Exception]],
+    ) -> List[Dict[str, Any]]:
+        """Record launch outcomes, writing every job update in one journal append."""
+
+        updates: Dict[str, Dict[str, Any]] = {}
+        for (index, metadata, _, _), error in zip(prepared, outcomes):
+            metadata.touch()
+            if error is None:
+                metadata.status = "running"
+                fields: Dict[str, Any] = {"status": "running", "started_at": metadata.updated_at}
+            else:
+                metadata.status = "failed"
+                metadata.last_message = str(error)
+                fields = {"status": "failed", "message": str(error)}
+            self.storage.save(metadata)
+            if metadata.job_id:
+                updates[metadata.job_id] = fields
+            results[index].update(ok=error is None, error=None if error is None else str(error), metadata=metadata)
+        self.storage.update_jobs(updates)
+        return results
+
+    def _claim_warm(self, metadata: SessionMetadata) -> Optional[WarmSession]:
+        # One-off jobs replace the shell with respawn-pane, so a warm shell saves nothing.
+        if self.pool is None or metadata.session_type is not SessionType.LONG_RUNNING:
+            return None
+        return self.pool.claim(metadata.template)
+
+    def _prepare_session(
+        self,
+        name: str,
+        *,
+        template: str,
+        command: Optional[str],
+        command_args: Optional[List[str]],
+        session_type: Optional[SessionType],
+        description: Optional[str],
+        working_dir: Optional[str | Path],
+        env: Optional[Dict[str, str]],
+        jobs: Optional[List[Dict[str, Any]]] = None,
+    ) -> Tuple[SessionMetadata, str | Path, Dict[str, str]]:
+        """Resolve the template, provision the workspace and record the queued job.
+
+        Returns the metadata plus the working directory and environment to launch
+        with; nothing here talks to tmux. With ``jobs``, the job record is appended
+        there for the caller to write in bulk instead of being stored immediately.
+        """
 
         template_config = self.templates.get(template, {
             "command": command,
@@ -190,19 +668,27 @@ class SessionManager:
             "template": template,
             "command": resolved_command_str,
             "status": "queued",
+            "session_type": resolved_type.value,
             "created_at": created_at,
             "updated_at": created_at,
         }
-        self.storage.add_job(job_record)
+        if jobs is not None:
+            jobs.append(job_record)
+        else:
+            self.storage.add_job(job_record)
         metadata.job_id = job_id
         self.storage.save(metadata)
+        return metadata, resolved_working_dir, merged_env
 
-        self._launch_session(metadata, working_dir=resolved_working_dir, extra_env=merged_env or None)
-        self.storage.update_job_status(job_id, "running")
+    def _mark_launched(self, metadata: SessionMetadata) -> None:
         metadata.status = "running"
         metadata.touch()
+        if metadata.job_id:
+            self.storage.update_job(
+                metadata.job_id,
+                {"status": "running", "started_at": metadata.updated_at, "updated_at": metadata.updated_at},
+            )
         self.storage.save(metadata)
-        return metadata
 
     def enqueue_one_off(
         self,
@@ -213,18 +699,61 @@ class SessionManager:
         description: Optional[str] = None,
         working_dir: Optional[str | Path] = None,
         env: Optional[Dict[str, str]] = None,
+        priority: Optional[str] = None,
+    ) -> SessionMetadata:
+        """Queue a one-off job; it starts now if the scheduler has a free slot.
+
+        The returned metadata is ``running`` when the job launched immediately and
+        ``queued`` while it waits for capacity (see :class:`JobScheduler`).
+        """
+
+        resolved_priority = self.scheduler.normalize_priority(priority)
+        metadata = self._queue_one_off(
+            name,
+            command,
+            template=template,
+            description=description,
+            working_dir=working_dir,
+            env=env,
+            priority=resolved_priority,
+        )
+        self.scheduler.dispatch()
+        return self.storage.load(name) or metadata
+
+    def _queue_one_off(
+        self,
+        name: str,
+        command: str,
+        *,
+        template: str,
+        description: Optional[str],
+        working_dir: Optional[str | Path],
+        env: Optional[Dict[str, str]],
+        priority: str,
     ) -> SessionMetadata:
-        return self.create_session(
+        existing = self.storage.load(name)
+        if existing is not None and existing.status == "queued":
+            raise ValueError(f"job '{name}' is already queued")
+        metadata, resolved_working_dir, merged_env = self._prepare_session(
             name,
             template=template,
             command=command,
+            command_args=None,
             session_type=SessionType.ONE_OFF,
             description=description,
             working_dir=working_dir,
             env=env,
         )
+        self.scheduler.submit(metadata, working_dir=resolved_working_dir, env=merged_env, priority=priority)
+        return metadata
 
     def send_text(self, name: str, text: str, *, enter: bool = True) -> None:
+        self._deliver_input(self._input_commands([name], text, enter=enter))
+
+    @staticmethod
+    def _send_keys_args(name: str, text: str, *, enter: bool = True) -> Optional[List[str]]:
+        """Translate ``text`` into a ``send-keys`` invocation (``None`` if there is nothing to send)."""
+
         target = f"{name}:0.0"
 
         normalized_text = text.replace("\r\n", "\n").replace("\r", "\n")
@@ -232,7 +761,7 @@ class SessionManager:
         payload: List[str] = []
         for index, segment in enumerate(segments):
             if segment:
-                payload.append(segment)
+                payload.append(escape_argument(segment))
             if index < len(segments) - 1:
                 payload.append("Enter")
 
@@ -242,46 +771,234 @@ class SessionManager:
         if not payload and enter:
             payload.append("Enter")
         if not payload:
-            return
+            return None
 
-        self._run_tmux(["send-keys", "-t", target, *payload])
+        return ["send-keys", "-t", target, *payload]
+
+    # Pane geometry, printed ahead of the captured screen in the same tmux call.
+    SCREEN_FORMAT = "#{pane_width}\t#{pane_height}\t#{cursor_x}\t#{cursor_y}"
+
+    def capture_pane(self, name: str, since_seq: Optional[int] = None, *, ansi: bool = True) -> Optional[Dict[str, Any]]:
+        """Capture the visible screen of ``name``, returning only lines changed since ``since_seq``.
+
+        The response carries a ``seq`` to pass back as ``since_seq`` on the next call.
+        ``full`` is true when every line is included (first call, or ``since_seq`` is
+        unknown). ``ansi`` keeps colour and attribute escapes (``capture-pane -e``).
+        Returns ``None`` if the session has no pane.
+        """
+
+        result = self._execute_tmux(self._capture_pane_args(name, ansi=ansi), capture=True)
+        if result.returncode != 0:
+            return None
+        return self._screen_update(name, result.stdout, since_seq, ansi=ansi)
+
+    @classmethod
+    def _capture_pane_args(cls, name: str, *, ansi: bool) -> List[str]:
+        target = f"{name}:0.0"
+        capture = ["capture-pane", "-p", *(["-e"] if ansi else []), "-t", target]
+        return chain_commands([["display-message", "-p", "-t", target, cls.SCREEN_FORMAT], capture])
+
+    def _screen_update(
+        self,
+        name: str,
+        output: str,
+        since_seq: Optional[int],
+        *,
+        ansi: bool,
+    ) -> Optional[Dict[str, Any]]:
+        header, _, body = output.partition("\n")
+        try:
+            width, height, cursor_x, cursor_y = (int(value) for value in header.split("\t"))
+        except ValueError:
+            return None
+        lines = body.split("\n")[:height]
+        lines.extend([""] * (height - len(lines)))
+        seq, changed = self.screens.update((name, ansi), lines, since_seq)
+        indexes = range(len(lines)) if changed is None else changed
+        return {
+            "name": name,
+            "seq": seq,
+            "since_seq": since_seq,
+            "full": changed is None,
+            "width": width,
+            "height": height,
+            "cursor_x": cursor_x,
+            "cursor_y": cursor_y,
+            "lines": [{"index": index, "text": lines[index]} for index in indexes],
+        }
 
     def kill_session(self, name: str) -> None:
         if not self._session_exists(name):
+            self.scheduler.cancel(name)
             return
         self._run_tmux(["kill-session", "-t", name])
-        metadata = self.storage.load(name)
-        if metadata:
-            metadata.status = "stopped"
-            metadata.touch()
-            self.storage.save(metadata)
-            if metadata.job_id:
-                self.storage.update_job_status(metadata.job_id, "stopped")
+        self._mark_killed(name)
+        self.scheduler.dispatch()
+
+    def _mark_killed(self, name: str) -> None:
+        self._mark_killed_many([name])
+
+    def _mark_killed_many(self, names: Iterable[str]) -> None:
+        updates: Dict[str, Dict[str, Any]] = {}
+        for name in names:
+            metadata = self.storage.load(name)
+            if metadata:
+                metadata.status = "stopped"
+                metadata.touch()
+                self.storage.save(metadata)
+                if metadata.job_id:
+                    updates[metadata.job_id] = {"status": "stopped"}
+        self.storage.update_jobs(updates)
 
     def tail_log(self, name: str, lines: int = 200) -> str:
+        return self.read_log(name, lines=lines).text
+
+    def read_log(
+        self,
+        name: str,
+        *,
+        lines: int = 200,
+        offset: Optional[int] = None,
+        max_bytes: int = logs.DEFAULT_MAX_BYTES,
+    ) -> logs.LogChunk:
+        """Read a session log without loading the whole file.
+
+        Without ``offset`` the last ``lines`` lines are returned; with it, up to
+        ``max_bytes`` of output written after that byte offset. The returned
+        ``next_offset`` can be passed back as ``offset`` to follow the log.
+        """
+
         metadata = self.storage.load(name)
         if not metadata:
             raise ValueError(f"Unknown session '{name}'")
         path = Path(metadata.log_path)
-        if not path.exists():
-            return ""
-        try:
-            content = path.read_text()
-        except UnicodeDecodeError:
-            content = path.read_bytes().decode("utf-8", errors="replace")
-        logs = content.splitlines()[-lines:]
-        return "\n".join(logs)
+        if offset is None:
+            return logs.tail_lines(path, lines)
+        return logs.read_from(path, offset, max_bytes=max_bytes)
+
+    def read_log_range(
+        self,
+        name: str,
+        start: int,
+        end: Optional[int] = None,
+        *,
+        max_bytes: int = logs.DEFAULT_MAX_BYTES,
+    ) -> logs.LogChunk:
+        """Read logical bytes ``[start, end)`` of a session log, across rotated segments."""
+
+        metadata = self.storage.load(name)
+        if not metadata:
+            raise ValueError(f"Unknown session '{name}'")
+        return logs.read_range(Path(metadata.log_path), start, end, max_bytes=max_bytes)
+
+    def read_log_lines(
+        self,
+        name: str,
+        start: int,
+        end: Optional[int] = None,
+        *,
+        max_lines: int = logindex.DEFAULT_MAX_LINES,
+    ) -> logindex.LineRange:
+        """Read clean (escape-free) lines ``start..end`` of a session log, 1-based and inclusive.
+
+        Output not yet indexed beyond this call's budget is counted in ``pending_bytes``.
+        """
+
+        metadata = self.storage.load(name)
+        if not metadata:
+            raise ValueError(f"Unknown session '{name}'")
+        return self._log_index(metadata).read_lines(start, end, max_lines=max_lines, budget=self._index_budget())
+
+    def search_logs(
+        self,
+        query: str,
+        *,
+        names: Optional[Iterable[str]] = None,
+        template: Optional[str] = None,
+        regex: bool = False,
+        ignore_case: bool = False,
+        limit: int = 100,
+    ) -> Dict[str, Any]:
+        """Search the clean text of session logs, ``grep``-style.
+
+        Returns ``{"matches": [{"session", "line", "text"}], "sessions_searched",
+        "truncated", "pending_bytes"}``; ``truncated`` means ``limit`` was reached, so more
+        lines may match. One indexing budget is shared by every session searched; output
+        left unindexed is not searched and is counted in ``pending_bytes``.
+        """
+
+        matcher = logindex.compile_matcher(query, regex=regex, ignore_case=ignore_case)
+        sessions = self.storage.list_sessions(template=template)
+        if names is not None:
+            wanted = set(names)
+            sessions = [metadata for metadata in sessions if metadata.name in wanted]
+        matches: List[Dict[str, Any]] = []
+        searched = 0
+        pending = 0
+        budget = self._index_budget()
+        for metadata in sessions:
+            if len(matches) >= limit:
+                break
+            searched += 1
+            index = self._log_index(metadata)
+            state = index.update(budget)
+            pending += int(state["pending_bytes"])
+            if budget is not None:
+                budget = max(0, budget - int(state["indexed_bytes"]))
+            for match in index.search(matcher, limit=limit - len(matches), budget=0):
+                matches.append({"session": metadata.name, **match})
+        return {
+            "matches": matches,
+            "sessions_searched": searched,
+            "truncated": len(matches) >= limit,
+            "pending_bytes": pending,
+        }
+
+    def index_logs(self, sessions: Iterable[SessionMetadata]) -> Dict[str, int]:
+        """Index new output of each session's log, up to the index budget per session.
+
+        Meant for background callers such as the reconciler, so reads and searches
+        find the index current. Returns ``{session name: bytes still pending}``.
+        """
+
+        pending: Dict[str, int] = {}
+        for metadata in sessions:
+            try:
+                state = self._log_index(metadata).update(self._index_budget())
+            except OSError:
+                continue
+            pending[metadata.name] = int(state["pending_bytes"])
+        return pending
+
+    def _log_index(self, metadata: SessionMetadata) -> logindex.LogIndex:
+        return logindex.LogIndex(Path(metadata.log_path), max_bytes=max(0, self.log_text_max_bytes))
+
+    def _index_budget(self) -> Optional[int]:
+        return self.log_index_budget if self.log_index_budget > 0 else None
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
-    def _session_exists(self, name: str) -> bool:
-        result = subprocess.run(
-            ["tmux", "has-session", "-t", name],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
+    def _pipe_command(self, log_path: Path) -> str:
+        """Shell command tmux pipes pane output into for ``log_path``.
+
+        Plain ``cat`` unless rotation is enabled, in which case each pane gets a
+        resident ``python -m vibestack.sessions.logrotate`` writer.
+        """
+
+        if self.log_max_bytes <= 0:
+            return f"cat >> {shlex.quote(str(log_path))}"
+        argv = logrotate.pipe_command(
+            log_path,
+            max_bytes=self.log_max_bytes,
+            keep=self.log_keep_segments,
+            codec=self.log_compression,
         )
-        return result.returncode == 0
+        package_root = shlex.quote(str(Path(__file__).resolve().parents[2]))
+        return f"PYTHONPATH={package_root}${{PYTHONPATH:+:$PYTHONPATH}} exec {shlex.join(argv)}"
+
+    def _session_exists(self, name: str) -> bool:
+        return self._execute_tmux(["has-session", "-t", name], capture=True).returncode == 0
 
     def _launch_session(
         self,
@@ -289,7 +1006,26 @@ class SessionManager:
         *,
         working_dir: Optional[str | Path] = None,
         extra_env: Optional[Dict[str, str]] = None,
+        warm: Optional[WarmSession] = None,
     ) -> None:
+        for args, env in self._launch_plan(metadata, working_dir=working_dir, extra_env=extra_env, warm=warm):
+            self._run_tmux(args, env=env)
+
+    def _launch_plan(
+        self,
+        metadata: SessionMetadata,
+        *,
+        working_dir: Optional[str | Path] = None,
+        extra_env: Optional[Dict[str, str]] = None,
+        warm: Optional[WarmSession] = None,
+    ) -> List[Tuple[List[str], Optional[Dict[str, str]]]]:
+        """Prepare the session directory and return the tmux commands that start it.
+
+        Each entry is ``(args, env)``; commands must run in order and ``env`` is only
+        set for the ones that spawn processes. With ``warm``, the caller has already
+        renamed that pooled session to ``metadata.name`` and the plan adopts it.
+        """
+
         env = os.environ.copy()
         if extra_env:
             env.update({str(k): str(v) for k, v in extra_env.items()})
@@ -301,77 +1037,102 @@ class SessionManager:
         log_path.parent.mkdir(parents=True, exist_ok=True)
         log_path.touch(exist_ok=True)
 
-        # Start detached session with a login shell so interactive templates still work.
-        self._run_tmux(
-            [
-                "tmux",
-                "new-session",
-                "-d",
-                "-s",
-                session_name,
-                "bash",
-                "--login",
-            ],
-            env=env,
-        )
-        self._run_tmux(["set-option", "-t", session_name, "status", "off"], env=env)
+        plan: List[Tuple[List[str], Optional[Dict[str, str]]]] = []
+        if warm is None:
+            # Start detached session with a login shell so interactive templates still work.
+            plan.append(
+                (
+                    [
+                        "tmux",
+                        "new-session",
+                        "-d",
+                        "-s",
+                        session_name,
+                        "bash",
+                        "--login",
+                    ],
+                    env,
+                )
+            )
+            # Only commands that spawn processes need the session environment; the rest can
+            # share the control-mode client when it is enabled.
+            plan.append((["set-option", "-t", session_name, "status", "off"], None))
 
         target = f"{session_name}:0.0"
 
+        exports = warm.env_delta(extra_env) if warm is not None else {}
+        if exports:
+            # The pooled shell predates this session's environment (e.g. CODEX_HOME). Hand it
+            # over as tmux arguments before the log pipe exists: typing ``export`` into the
+            # pane would write secrets to the console log and the shell history.
+            for key, value in sorted(exports.items()):
+                plan.append((["set-environment", "-t", session_name, key, value], None))
+            assignments = [arg for key, value in sorted(exports.items()) for arg in ("-e", f"{key}={value}")]
+            plan.append((["respawn-pane", "-k", "-t", target, *assignments, "bash", "--login"], env))
+
         # Always capture pane output so logs stay in sync for all session types.
-        self._run_tmux(
-            [
-                "pipe-pane",
-                "-t",
-                target,
-                "-o",
-                f"cat >> {shlex.quote(str(log_path))}",
-            ],
-            env=env,
+        plan.append(
+            (
+                [
+                    "pipe-pane",
+                    "-t",
+                    target,
+                    "-o",
+                    self._pipe_command(log_path),
+                ],
+                None,
+            )
         )
 
         if metadata.session_type is SessionType.ONE_OFF:
             script_path = self._prepare_short_run_script(metadata, session_dir, log_path, working_dir)
             command_str = f"exec {shlex.quote(str(script_path))}"
-            self._run_tmux(
-                [
-                    "respawn-pane",
-                    "-k",
-                    "-t",
-                    target,
-                    "bash",
-                    "--login",
-                    "-c",
-                    command_str,
-                ],
-                env=env,
+            plan.append(
+                (
+                    [
+                        "respawn-pane",
+                        "-k",
+                        "-t",
+                        target,
+                        "bash",
+                        "--login",
+                        "-c",
+                        command_str,
+                    ],
+                    env,
+                )
             )
-            return
+            return plan
 
         # Long-running sessions continue to use send-keys so users can interact afterwards.
         if working_dir:
-            self._run_tmux(
-                [
-                    "send-keys",
-                    "-t",
-                    target,
-                    f"cd {shlex.quote(str(Path(working_dir)))}",
-                    "C-m",
-                ],
-                env=env,
+            plan.append(
+                (
+                    [
+                        "send-keys",
+                        "-t",
+                        target,
+                        f"cd {shlex.quote(str(Path(working_dir)))}",
+                        "C-m",
+                    ],
+                    None,
+                )
             )
 
         if metadata.command and str(metadata.command).strip():
-            self._run_tmux(
-                [
-                    "send-keys",
-                    "-t",
-                    target,
-                    metadata.command,
-                    "C-m",
-                ],
-                env=env,
+            plan.append(
+                (
+                    [
+                        "send-keys",
+                        "-t",
+                        target,
+                        metadata.command,
+                        "C-m",
+                    ],
+                    None,
+                )
             )
+        return plan
 
     def _prepare_short_run_script(
         self,
@@ -402,7 +1163,10 @@ class SessionManager:
             '  trap - EXIT',
             '  local end_ts=$(date -u +"%Y-%m-%dT%H:%M:%S.%3NZ")',
             '  printf "[vibestack] session exited with code %s at %s\\n" "$exit_code" "$end_ts" >> "$LOG_PATH"',
-            '  printf \'{"exit_code": %s, "started_at": "%s", "finished_at": "%s", "message": "session exited with code %s"}\\n\' "$exit_code" "$START_TS" "$end_ts" "$exit_code" > "$RESULT_PATH"',
+            '  printf \'{"exit_code": %s, "started_at": "%s", "finished_at": "%s", "message": "session exited with code %s"}\\n\' "$exit_code" "$START_TS" "$end_ts" "$exit_code" > "$RESULT_PATH.tmp"',
+            '  mv -f "$RESULT_PATH.tmp" "$RESULT_PATH"',
+            # Wake anyone blocked in wait_for_job; a signal with no waiter stays latched (see job_channel).
+            f'  tmux wait-for -S {shlex.quote(self.job_channel(metadata.job_id or ""))} >/dev/null 2>&1 || true',
             '  exit "$exit_code"',
             '}',
             'trap cleanup EXIT',
@@ -416,36 +1180,6 @@ class SessionManager:
         script_path.chmod(0o755)
         return script_path
 
-    def _load_templates(self) -> Dict[str, Dict[str, str]]:
-        templates: Dict[str, Dict[str, Any]] = {key: value.copy() for key, value in self.DEFAULT_TEMPLATES.items()}
-        sources: Dict[str, str] = {key: "built-in" for key in self.DEFAULT_TEMPLATES}
-        candidate_dirs = [self.template_dir, self.user_template_dir]
-        for template_dir in candidate_dirs:
-            if not template_dir or not template_dir.exists():
-                continue
-            for file in sorted(template_dir.glob('*.json')):
-                try:
-                    payload = json.loads(file.read_text(encoding='utf-8'))
-                except json.JSONDecodeError:
-                    continue
-                key = payload.get('name') or file.stem
-                command = payload.get('command', '')
-                templates[key] = {
-                    'command': command,
-                    'command_args': payload.get('command_args'),
-                    'label': payload.get('label', key),
-                    'default_type': payload.get('session_type', SessionType.LONG_RUNNING.value),
-                    'working_dir': payload.get('working_dir'),
-                    'description': payload.get('description'),
-                    'env': payload.get('env'),
-                    'post_create': payload.get('post_create'),
-                    'include_files': payload.get('include_files'),
-                    'hidden': payload.get('hidden', False),
-                }
-                sources[key] = str(file)
-        self.template_sources = sources
-        return templates
-
     def _apply_template_artifacts(self, metadata: SessionMetadata, template_config: Dict[str, str]) -> None:
         workspace = Path(metadata.workspace_path)
         workspace.mkdir(parents=True, exist_ok=True)
@@ -464,7 +1198,6 @@ class SessionManager:
                 break
         if not has_tasks:
             include_entries.append({'source': 'TASKS.md', 'target': 'TASKS.md'})
-        search_roots: List[Path] = [self.asset_dir, self.user_asset_dir, self.repo_root]
         for entry in include_entries:
             if isinstance(entry, str):
                 source_ref = entry
@@ -474,7 +1207,7 @@ class SessionManager:
                 target_name = entry.get('target') or (Path(source_ref).name if source_ref else None)
             if not source_ref or not target_name:
                 continue
-            source_path = self._resolve_asset_file(source_ref, search_roots)
+            source_path = self.template_registry.resolve_asset_file(source_ref)
             if not source_path or not source_path.exists():
                 continue
             destination = workspace / target_name
@@ -483,18 +1216,6 @@ class SessionManager:
             destination.parent.mkdir(parents=True, exist_ok=True)
             shutil.copy(source_path, destination)
 
-    def _resolve_asset_file(self, reference: str, search_roots: List[Path]) -> Optional[Path]:
-        candidate = Path(reference)
-        if candidate.is_absolute() and candidate.exists():
-            return candidate
-        for root in search_roots:
-            if not root:
-                continue
-            potential = root / reference
-            if potential.exists():
-                return potential
-        return None
-
     def _prepare_codex_workspace(self, metadata: SessionMetadata, env: Optional[Dict[str, str]]) -> None:
         """Provision Codex configuration files inside the session workspace."""
 
@@ -506,72 +1227,131 @@ class SessionManager:
             env["CODEX_HOME"] = str(codex_home)
 
     def list_templates(self) -> List[Dict[str, Any]]:
-        results: List[Dict[str, Any]] = []
-        for name, config in sorted(self.templates.items(), key=lambda item: (item[1].get('label') or item[0]).lower()):
-            if config.get('hidden'):
-                continue
-            entry = dict(config)
-            entry['name'] = name
-            entry['source'] = self.template_sources.get(name, 'user')
-            entry.pop('hidden', None)
-            results.append(entry)
-        return results
+        return self.template_registry.list_templates()
 
-    def refresh_templates(self) -> None:
-        self.templates = self._load_templates()
+    def refresh_templates(self) -> bool:
+        """Reload changed template files; returns ``True`` if any template changed."""
 
-    def save_template(self, payload: Dict[str, Any], include_sources: Optional[List[Path]] = None) -> Path:
-        name = payload.get('name')
-        if not name:
-            raise ValueError('Template name is required')
+        return self.template_registry.refresh()
 
-        include_entries = payload.get('include_files') or []
-        processed_entries: List[Any] = []
-        for entry in include_entries:
-            if isinstance(entry, str):
-                processed_entries.append(entry)
-            elif isinstance(entry, dict):
-                processed_entries.append({k: v for k, v in entry.items() if v})
-
-        if include_sources:
-            asset_root = self.user_asset_dir / name
-            asset_root.mkdir(parents=True, exist_ok=True)
-            for source_path in include_sources:
-                if not source_path.exists() or not source_path.is_file():
-                    continue
-                destination = asset_root / source_path.name
-                destination.write_bytes(source_path.read_bytes())
-                processed_entries.append({"source": f"{name}/{source_path.name}", "target": source_path.name})
-
-        payload = dict(payload)
-        payload['include_files'] = processed_entries
-
-        destination = self.user_template_dir / f"{name}.json"
-        destination.parent.mkdir(parents=True, exist_ok=True)
-        destination.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding='utf-8')
-        self.refresh_templates()
-        return destination
+    @property
+    def template_version(self) -> int:
+        return self.template_registry.version
+
+    def save_template(self, payload: Dict[str, Any], include_sources: Optional[List[Path]] = None) -> Path:
+        return self.template_registry.save_template(payload, include_sources=include_sources)
 
     def delete_template(self, name: str) -> None:
-        source = self.template_sources.get(name)
-        if not source or source == 'built-in':
-            raise ValueError(f"Template '{name}' cannot be deleted (not a user template)")
-        template_path = Path(source)
-        if template_path.exists():
-            template_path.unlink()
-        self.refresh_templates()
+        self.template_registry.delete_template(name)
+
+    def close(self) -> None:
+        """Stop the warm pool and release the control-mode client, if either was started."""
+
+        if self.pool is not None:
+            self.pool.stop()
+        with self._control_lock:
+            client = self._control
+            self._control = None
+        if client is not None:
+            client.close()
+
+    def _control_client(self) -> Optional[TmuxControlClient]:
+        if not self.control_mode:
+            return None
+        with self._control_lock:
+            if self._control is not None and self._control.alive:
+                return self._control
+            now = time.monotonic()
+            if now < self._control_retry_at:
+                return None
+            client = self._control
+            if client is None:
+                client = TmuxControlClient()
+                # The client never refers back to the manager, so a manager that is simply
+                # dropped (e.g. evicted from vibestack.api's cache) still closes it.
+                weakref.finalize(self, client.close)
+                self._control = client
+            if not client.start():
+                self._control_retry_at = now + self.CONTROL_RETRY_SECONDS
+                return None
+            return client
+
+    def _submit_control(
+        self,
+        command: List[str],
+        env: Optional[Dict[str, str]],
+    ) -> Optional[Tuple[TmuxControlClient, "Future[TmuxResult]"]]:
+        """Queue ``command`` on the control client, or return ``None`` to use a subprocess."""
+
+        if env is not None or not command[1:2] or command[1] in self.INTERACTIVE_TMUX_COMMANDS:
+            return None
+        client = self._control_client()
+        if client is None:
+            return None
+        try:
+            return client, client.submit(command)
+        except TmuxControlUnavailable:
+            return None
+
+    def _execute_tmux(
+        self,
+        args: List[str],
+        env: Optional[Dict[str, str]] = None,
+        *,
+        capture: bool,
+    ) -> TmuxResult:
+        """Run a tmux command over control mode when possible, else as a subprocess.
+
+        Commands carrying an explicit environment or needing the terminal always use a
+        subprocess, since the control client cannot change either for a single command.
+        """
+
+        command = ["tmux", *args] if args and args[0] != "tmux" else args
+        started = time.perf_counter()
+        submitted = self._submit_control(command, env)
+        result: Optional[TmuxResult] = None
+        try:
+            if submitted is not None:
+                client, future = submitted
+                try:
+                    result = future.result(timeout=client.timeout)
+                except TmuxControlUnavailable as exc:
+                    raise RuntimeError(f"tmux command interrupted: {' '.join(command)}") from exc
+                except FutureTimeoutError as exc:
+                    raise RuntimeError(f"tmux command timed out: {' '.join(command)}") from exc
+            elif capture:
+                completed = subprocess.run(command, env=env, capture_output=True, text=True)
+                result = TmuxResult(returncode=completed.returncode, stdout=completed.stdout)
+            else:
+                completed = subprocess.run(command, env=env)
+                result = TmuxResult(returncode=completed.returncode, stdout="")
+            return result
+        finally:
+            transport = "subprocess" if submitted is None else "control"
+            ok = result is not None and result.returncode == 0
+            record_command(command, transport, time.perf_counter() - started, ok)
 
     def _run_tmux(self, args: List[str], env: Optional[Dict[str, str]] = None) -> None:
         command = ["tmux", *args] if args and args[0] != "tmux" else args
-        result = subprocess.run(command, env=env)
+        result = self._execute_tmux(command, env=env, capture=False)
         if result.returncode != 0:
             raise RuntimeError(f"tmux command failed: {' '.join(command)}")
 
-    def _refresh_status(self, metadata: SessionMetadata) -> None:
+    def _refresh_status(
+        self,
+        metadata: SessionMetadata,
+        snapshot: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        if metadata.status == "queued":
+            # Waiting on the scheduler; there is nothing in tmux to compare against yet.
+            metadata.runtime = {}
+            return
+        if snapshot is None:
+            snapshot = self._snapshot_tmux()
         metadata.runtime = {}
-        exists = self._session_exists(metadata.name)
-        if exists:
-            metadata.runtime = self._collect_tmux_runtime(metadata.name)
+        runtime = snapshot.get(metadata.name)
+        if runtime is not None:
+            metadata.runtime = dict(runtime)
             if metadata.status not in {"running", "starting"}:
                 metadata.status = "running"
                 metadata.touch()
@@ -581,7 +1361,7 @@ class SessionManager:
             return
 
         if metadata.session_type is SessionType.ONE_OFF:
-            result_path = self.storage.session_dir(metadata.name) / "result.json"
+            result_path = self._result_path(metadata)
             exit_code: Optional[int] = None
             finished_at: Optional[str] = None
             message: Optional[str] = None
@@ -594,17 +1374,24 @@ class SessionManager:
                 except (ValueError, json.JSONDecodeError, TypeError):
                     exit_code = None
             if exit_code is not None:
+                final_status = "completed" if exit_code == 0 else "failed"
+                final_message = message or f"session exited with code {exit_code}"
+                if (
+                    metadata.status == final_status
+                    and metadata.exit_code == exit_code
+                    and metadata.last_message == final_message
+                ):
+                    return  # already recorded; avoid rewriting metadata on every read
                 metadata.exit_code = exit_code
-                metadata.status = "completed" if exit_code == 0 else "failed"
+                metadata.status = final_status
                 if finished_at:
                     metadata.updated_at = finished_at
                 else:
                     metadata.touch()
-                metadata.last_message = message or f"session exited with code {exit_code}"
+                metadata.last_message = final_message
                 self.storage.save(metadata)
                 if metadata.job_id:
-                    job_status = "completed" if exit_code == 0 else "failed"
-                    self.storage.update_job_status(metadata.job_id, job_status, message=metadata.last_message)
+                    self.storage.update_job_status(metadata.job_id, final_status, message=metadata.last_message)
                 return
             if metadata.status not in {"completed", "failed"}:
                 metadata.status = "completed"
@@ -622,121 +1409,126 @@ class SessionManager:
                 self.storage.update_job_status(metadata.job_id, "stopped")
 
     def _capture_tmux(self, args: List[str], env: Optional[Dict[str, str]] = None) -> str:
-        command = ["tmux", *args] if args and args[0] != "tmux" else args
-        result = subprocess.run(
-            command,
-            env=env,
-            capture_output=True,
-            text=True,
-        )
+        result = self._execute_tmux(args, env=env, capture=True)
         if result.returncode != 0:
             return ""
         return result.stdout.strip()
 
     def _collect_tmux_runtime(self, session_name: str) -> Dict[str, Any]:
-        runtime: Dict[str, Any] = {}
+        return self._snapshot_tmux().get(session_name, {})
+
+    def _snapshot_tmux(self) -> Dict[str, Dict[str, Any]]:
+        """Collect runtime details for every tmux session in three tmux invocations.
+
+        Sessions, panes and clients are listed server-wide and grouped by session
+        name, so the cost of a listing does not grow with the number of sessions.
+        """
+
+        sessions_query, panes_query, clients_query = self.SNAPSHOT_QUERIES
+        sessions_output = self._capture_tmux(list(sessions_query))
+        if not sessions_output:
+            return {}
+        return self._parse_snapshot(
+            sessions_output,
+            self._capture_tmux(list(panes_query)),
+            self._capture_tmux(list(clients_query)),
+        )
 
-        panes_output = self._capture_tmux([
-            "list-panes",
-            "-t",
-            session_name,
-            "-F",
-            "#{pane_id}\t#{pane_index}\t#{pane_active}\t#{pane_current_command}\t#{pane_current_path}",
-        ])
-        panes: List[Dict[str, Any]] = []
-        active_pane: Optional[Dict[str, Any]] = None
+    def _parse_snapshot(self, sessions_output: str, panes_output: str, clients_output: str) -> Dict[str, Dict[str, Any]]:
+        """Group the output of :attr:`SNAPSHOT_QUERIES` into per-session runtime details."""
+
+        snapshot: Dict[str, Dict[str, Any]] = {}
+        attached_flags: Dict[str, str] = {}
+        last_attached: Dict[str, str] = {}
+        for line in sessions_output.splitlines():
+            if not line:
+                continue
+            name, attached, last_attached_raw = (line.split("\t") + ["", ""])[:3]
+            snapshot[name] = {}
+            attached_flags[name] = attached
+            last_attached[name] = last_attached_raw
+        if not snapshot:
+            return snapshot
+
+        panes_by_session: Dict[str, List[Dict[str, Any]]] = {}
         for line in panes_output.splitlines():
             if not line:
                 continue
             parts = line.split("\t")
-            if len(parts) < 5:
+            if len(parts) < 7:
                 continue
-            pane_id, index, active, command, path = parts
-            pane_record = {
-                "pane_id": pane_id,
-                "pane_index": int(index) if index.isdigit() else index,
-                "active": active == "1",
-                "pane_current_command": command or None,
-                "pane_current_path": path or None,
-            }
-            panes.append(pane_record)
-            if pane_record["active"] and active_pane is None:
-                active_pane = pane_record
-        if panes:
-            runtime["tmux_panes"] = panes
-        if active_pane:
-            runtime["active_pane_id"] = active_pane.get("pane_id")
-            runtime["pane_current_command"] = active_pane.get("pane_current_command")
-            runtime["pane_current_path"] = active_pane.get("pane_current_path")
-
-        clients_output = self._capture_tmux([
-            "list-clients",
-            "-t",
-            session_name,
-            "-F",
-            "#{client_tty}\t#{client_last_activity}\t#{client_width}\t#{client_height}",
-        ])
-        clients: List[Dict[str, Any]] = []
-        latest_activity_epoch: Optional[int] = None
+            name, window_active, pane_id, index, active, command, path = parts[:7]
+            # Match ``list-panes -t <session>``, which only reports the current window.
+            if window_active != "1":
+                continue
+            panes_by_session.setdefault(name, []).append(
+                {
+                    "pane_id": pane_id,
+                    "pane_index": int(index) if index.isdigit() else index,
+                    "active": active == "1",
+                    "pane_current_command": command or None,
+                    "pane_current_path": path or None,
+                }
+            )
+
+        clients_by_session: Dict[str, List[Dict[str, Any]]] = {}
         for line in clients_output.splitlines():
             if not line:
                 continue
-            tty, last_activity, width, height = (line.split("\t") + ["", "", "", ""])[:4]
+            name, tty, last_activity, width, height = (line.split("\t") + ["", "", "", "", ""])[:5]
             try:
                 last_activity_epoch = int(last_activity)
             except (TypeError, ValueError):
                 last_activity_epoch = 0
-            last_activity_iso = self._epoch_to_iso(last_activity_epoch)
             try:
-                width_val = int(width)
+                width_val: Optional[int] = int(width)
             except (TypeError, ValueError):
                 width_val = None
             try:
-                height_val = int(height)
+                height_val: Optional[int] = int(height)
             except (TypeError, ValueError):
                 height_val = None
-            clients.append(
+            clients_by_session.setdefault(name, []).append(
                 {
                     "client_tty": tty or None,
                     "client_last_activity_epoch": last_activity_epoch or None,
-                    "client_last_activity": last_activity_iso,
+                    "client_last_activity": self._epoch_to_iso(last_activity_epoch),
                     "client_width": width_val,
                     "client_height": height_val,
                 }
             )
-            if last_activity_epoch:
-                if latest_activity_epoch is None or last_activity_epoch > latest_activity_epoch:
-                    latest_activity_epoch = last_activity_epoch
-        if clients:
-            runtime["tmux_clients"] = clients
-
-        session_last_attached_raw = self._capture_tmux([
-            "display-message",
-            "-t",
-            session_name,
-            "-p",
-            "#{session_last_attached}",
-        ])
-        session_last_attached_iso = self._epoch_to_iso(session_last_attached_raw)
-        if session_last_attached_iso:
-            runtime["session_last_attached"] = session_last_attached_iso
-
-        session_attached_raw = self._capture_tmux([
-            "display-message",
-            "-t",
-            session_name,
-            "-p",
-            "#{session_attached}",
-        ])
-        if session_attached_raw:
-            runtime["session_attached"] = session_attached_raw == "1"
-
-        if latest_activity_epoch:
-            runtime["client_last_activity"] = self._epoch_to_iso(latest_activity_epoch)
-        elif session_last_attached_iso:
-            runtime["client_last_activity"] = session_last_attached_iso
-
-        return runtime
+
+        for name, runtime in snapshot.items():
+            panes = panes_by_session.get(name, [])
+            if panes:
+                runtime["tmux_panes"] = panes
+            active_pane = next((pane for pane in panes if pane["active"]), None)
+            if active_pane:
+                runtime["active_pane_id"] = active_pane.get("pane_id")
+                runtime["pane_current_command"] = active_pane.get("pane_current_command")
+                runtime["pane_current_path"] = active_pane.get("pane_current_path")
+
+            clients = clients_by_session.get(name, [])
+            if clients:
+                runtime["tmux_clients"] = clients
+            latest_activity_epoch = max(
+                (client["client_last_activity_epoch"] or 0 for client in clients),
+                default=0,
+            )
+
+            session_last_attached_iso = self._epoch_to_iso(last_attached.get(name))
+            if session_last_attached_iso:
+                runtime["session_last_attached"] = session_last_attached_iso
+            attached_raw = attached_flags.get(name)
+            if attached_raw:
+                runtime["session_attached"] = attached_raw != "0"
+
+            if latest_activity_epoch:
+                runtime["client_last_activity"] = self._epoch_to_iso(latest_activity_epoch)
+            elif session_last_attached_iso:
+                runtime["client_last_activity"] = session_last_attached_iso
+
+        return snapshot
 
     @staticmethod
     def _epoch_to_iso(value: Any) -> Optional[str]:
@@ -0,0 +1,163 @@
+"""Pool of pre-started tmux sessions that ``create_session`` can adopt."""
+
+from __future__ import annotations
+
+import collections
+import logging
+import os
+import re
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Deque, Dict, Optional
+
+from .scheduler import parse_template_counts
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .manager import SessionManager
+
+logger = logging.getLogger(__name__)
+
+POOL_ENV = "VIBESTACK_WARM_POOL"
+SESSION_PREFIX = "__vibestack_warm_"
+
+
+def pool_sizes_from_environment() -> Dict[str, int]:
+    """Return ``VIBESTACK_WARM_POOL`` (e.g. ``"bash=2,codex=2"``) as template sizes."""
+
+    return {name: size for name, size in parse_template_counts(os.environ.get(POOL_ENV)).items() if size > 0}
+
+
+@dataclass
+class WarmSession:
+    """An idle, detached login shell started ahead of demand for ``template``."""
+
+    name: str
+    template: str
+    env: Dict[str, str] = field(default_factory=dict)
+
+    def env_delta(self, env: Optional[Dict[str, str]]) -> Dict[str, str]:
+        """Variables in ``env`` that the warm shell was not started with."""
+
+        return {key: value for key, value in (env or {}).items() if self.env.get(key) != value}
+
+
+class WarmPool:
+    """Keeps ``sizes[template]`` idle sessions per template and refills them in the background.
+
+    Warm sessions run ``bash --login`` with the template environment but no log pipe,
+    so adopting one only needs ``rename-session``, ``pipe-pane`` and the usual
+    ``send-keys``. A session that needs variables the shell was not started with
+    (a per-session ``CODEX_HOME``, caller ``env``) respawns the shell with them
+    before the log pipe is attached, never typing them. Session names embed the owning process id; sessions left behind
+    by a process that no longer exists are killed on :meth:`start`.
+    """
+
+    def __init__(self, manager: "SessionManager", sizes: Dict[str, int], *, refill_interval: float = 30.0) -> None:
+        self.manager = manager
+        self.sizes = {template: size for template, size in sizes.items() if size > 0}
+        self.refill_interval = refill_interval
+        self._idle: Dict[str, Deque[WarmSession]] = {template: collections.deque() for template in self.sizes}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running or not self.sizes:
+            return
+        self._kill_orphans()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="vibestack-warm-pool", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+        with self._lock:
+            idle = [session for sessions in self._idle.values() for session in sessions]
+            for sessions in self._idle.values():
+                sessions.clear()
+        for session in idle:
+            self.manager._execute_tmux(["kill-session", "-t", session.name], capture=True)
+
+    def claim(self, template: str) -> Optional[WarmSession]:
+        """Take an idle session for ``template``; the pool refills in the background."""
+
+        with self._lock:
+            sessions = self._idle.get(template)
+            session = sessions.popleft() if sessions else None
+        if session is not None:
+            self._wake.set()
+        return session
+
+    def idle_counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {template: len(sessions) for template, sessions in self._idle.items()}
+
+    def refill(self) -> None:
+        """Drop idle sessions that disappeared and start new ones up to the target sizes."""
+
+        alive = self.manager._live_session_names()
+        with self._lock:
+            for sessions in self._idle.values():
+                for session in [session for session in sessions if session.name not in alive]:
+                    sessions.remove(session)
+            missing = {template: size - len(self._idle[template]) for template, size in self.sizes.items()}
+        for template, count in missing.items():
+            for _ in range(max(0, count)):
+                if self._stop.is_set():
+                    return
+                session = self._spawn(template)
+                with self._lock:
+                    self._idle[template].append(session)
+
+    def _spawn(self, template: str) -> WarmSession:
+        config = self.manager.templates.get(template) or {}
+        template_env = {str(k): str(v) for k, v in (config.get("env") or {}).items()}
+        env = os.environ.copy()
+        env.update(template_env)
+        label = re.sub(r"[^A-Za-z0-9_-]", "-", template)
+        name = f"{SESSION_PREFIX}{os.getpid()}_{label}_{uuid.uuid4().hex[:8]}"
+        # -e reaches the shell even when the tmux server (and its environment) already exists.
+        assignments = [arg for key, value in sorted(template_env.items()) for arg in ("-e", f"{key}={value}")]
+        self.manager._run_tmux(["new-session", "-d", "-s", name, *assignments, "bash", "--login"], env=env)
+        self.manager._run_tmux(["set-option", "-t", name, "status", "off"])
+        return WarmSession(name=name, template=template, env=template_env)
+
+    def _kill_orphans(self) -> None:
+        for name in self.manager._live_session_names():
+            if not name.startswith(SESSION_PREFIX):
+                continue
+            pid_text = name[len(SESSION_PREFIX):].split("_", 1)[0]
+            try:
+                pid = int(pid_text)
+                if pid == os.getpid():
+                    continue
+                os.kill(pid, 0)
+                continue
+            except (ValueError, ProcessLookupError):
+                pass  # not ours to keep: malformed name or the owner is gone
+            except PermissionError:
+                continue
+            self.manager._execute_tmux(["kill-session", "-t", name], capture=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refill()
+            except Exception:  # pragma: no cover - keep the loop alive
+                logger.exception("Warm pool refill failed")
+            self._wake.wait(self.refill_interval)
+            self._wake.clear()
+
+
+__all__ = ["POOL_ENV", "SESSION_PREFIX", "WarmPool", "WarmSession", "pool_sizes_from_environment"]
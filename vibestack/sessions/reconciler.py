@@ -0,0 +1,279 @@
+"""Background reconciliation of session status against tmux."""
+
+from __future__ import annotations
+
+import collections
+import copy
+import logging
+import os
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from vibestack import metrics
+
+from .logs import disk_usage
+from .manager import SessionManager
+from .models import SessionMetadata
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 2.0
+INTERVAL_ENV = "VIBESTACK_RECONCILE_INTERVAL"
+
+# Reconcilers whose passes feed the session gauges; read when metrics are scraped.
+_RUNNING: "weakref.WeakSet[SessionReconciler]" = weakref.WeakSet()
+
+
+def _collect(attribute: str) -> Dict[Tuple[str, ...], float]:
+    totals: Dict[Tuple[str, ...], float] = collections.Counter()
+    for reconciler in list(_RUNNING):
+        for key, value in getattr(reconciler, attribute).items():
+            totals[key] += value
+    return dict(totals)
+
+
+SESSIONS = metrics.REGISTRY.gauge(
+    "vibestack_sessions",
+    "Known sessions, by status and template.",
+    ["status", "template"],
+    collect=lambda: _collect("session_counts"),
+)
+SESSION_LOG_BYTES = metrics.REGISTRY.gauge(
+    "vibestack_session_log_bytes",
+    "Disk used by session console logs, including rotated segments, by template.",
+    ["template"],
+    collect=lambda: _collect("log_bytes"),
+)
+
+
+def interval_from_environment() -> float:
+    """Return ``VIBESTACK_RECONCILE_INTERVAL`` in seconds (``0`` disables the reconciler)."""
+
+    value = os.environ.get(INTERVAL_ENV)
+    if value is None or not value.strip():
+        return DEFAULT_INTERVAL
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return DEFAULT_INTERVAL
+
+
+class SessionReconciler:
+    """Keeps an in-memory status table for one :class:`SessionManager` current.
+
+    A daemon thread takes one batched tmux snapshot per ``interval`` and runs the
+    manager's status refresh against it, which persists only real transitions.
+    Each pass also lets the job scheduler start queued jobs and indexes log
+    output written since the previous pass, so log reads and searches do not
+    have to.
+    Reads are then answered from memory without touching tmux or the disk.
+    Changes made through this process are recorded with :meth:`observe` so they
+    show up immediately rather than on the next pass. While running, the passes
+    also feed the ``vibestack_sessions`` and ``vibestack_session_log_bytes`` gauges.
+    """
+
+    def __init__(self, manager: SessionManager, *, interval: float = DEFAULT_INTERVAL) -> None:
+        self.manager = manager
+        self.interval = interval
+        self.last_reconciled: Optional[float] = None
+        self._sessions: Dict[str, SessionMetadata] = {}
+        # Observations made while a pass is running; they win over that pass's results.
+        self._pending: Optional[Dict[str, Optional[SessionMetadata]]] = None
+        # (size, mtime) of each log when it was last fully indexed.
+        self._indexed: Dict[str, Tuple[int, int]] = {}
+        # Disk use of each log, with the (size, mtime) it was measured at.
+        self._log_usage: Dict[str, Tuple[Tuple[int, int], int]] = {}
+        # Gauge values from the latest pass, keyed by label values.
+        self.session_counts: Dict[Tuple[str, ...], float] = {}
+        self.log_bytes: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+        self._reconcile_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the first pass has completed and reads can be served from memory."""
+
+        return self._ready.is_set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="vibestack-reconciler", daemon=True)
+        self._thread.start()
+        _RUNNING.add(self)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        _RUNNING.discard(self)
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    def poke(self) -> None:
+        """Run the next pass now instead of waiting for the interval."""
+
+        self._wake.set()
+
+    def reconcile(self) -> None:
+        """Run one pass: a single tmux snapshot applied to every stored session."""
+
+        with self._reconcile_lock:
+            with self._lock:
+                self._pending = {}
+            try:
+                # Start queued jobs whose slots freed up since the last pass.
+                self.manager.scheduler.dispatch()
+                sessions = self.manager.storage.list_sessions()
+                snapshot = self.manager._snapshot_tmux()
+                for metadata in sessions:
+                    self.manager._refresh_status(metadata, snapshot)
+                table = {metadata.name: metadata for metadata in sessions}
+            except BaseException:
+                with self._lock:
+                    self._pending = None
+                raise
+            with self._lock:
+                for name, metadata in (self._pending or {}).items():
+                    if metadata is None:
+                        table.pop(name, None)
+                    else:
+                        table[name] = metadata
+                self._pending = None
+                self._sessions = table
+                self.last_reconciled = time.monotonic()
+            counts = collections.Counter((metadata.status or "", metadata.template or "") for metadata in table.values())
+            self.session_counts = {key: float(count) for key, count in counts.items()}
+            self._ready.set()
+
+    def index_logs(self) -> None:
+        """Index the logs that changed since they were last fully indexed.
+
+        Also measures the disk use of logs that changed, for the log bytes gauge.
+        """
+
+        with self._lock:
+            sessions = list(self._sessions.values())
+        stamps: Dict[str, Tuple[int, int]] = {}
+        changed: List[SessionMetadata] = []
+        usage: Dict[str, Tuple[Tuple[int, int], int]] = {}
+        log_bytes: Dict[Tuple[str, ...], float] = collections.Counter()
+        for metadata in sessions:
+            try:
+                stat = os.stat(metadata.log_path)
+            except OSError:
+                continue
+            stamp = stamps[metadata.name] = (stat.st_size, stat.st_mtime_ns)
+            if self._indexed.get(metadata.name) != stamp:
+                changed.append(metadata)
+            previous = self._log_usage.get(metadata.name)
+            usage[metadata.name] = previous if previous and previous[0] == stamp else (stamp, disk_usage(Path(metadata.log_path)))
+            log_bytes[(metadata.template or "",)] += usage[metadata.name][1]
+        # Rebuilt from the current sessions, so deleted ones drop out.
+        self._log_usage = usage
+        self.log_bytes = dict(log_bytes)
+        pending = self.manager.index_logs(changed)
+        self._indexed = {
+            name: stamp
+            for name, stamp in stamps.items()
+            if (pending[name] == 0 if name in pending else self._indexed.get(name) == stamp)
+        }
+
+    def observe(self, metadata: SessionMetadata) -> None:
+        """Record state this process just wrote, ahead of the next pass."""
+
+        snapshot = copy.deepcopy(metadata)
+        with self._lock:
+            self._sessions[metadata.name] = snapshot
+            if self._pending is not None:
+                self._pending[metadata.name] = snapshot
+
+    def observe_stored(self, name: str) -> None:
+        """Re-read ``name`` from storage into the table (or drop it if it is gone)."""
+
+        metadata = self.manager.storage.load(name)
+        if metadata is not None:
+            with self._lock:
+                previous = self._sessions.get(name)
+            if previous is not None and metadata.status == previous.status:
+                metadata.runtime = dict(previous.runtime)
+            self.observe(metadata)
+            return
+        with self._lock:
+            self._sessions.pop(name, None)
+            if self._pending is not None:
+                self._pending[name] = None
+
+    def list_sessions(
+        self,
+        *,
+        status: Optional[str | Iterable[str]] = None,
+        template: Optional[str] = None,
+        updated_since: Optional[str] = None,
+    ) -> List[SessionMetadata]:
+        self._ensure_ready()
+        wanted = None if status is None else ({status} if isinstance(status, str) else set(status))
+        with self._lock:
+            candidates = [self._sessions[name] for name in sorted(self._sessions)]
+        return [
+            copy.deepcopy(metadata)
+            for metadata in candidates
+            if (wanted is None or metadata.status in wanted)
+            and (template is None or metadata.template == template)
+            and (updated_since is None or metadata.updated_at >= updated_since)
+        ]
+
+    def lookup(self, name: str) -> Optional[SessionMetadata]:
+        """Return the in-memory entry for ``name`` without falling back to storage."""
+
+        with self._lock:
+            metadata = self._sessions.get(name)
+        return copy.deepcopy(metadata) if metadata is not None else None
+
+    def get_session(self, name: str) -> Optional[SessionMetadata]:
+        self._ensure_ready()
+        metadata = self.lookup(name)
+        if metadata is not None:
+            return metadata
+        # Possibly created by another process since the last pass.
+        metadata = self.manager.get_session(name)
+        if metadata is not None:
+            self.observe(metadata)
+        return metadata
+
+    def _ensure_ready(self) -> None:
+        if not self._ready.is_set():
+            self.reconcile()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.reconcile()
+                self.index_logs()
+            except Exception:  # pragma: no cover - keep the loop alive
+                logger.exception("Session reconciliation failed")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+__all__ = [
+    "DEFAULT_INTERVAL",
+    "INTERVAL_ENV",
+    "SESSIONS",
+    "SESSION_LOG_BYTES",
+    "SessionReconciler",
+    "interval_from_environment",
+]
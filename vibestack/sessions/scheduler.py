@@ -0,0 +1,291 @@
+"""Bounded-concurrency dispatch of queued one-off jobs."""
+
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+
+from .models import ISO_FORMAT, SessionMetadata, SessionType
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .manager import SessionManager
+
+logger = logging.getLogger(__name__)
+
+# Dispatch order: lower rank runs first, ties go to the oldest submission.
+PRIORITY_CLASSES: Dict[str, int] = {"high": 0, "normal": 1, "low": 2}
+DEFAULT_PRIORITY = "normal"
+ACTIVE_JOB_STATUSES = ("starting", "running")
+LAUNCH_FILENAME = "launch.json"
+
+
+def parse_template_counts(value: Optional[str]) -> Dict[str, int]:
+    """Parse ``template=limit`` pairs such as ``"script=2,codex=1"``."""
+
+    limits: Dict[str, int] = {}
+    for item in (value or "").split(","):
+        name, _, raw = item.partition("=")
+        try:
+            limit = int(raw)
+        except ValueError:
+            continue
+        if name.strip() and limit >= 0:
+            limits[name.strip()] = limit
+    return limits
+
+
+def _default_max_concurrency() -> int:
+    value = os.environ.get("VIBESTACK_MAX_CONCURRENT_JOBS")
+    if value is not None and value.strip():
+        try:
+            return max(0, int(value))
+        except ValueError:
+            pass
+    return os.cpu_count() or 4
+
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, ISO_FORMAT)
+    except ValueError:
+        return None
+
+
+class JobScheduler:
+    """Launches queued one-off jobs as concurrency slots free up.
+
+    ``enqueue_one_off`` only provisions the session and records its launch
+    parameters; :meth:`dispatch` starts queued jobs in priority order while fewer
+    than ``max_concurrency`` scheduled jobs are running (``0`` means unlimited)
+    and the job's template is below its own limit. Template limits come from
+    ``VIBESTACK_JOB_TEMPLATE_LIMITS`` or a template's ``max_concurrency`` field.
+    Dispatch holds a lock file in the session root, so several processes sharing
+    the root never overshoot the limits together.
+    """
+
+    def __init__(
+        self,
+        manager: "SessionManager",
+        *,
+        max_concurrency: Optional[int] = None,
+        template_limits: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self.manager = manager
+        self.storage = manager.storage
+        self.max_concurrency = _default_max_concurrency() if max_concurrency is None else max(0, max_concurrency)
+        self.template_limits = (
+            parse_template_counts(os.environ.get("VIBESTACK_JOB_TEMPLATE_LIMITS")) if template_limits is None else dict(template_limits)
+        )
+        self.lock_path = self.storage.session_root / ".scheduler.lock"
+        self._mutex = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+    @staticmethod
+    def normalize_priority(priority: Optional[str]) -> str:
+        value = (priority or DEFAULT_PRIORITY).strip().lower()
+        if value not in PRIORITY_CLASSES:
+            choices = ", ".join(PRIORITY_CLASSES)
+            raise ValueError(f"Unknown priority '{priority}' (expected one of: {choices})")
+        return value
+
+    def submit(
+        self,
+        metadata: SessionMetadata,
+        *,
+        working_dir: Optional[str | Path],
+        env: Optional[Dict[str, str]],
+        priority: str = DEFAULT_PRIORITY,
+    ) -> None:
+        """Record how to launch ``metadata`` once a slot is free."""
+
+        launch = {
+            "working_dir": str(working_dir) if working_dir else None,
+            "env": env or {},
+        }
+        path = self._launch_path(metadata.name)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text(json.dumps(launch), encoding="utf-8")
+        os.replace(tmp_path, path)
+        if metadata.job_id:
+            # The launch file exists before the job is marked schedulable.
+            self.storage.update_job(metadata.job_id, {"priority": priority, "scheduled": True})
+
+    def cancel(self, name: str) -> bool:
+        """Drop a queued job before it launches. Returns ``True`` if one was cancelled."""
+
+        with self._dispatch_lock():
+            metadata = self.storage.load(name)
+            if metadata is None or metadata.status != "queued":
+                return False
+            self._launch_path(name).unlink(missing_ok=True)
+            self.manager._mark_killed(name)
+            return True
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+    def template_limit(self, template: str) -> int:
+        if template in self.template_limits:
+            return self.template_limits[template]
+        config = self.manager.templates.get(template) or {}
+        try:
+            return max(0, int(config.get("max_concurrency") or 0))
+        except (TypeError, ValueError):
+            return 0
+
+    def dispatch(self) -> List[str]:
+        """Launch as many queued jobs as the limits allow; returns the session names."""
+
+        launched: List[str] = []
+        with self._dispatch_lock():
+            self._settle_finished()
+            queued = self._queued_jobs()
+            if not queued:
+                return launched
+            running = self._active_jobs()
+            per_template: Dict[str, int] = {}
+            for job in running:
+                per_template[job.get("template", "")] = per_template.get(job.get("template", ""), 0) + 1
+            total = len(running)
+            for job in queued:
+                if self.max_concurrency and total >= self.max_concurrency:
+                    break
+                template = job.get("template", "")
+                limit = self.template_limit(template)
+                if limit and per_template.get(template, 0) >= limit:
+                    continue
+                if self._launch(job):
+                    launched.append(job["session"])
+                    total += 1
+                    per_template[template] = per_template.get(template, 0) + 1
+        return launched
+
+    def queue_stats(self) -> Dict[str, Any]:
+        """Summarise queue depth, running jobs and wait times."""
+
+        queued = self._queued_jobs()
+        running = self._active_jobs()
+        now = datetime.utcnow()
+        by_priority = {name: 0 for name in PRIORITY_CLASSES}
+        by_template: Dict[str, Dict[str, int]] = {}
+        for job in queued:
+            priority = job.get("priority", DEFAULT_PRIORITY)
+            by_priority[priority] = by_priority.get(priority, 0) + 1
+            by_template.setdefault(job.get("template", ""), {"queued": 0, "running": 0})["queued"] += 1
+        for job in running:
+            by_template.setdefault(job.get("template", ""), {"queued": 0, "running": 0})["running"] += 1
+        oldest = min(
+            (stamp for stamp in (_timestamp(job.get("created_at")) for job in queued) if stamp is not None),
+            default=None,
+        )
+        return {
+            "queued": len(queued),
+            "running": len(running),
+            "max_concurrency": self.max_concurrency,
+            "template_limits": {name: self.template_limit(name) for name in sorted(by_template)},
+            "by_priority": by_priority,
+            "by_template": by_template,
+            "oldest_wait_seconds": round((now - oldest).total_seconds(), 3) if oldest is not None else None,
+        }
+
+    def annotate(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Add ``wait_seconds`` and, for queued jobs, ``queue_position`` to ``jobs`` in place."""
+
+        positions = {job["id"]: index for index, job in enumerate(self._queued_jobs(), start=1)}
+        now = datetime.utcnow()
+        for job in jobs:
+            created = _timestamp(job.get("created_at"))
+            started = _timestamp(job.get("started_at"))
+            if created is not None and (started is not None or job.get("status") == "queued"):
+                job["wait_seconds"] = round(((started or now) - created).total_seconds(), 3)
+            if job.get("id") in positions:
+                job["queue_position"] = positions[job["id"]]
+        return jobs
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    @contextlib.contextmanager
+    def _dispatch_lock(self) -> Iterator[None]:
+        with self._mutex:
+            self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.lock_path.open("a+") as handle:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _launch_path(self, name: str) -> Path:
+        return self.storage.session_dir(name) / LAUNCH_FILENAME
+
+    def _queued_jobs(self) -> List[Dict[str, Any]]:
+        jobs = [job for job in self.storage.list_jobs(status="queued") if job.get("scheduled")]
+        indexed = sorted(
+            enumerate(jobs),
+            key=lambda item: (PRIORITY_CLASSES.get(item[1].get("priority", DEFAULT_PRIORITY), 1), item[0]),
+        )
+        return [job for _, job in indexed]
+
+    def _active_jobs(self) -> List[Dict[str, Any]]:
+        return [job for job in self.storage.list_jobs(status=ACTIVE_JOB_STATUSES) if job.get("scheduled")]
+
+    def _settle_finished(self) -> None:
+        # Jobs whose script already wrote result.json free their slot without a tmux query.
+        for job in self._active_jobs():
+            metadata = self.storage.load(str(job.get("session") or ""))
+            if metadata is None or metadata.job_id != job.get("id"):
+                continue
+            if self.manager._result_path(metadata).exists():
+                self.manager._refresh_status(metadata, {})
+
+    def _launch(self, job: Dict[str, Any]) -> bool:
+        name = str(job.get("session") or "")
+        metadata = self.storage.load(name)
+        launch_path = self._launch_path(name)
+        if metadata is None or metadata.job_id != job["id"] or metadata.session_type is not SessionType.ONE_OFF:
+            self.storage.update_job_status(job["id"], "failed", message="session metadata missing")
+            return False
+        try:
+            launch = json.loads(launch_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            self._fail(metadata, "launch parameters missing")
+            return False
+        try:
+            if self.manager._session_exists(name):
+                raise RuntimeError(f"tmux session '{name}' already exists")
+            self.manager._launch_session(
+                metadata,
+                working_dir=launch.get("working_dir") or None,
+                extra_env=launch.get("env") or None,
+            )
+        except Exception as exc:  # noqa: BLE001 - one bad job must not stall the queue
+            logger.warning("Failed to launch queued job %s: %s", name, exc)
+            self._fail(metadata, str(exc))
+            return False
+        finally:
+            launch_path.unlink(missing_ok=True)
+        self.manager._mark_launched(metadata)
+        return True
+
+    def _fail(self, metadata: SessionMetadata, message: str) -> None:
+        metadata.status = "failed"
+        metadata.last_message = message
+        metadata.touch()
+        self.storage.save(metadata)
+        if metadata.job_id:
+            self.storage.update_job_status(metadata.job_id, "failed", message=message)
+
+
+__all__ = ["DEFAULT_PRIORITY", "JobScheduler", "PRIORITY_CLASSES", "parse_template_counts"]
@@ -0,0 +1,82 @@
+"""Change tracking for captured tmux pane contents."""
+
+from __future__ import annotations
+
+import collections
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Deque, Hashable, List, Optional, Tuple
+
+DEFAULT_HISTORY = 16
+DEFAULT_MAX_SCREENS = 256
+
+
+def line_hash(line: str) -> str:
+    return hashlib.blake2b(line.encode("utf-8", errors="replace"), digest_size=8).hexdigest()
+
+
+@dataclass
+class _ScreenHistory:
+    seq: int = 0
+    # (seq, line hashes) of recent distinct screens, oldest first.
+    snapshots: Deque[Tuple[int, List[str]]] = field(default_factory=collections.deque)
+
+
+class ScreenTracker:
+    """Numbers distinct screens per pane and reports which lines changed.
+
+    Each capture is reduced to one hash per line. A new sequence number is only
+    issued when the hashes differ from the previous capture, and the last
+    ``history`` screens are kept so clients polling at different rates can each
+    diff against the screen they last saw. Sequence numbers are opaque to
+    clients; unknown or expired ones get the full screen instead.
+    """
+
+    def __init__(self, *, history: int = DEFAULT_HISTORY, max_screens: int = DEFAULT_MAX_SCREENS) -> None:
+        self.history = max(1, history)
+        self.max_screens = max(1, max_screens)
+        self._screens: "collections.OrderedDict[Hashable, _ScreenHistory]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, key: Hashable, lines: List[str], since_seq: Optional[int] = None) -> Tuple[int, Optional[List[int]]]:
+        """Record ``lines`` for ``key``; return the current seq and the indexes changed since ``since_seq``.
+
+        The index list is ``None`` when ``since_seq`` cannot be diffed against and
+        the caller should send every line.
+        """
+
+        hashes = [line_hash(line) for line in lines]
+        with self._lock:
+            state = self._screens.get(key)
+            if state is None:
+                # Start from the clock so a seq handed out before a restart is never reused.
+                state = self._screens[key] = _ScreenHistory(seq=time.time_ns() // 1_000_000)
+                while len(self._screens) > self.max_screens:
+                    self._screens.popitem(last=False)
+            self._screens.move_to_end(key)
+            if not state.snapshots or state.snapshots[-1][1] != hashes:
+                state.seq += 1
+                state.snapshots.append((state.seq, hashes))
+                while len(state.snapshots) > self.history:
+                    state.snapshots.popleft()
+            previous: Optional[List[str]] = None
+            if since_seq is not None:
+                previous = next((seen for seq, seen in state.snapshots if seq == since_seq), None)
+            seq = state.seq
+        if previous is None:
+            return seq, None
+        changed = [
+            index
+            for index, value in enumerate(hashes)
+            if index >= len(previous) or previous[index] != value
+        ]
+        return seq, changed
+
+    def forget(self, key: Hashable) -> None:
+        with self._lock:
+            self._screens.pop(key, None)
+
+
+__all__ = ["ScreenTracker", "line_hash"]
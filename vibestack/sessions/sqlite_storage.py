@@ -0,0 +1,294 @@
+"""SQLite-backed implementation of :class:`~vibestack.sessions.storage.SessionStorage`."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import shutil
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .models import ISO_FORMAT, SessionMetadata, SessionStatus
+from .storage import SessionStorage, _status_set
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    name TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    template TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_status ON sessions (status);
+CREATE INDEX IF NOT EXISTS idx_sessions_template ON sessions (template);
+CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions (updated_at);
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    session TEXT,
+    status TEXT,
+    updated_at TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_IMPORT_MARKER = "imported_directory_layout"
+
+# Re-adding a job updates it in place, keeping its seq (and so its place in submission order).
+_UPSERT_JOB = (
+    "INSERT INTO jobs (id, session, status, updated_at, payload) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET session = excluded.session, status = excluded.status, "
+    "updated_at = excluded.updated_at, payload = excluded.payload"
+)
+
+
+class SQLiteSessionStorage(SessionStorage):
+    """Stores session metadata and jobs in ``<session_root>/vibestack.db``.
+
+    Session directories (logs, workspaces, run scripts) stay on disk exactly as with
+    the file backend; only ``metadata.json`` and the job queue move into the database.
+    The first time a database is opened for a root that already holds sessions, the
+    existing directory layout is imported.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, session_root: Path, db_path: Optional[Path] = None) -> None:
+        super().__init__(session_root)
+        self.db_path = db_path or self.session_root / "vibestack.db"
+        self._local = threading.local()
+        self._connection().executescript(_SCHEMA)
+        self.import_directory_layout()
+
+    # ------------------------------------------------------------------
+    # Connection helpers
+    # ------------------------------------------------------------------
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def import_directory_layout(self, *, force: bool = False) -> int:
+        """Import ``metadata.json`` files and the file job queue once.
+
+        Returns the number of sessions imported. Existing rows are never overwritten.
+        """
+
+        conn = self._connection()
+        if not force:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (_IMPORT_MARKER,)).fetchone()
+            if row is not None:
+                return 0
+        sessions = SessionStorage.list_sessions(self)
+        jobs = SessionStorage.list_jobs(self)
+        imported = 0
+        with self._transaction() as conn:
+            for metadata in sessions:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO sessions (name, status, template, updated_at, payload) VALUES (?, ?, ?, ?, ?)",
+                    self._session_row(metadata),
+                )
+                imported += cursor.rowcount
+            for job in jobs:
+                conn.execute(
+                    "INSERT OR IGNORE INTO jobs (id, session, status, updated_at, payload) VALUES (?, ?, ?, ?, ?)",
+                    self._job_row(job),
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (_IMPORT_MARKER, datetime.utcnow().strftime(ISO_FORMAT)),
+            )
+        return imported
+
+    @staticmethod
+    def _session_row(metadata: SessionMetadata) -> tuple:
+        return (
+            metadata.name,
+            metadata.status,
+            metadata.template,
+            metadata.updated_at,
+            json.dumps(metadata.to_dict()),
+        )
+
+    @staticmethod
+    def _job_row(job: Dict[str, Any]) -> tuple:
+        return (job["id"], job.get("session"), job.get("status"), job.get("updated_at"), json.dumps(job))
+
+    # ------------------------------------------------------------------
+    # Session metadata
+    # ------------------------------------------------------------------
+    def list_sessions(
+        self,
+        *,
+        status: Optional[str | Iterable[str]] = None,
+        template: Optional[str] = None,
+        updated_since: Optional[str] = None,
+    ) -> List[SessionMetadata]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        statuses = _status_set(status)
+        if statuses is not None:
+            if not statuses:
+                return []
+            clauses.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(sorted(statuses))
+        if template is not None:
+            clauses.append("template = ?")
+            params.append(template)
+        if updated_since is not None:
+            clauses.append("updated_at >= ?")
+            params.append(updated_since)
+        query = "SELECT payload FROM sessions"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY name"
+        sessions: List[SessionMetadata] = []
+        for (payload,) in self._connection().execute(query, params):
+            try:
+                sessions.append(SessionMetadata.from_dict(json.loads(payload)))
+            except Exception:
+                continue
+        return sessions
+
+    def load(self, name: str) -> Optional[SessionMetadata]:
+        row = self._connection().execute("SELECT payload FROM sessions WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        return SessionMetadata.from_dict(json.loads(row[0]))
+
+    def save(self, metadata: SessionMetadata) -> None:
+        metadata.ensure_paths()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (name, status, template, updated_at, payload) VALUES (?, ?, ?, ?, ?)",
+                self._session_row(metadata),
+            )
+
+    def delete(self, name: str) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM sessions WHERE name = ?", (name,))
+        directory = self.session_dir(name)
+        if directory.exists():
+            shutil.rmtree(directory)
+
+    # ------------------------------------------------------------------
+    # Job tracking
+    # ------------------------------------------------------------------
+    def compact_jobs(self) -> None:
+        """Jobs are updated in place; there is no journal to compact."""
+
+    def add_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        with self._transaction() as conn:
+            conn.execute(_UPSERT_JOB, self._job_row(job))
+        return job
+
+    def add_jobs(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not jobs:
+            return jobs
+        with self._transaction() as conn:
+            conn.executemany(_UPSERT_JOB, [self._job_row(job) for job in jobs])
+        return jobs
+
+    def update_job_status(self, job_id: str, status: SessionStatus, message: Optional[str] = None) -> None:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT payload FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            job = json.loads(row[0])
+            job["status"] = status
+            job["updated_at"] = datetime.utcnow().strftime(ISO_FORMAT)
+            if message:
+                job["message"] = message
+            conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ?, payload = ? WHERE id = ?",
+                (job["status"], job["updated_at"], json.dumps(job), job_id),
+            )
+
+    def update_job(self, job_id: str, fields: Dict[str, Any]) -> None:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT payload FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            job = json.loads(row[0])
+            job["updated_at"] = datetime.utcnow().strftime(ISO_FORMAT)
+            job.update(fields)
+            conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ?, payload = ? WHERE id = ?",
+                (job.get("status"), job["updated_at"], json.dumps(job), job_id),
+            )
+
+    def update_jobs(self, updates: Dict[str, Dict[str, Any]]) -> None:
+        if not updates:
+            return
+        now = datetime.utcnow().strftime(ISO_FORMAT)
+        with self._transaction() as conn:
+            for job_id, fields in updates.items():
+                row = conn.execute("SELECT payload FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                if row is None:
+                    continue
+                job = json.loads(row[0])
+                job["updated_at"] = now
+                job.update(fields)
+                conn.execute(
+                    "UPDATE jobs SET status = ?, updated_at = ?, payload = ? WHERE id = ?",
+                    (job.get("status"), job["updated_at"], json.dumps(job), job_id),
+                )
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute("SELECT payload FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def list_jobs(
+        self,
+        *,
+        status: Optional[str | Iterable[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        query = "SELECT payload FROM jobs"
+        params: List[Any] = []
+        clauses: List[str] = []
+        statuses = _status_set(status)
+        if statuses is not None:
+            if not statuses:
+                return []
+            clauses.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(sorted(statuses))
+        if after is not None:
+            row = self._connection().execute("SELECT seq FROM jobs WHERE id = ?", (after,)).fetchone()
+            if row is None:
+                raise ValueError(f"Unknown job '{after}'")
+            clauses.append("seq > ?")
+            params.append(row[0])
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY seq LIMIT ? OFFSET ?"
+        params.extend([-1 if limit is None else limit, offset])
+        return [json.loads(payload) for (payload,) in self._connection().execute(query, params)]
+
+
+__all__ = ["SQLiteSessionStorage"]
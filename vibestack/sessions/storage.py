@@ -1,23 +1,95 @@
 from __future__ import annotations
 
+import contextlib
+import fcntl
+import functools
 import json
+import os
 import shutil
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
+from .. import metrics
 from .models import ISO_FORMAT, SessionMetadata, SessionStatus
 
 
+STORAGE_BACKEND_ENV = "VIBESTACK_STORAGE_BACKEND"
+
+STORAGE_DURATION = metrics.REGISTRY.histogram(
+    "vibestack_storage_operation_seconds",
+    "Session storage call latency in seconds, by backend and operation.",
+    ["backend", "operation"],
+)
+# Byte counts cover file-based storage; SQLite's own page I/O is not visible from here.
+STORAGE_READ_BYTES = metrics.REGISTRY.counter(
+    "vibestack_storage_read_bytes_total", "Bytes of session metadata and job files read, by backend.", ["backend"]
+)
+STORAGE_WRITTEN_BYTES = metrics.REGISTRY.counter(
+    "vibestack_storage_written_bytes_total", "Bytes of session metadata and job files written, by backend.", ["backend"]
+)
+# Public storage calls timed for every backend; see SessionStorage.__init_subclass__.
+TIMED_OPERATIONS = (
+    "list_sessions",
+    "load",
+    "save",
+    "delete",
+    "add_job",
+    "add_jobs",
+    "update_job_status",
+    "update_job",
+    "update_jobs",
+    "get_job",
+    "list_jobs",
+    "compact_jobs",
+)
+
+
+def _status_set(status: Optional[str | Iterable[str]]) -> Optional[Set[str]]:
+    if status is None:
+        return None
+    return {status} if isinstance(status, str) else set(status)
+
+
+def _timed(operation: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(func)
+    def wrapper(self: "SessionStorage", *args: Any, **kwargs: Any) -> Any:
+        with STORAGE_DURATION.time(self.backend, operation):
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _time_operations(cls: type) -> None:
+    for operation in TIMED_OPERATIONS:
+        func = cls.__dict__.get(operation)
+        if func is not None:
+            setattr(cls, operation, _timed(operation, func))
+
+
 class SessionStorage:
     """Thin persistence layer for session metadata and job history."""
 
+    backend = "files"
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        _time_operations(cls)
+
     def __init__(self, session_root: Path) -> None:
         self.session_root = session_root
         self.session_root.mkdir(parents=True, exist_ok=True)
         self.queue_path = self.session_root / "queue.json"
+        self.journal_path = self.session_root / "jobs.jsonl"
+        self.lock_path = self.session_root / ".jobs.lock"
         if not self.queue_path.exists():
             self.queue_path.write_text(json.dumps({"jobs": []}, indent=2))
+        self._jobs_mutex = threading.RLock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._jobs_stamp: Optional[Tuple[int, int, int]] = None
+        self._journal_offset = 0
+        self._journal_entries = 0
 
     # ------------------------------------------------------------------
     # Session metadata helpers
@@ -34,65 +106,292 @@ class SessionStorage:
     def workspace_path(self, name: str) -> Path:
         return self.session_dir(name) / "artifacts"
 
-    def list_sessions(self) -> List[SessionMetadata]:
+    def list_sessions(
+        self,
+        *,
+        status: Optional[str | Iterable[str]] = None,
+        template: Optional[str] = None,
+        updated_since: Optional[str] = None,
+    ) -> List[SessionMetadata]:
+        """Return stored sessions sorted by name, optionally filtered.
+
+        ``updated_since`` is an ISO timestamp in :data:`ISO_FORMAT`; sessions updated at
+        or after it are kept. This backend parses every ``metadata.json`` and filters in
+        Python; :class:`~vibestack.sessions.sqlite_storage.SQLiteSessionStorage` turns
+        the same filters into indexed queries.
+        """
+
+        statuses = _status_set(status)
         sessions: List[SessionMetadata] = []
         for metadata_file in sorted(self.session_root.glob("*/metadata.json")):
             try:
-                payload = json.loads(metadata_file.read_text())
-                sessions.append(SessionMetadata.from_dict(payload))
+                payload = json.loads(self._read_file(metadata_file))
+                metadata = SessionMetadata.from_dict(payload)
             except Exception:
                 continue
+            if statuses is not None and metadata.status not in statuses:
+                continue
+            if template is not None and metadata.template != template:
+                continue
+            if updated_since is not None and metadata.updated_at < updated_since:
+                continue
+            sessions.append(metadata)
         return sessions
 
     def load(self, name: str) -> Optional[SessionMetadata]:
         path = self.metadata_path(name)
         if not path.exists():
             return None
-        payload = json.loads(path.read_text())
+        payload = json.loads(self._read_file(path))
         return SessionMetadata.from_dict(payload)
 
     def save(self, metadata: SessionMetadata) -> None:
         metadata.ensure_paths()
         path = self.metadata_path(metadata.name)
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(metadata.to_dict(), indent=2))
+        self._write_file(path, json.dumps(metadata.to_dict(), indent=2).encode("utf-8"))
 
     def delete(self, name: str) -> None:
         directory = self.session_dir(name)
         if directory.exists():
             shutil.rmtree(directory)
 
+    def _read_file(self, path: Path) -> bytes:
+        data = path.read_bytes()
+        STORAGE_READ_BYTES.inc(self.backend, amount=len(data))
+        return data
+
+    def _write_file(self, path: Path, data: bytes) -> None:
+        path.write_bytes(data)
+        STORAGE_WRITTEN_BYTES.inc(self.backend, amount=len(data))
+
     # ------------------------------------------------------------------
     # Job tracking helpers
     # ------------------------------------------------------------------
+    # Jobs live in an append-only journal (``jobs.jsonl``) layered over a snapshot
+    # (``queue.json``). Every process keeps an in-memory index that it brings up to
+    # date by replaying journal lines it has not seen yet; once the journal grows
+    # past ``JOURNAL_COMPACT_THRESHOLD`` entries it is folded back into the snapshot.
+    JOURNAL_COMPACT_THRESHOLD = 1000
+
+    @contextlib.contextmanager
+    def _jobs_lock(self, exclusive: bool) -> Iterator[None]:
+        with self._jobs_mutex:
+            with self.lock_path.open("a+") as handle:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _snapshot_stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = self.queue_path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
     def _read_queue(self) -> Dict[str, Any]:
-        return json.loads(self.queue_path.read_text())
+        try:
+            payload = json.loads(self._read_file(self.queue_path))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"jobs": []}
+        return payload if isinstance(payload, dict) else {"jobs": []}
 
     def _write_queue(self, payload: Dict[str, Any]) -> None:
-        self.queue_path.write_text(json.dumps(payload, indent=2))
+        tmp_path = self.queue_path.with_name(f".{self.queue_path.name}.tmp")
+        self._write_file(tmp_path, json.dumps(payload, indent=2).encode("utf-8"))
+        os.replace(tmp_path, self.queue_path)
+
+    def _sync_jobs(self) -> None:
+        """Bring the in-memory job index up to date. Caller holds ``_jobs_lock``."""
+
+        stamp = self._snapshot_stamp()
+        if stamp != self._jobs_stamp:
+            self._jobs = {}
+            for job in self._read_queue().get("jobs", []):
+                if isinstance(job, dict) and job.get("id"):
+                    self._jobs[job["id"]] = job
+            self._jobs_stamp = stamp
+            self._journal_offset = 0
+            self._journal_entries = 0
+        try:
+            with self.journal_path.open("rb") as handle:
+                handle.seek(0, os.SEEK_END)
+                size = handle.tell()
+                if size < self._journal_offset:
+                    # Truncated underneath us without a new snapshot; rebuild from scratch.
+                    self._jobs_stamp = None
+                    self._sync_jobs()
+                    return
+                handle.seek(self._journal_offset)
+                chunk = handle.read()
+                STORAGE_READ_BYTES.inc(self.backend, amount=len(chunk))
+        except FileNotFoundError:
+            return
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return
+        for raw in chunk[: end + 1].splitlines():
+            if not raw.strip():
+                continue
+            try:
+                entry = json.loads(raw)
+            except json.JSONDecodeError:
+                continue
+            self._apply_journal_entry(entry)
+            self._journal_entries += 1
+        self._journal_offset += end + 1
+
+    def _apply_journal_entry(self, entry: Dict[str, Any]) -> None:
+        op = entry.get("op")
+        if op == "add":
+            job = entry.get("job")
+            if isinstance(job, dict) and job.get("id"):
+                self._jobs[job["id"]] = job
+        elif op == "update":
+            job = self._jobs.get(entry.get("id"))
+            if job is not None:
+                job.update(entry.get("fields") or {})
+
+    def _append_journal(self, entries: List[Dict[str, Any]]) -> None:
+        """Append ``entries`` and apply them locally. Caller holds the exclusive lock."""
+
+        data = "".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries).encode("utf-8")
+        with self.journal_path.open("ab") as handle:
+            handle.write(data)
+        STORAGE_WRITTEN_BYTES.inc(self.backend, amount=len(data))
+        for entry in entries:
+            self._apply_journal_entry(entry)
+        self._journal_offset += len(data)
+        self._journal_entries += len(entries)
+        if self._journal_entries >= self.JOURNAL_COMPACT_THRESHOLD:
+            self._compact_jobs()
+
+    def _compact_jobs(self) -> None:
+        """Fold the journal into ``queue.json``. Caller holds the exclusive lock."""
+
+        self._write_queue({"jobs": list(self._jobs.values())})
+        with self.journal_path.open("wb"):
+            pass
+        self._jobs_stamp = self._snapshot_stamp()
+        self._journal_offset = 0
+        self._journal_entries = 0
+
+    def compact_jobs(self) -> None:
+        with self._jobs_lock(exclusive=True):
+            self._sync_jobs()
+            self._compact_jobs()
 
     def add_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
-        queue = self._read_queue()
-        queue.setdefault("jobs", [])
-        queue["jobs"].append(job)
-        self._write_queue(queue)
+        with self._jobs_lock(exclusive=True):
+            self._sync_jobs()
+            self._append_journal([{"op": "add", "job": dict(job)}])
         return job
 
+    def add_jobs(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Record several jobs with a single journal append."""
+
+        if not jobs:
+            return jobs
+        with self._jobs_lock(exclusive=True):
+            self._sync_jobs()
+            self._append_journal([{"op": "add", "job": dict(job)} for job in jobs])
+        return jobs
+
     def update_job_status(self, job_id: str, status: SessionStatus, message: Optional[str] = None) -> None:
-        queue = self._read_queue()
-        mutated = False
-        for job in queue.get("jobs", []):
-            if job.get("id") == job_id:
-                job["status"] = status
-                job["updated_at"] = datetime.utcnow().strftime(ISO_FORMAT)
-                if message:
-                    job["message"] = message
-                mutated = True
-                break
-        if mutated:
-            self._write_queue(queue)
-
-    def list_jobs(self) -> List[Dict[str, Any]]:
-        queue = self._read_queue()
-        return queue.get("jobs", [])
+        with self._jobs_lock(exclusive=True):
+            self._sync_jobs()
+            if job_id not in self._jobs:
+                return
+            fields: Dict[str, Any] = {
+                "status": status,
+                "updated_at": datetime.utcnow().strftime(ISO_FORMAT),
+            }
+            if message:
+                fields["message"] = message
+            self._append_journal([{"op": "update", "id": job_id, "fields": fields}])
+
+    def update_job(self, job_id: str, fields: Dict[str, Any]) -> None:
+        """Merge ``fields`` into the job record; ``updated_at`` is refreshed."""
+
+        with self._jobs_lock(exclusive=True):
+            self._sync_jobs()
+            if job_id not in self._jobs:
+                return
+            merged = dict(fields)
+            merged.setdefault("updated_at", datetime.utcnow().strftime(ISO_FORMAT))
+            self._append_journal([{"op": "update", "id": job_id, "fields": merged}])
+
+    def update_jobs(self, updates: Dict[str, Dict[str, Any]]) -> None:
+        """Apply ``{job_id: fields}`` updates with a single journal append."""
+
+        if not updates:
+            return
+        now = datetime.utcnow().strftime(ISO_FORMAT)
+        with self._jobs_lock(exclusive=True):
+            self._sync_jobs()
+            entries = [
+                {"op": "update", "id": job_id, "fields": {"updated_at": now, **fields}}
+                for job_id, fields in updates.items()
+                if job_id in self._jobs
+            ]
+            if entries:
+                self._append_journal(entries)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._jobs_lock(exclusive=False):
+            self._sync_jobs()
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def list_jobs(
+        self,
+        *,
+        status: Optional[str | Iterable[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return jobs in submission order, optionally filtered by status and paginated.
+
+        ``after`` starts the listing behind that job id (before ``offset`` is
+        applied); an unknown id raises ``ValueError`` rather than reading as the
+        end of the list.
+        """
+
+        statuses = _status_set(status)
+        with self._jobs_lock(exclusive=False):
+            self._sync_jobs()
+            candidates = list(self._jobs.values())
+            if after is not None:
+                if after not in self._jobs:
+                    raise ValueError(f"Unknown job '{after}'")
+                candidates = candidates[list(self._jobs).index(after) + 1:]
+            jobs = [
+                job
+                for job in candidates
+                if statuses is None or job.get("status") in statuses
+            ]
+        end = None if limit is None else offset + limit
+        return [dict(job) for job in jobs[offset:end]]
+
+
+_time_operations(SessionStorage)
+
+
+def open_storage(session_root: Path, backend: Optional[str] = None) -> SessionStorage:
+    """Return the storage backend selected by ``backend`` or ``VIBESTACK_STORAGE_BACKEND``.
+
+    ``files`` (the default) keeps one ``metadata.json`` per session directory;
+    ``sqlite`` stores metadata and jobs in ``<session_root>/vibestack.db``.
+    """
+
+    selected = (backend or os.environ.get(STORAGE_BACKEND_ENV) or "files").strip().lower()
+    if selected in {"files", "file", "fs", "json"}:
+        return SessionStorage(session_root)
+    if selected in {"sqlite", "sqlite3"}:
+        from .sqlite_storage import SQLiteSessionStorage
 
+        return SQLiteSessionStorage(session_root)
+    raise ValueError(f"Unknown session storage backend '{selected}'")
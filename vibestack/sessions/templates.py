@@ -0,0 +1,268 @@
+"""Session templates and the asset directories they copy files from."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models import SessionType
+
+DEFAULT_TEMPLATES: Dict[str, Dict[str, Any]] = {
+    "bash": {
+        "command": "printf 'Welcome to VibeStack\\n'",
+        "label": "Welcome shell",
+        "default_type": SessionType.LONG_RUNNING.value,
+        "include_files": [
+            {"source": "AGENTS.md", "target": "AGENTS.md"},
+            {"source": "TASKS.md", "target": "TASKS.md"},
+        ],
+    },
+    "codex": {
+        "command": "codex",
+        "label": "Codex CLI",
+        "default_type": SessionType.LONG_RUNNING.value,
+        "include_files": [
+            {"source": "AGENTS.md", "target": "AGENTS.md"},
+            {"source": "TASKS.md", "target": "TASKS.md"},
+        ],
+        "command_args": [
+            "--model",
+            "gpt-5-codex",
+            "--sandbox",
+            "danger-full-access",
+            "--ask-for-approval",
+            "never",
+        ],
+    },
+    "script": {
+        "command": "bash --login",
+        "label": "One-off script",
+        "default_type": SessionType.ONE_OFF.value,
+        "hidden": True,
+    },
+}
+
+
+class TemplateRegistry:
+    """Built-in and on-disk templates plus the asset search path.
+
+    Templates do not depend on the session root, so one registry can back any
+    number of :class:`~vibestack.sessions.manager.SessionManager` instances.
+    """
+
+    def __init__(
+        self,
+        *,
+        repo_root: Path,
+        template_dir: Path,
+        user_template_dir: Path,
+        asset_dir: Path,
+        user_asset_dir: Path,
+        defaults: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        self.repo_root = repo_root
+        self.template_dir = template_dir
+        self.user_template_dir = user_template_dir
+        self.asset_dir = asset_dir
+        self.user_asset_dir = user_asset_dir
+        self.defaults = DEFAULT_TEMPLATES if defaults is None else defaults
+        for directory in (template_dir, user_template_dir, asset_dir, user_asset_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._files: Dict[Path, Tuple[Tuple[int, int], Optional[Dict[str, Any]]]] = {}
+        self.templates: Dict[str, Dict[str, Any]] = {}
+        self.sources: Dict[str, str] = {}
+        # Incremented whenever the template set changes; callers compare it to skip work.
+        self.version = 0
+        self.refresh()
+
+    @classmethod
+    def from_environment(cls, defaults: Optional[Dict[str, Dict[str, Any]]] = None) -> "TemplateRegistry":
+        repo_root = Path(os.environ.get("VIBESTACK_HOME") or Path.cwd())
+        template_dir_env = os.environ.get("VIBESTACK_TEMPLATE_DIR")
+        user_template_dir_env = os.environ.get("VIBESTACK_USER_TEMPLATE_DIR")
+        asset_dir_env = os.environ.get("VIBESTACK_ASSET_DIR")
+        user_asset_dir_env = os.environ.get("VIBESTACK_USER_ASSET_DIR")
+        return cls(
+            repo_root=repo_root,
+            template_dir=Path(template_dir_env) if template_dir_env else repo_root / "vibestack" / "templates",
+            user_template_dir=(
+                Path(user_template_dir_env) if user_template_dir_env else Path.home() / ".vibestack" / "templates"
+            ),
+            asset_dir=Path(asset_dir_env) if asset_dir_env else repo_root / "vibestack" / "assets",
+            user_asset_dir=Path(user_asset_dir_env) if user_asset_dir_env else Path.home() / ".vibestack" / "assets",
+            defaults=defaults,
+        )
+
+    def refresh(self) -> bool:
+        """Re-read template files whose mtime or size changed since the last refresh.
+
+        Unchanged files are served from the parse cache, so a refresh with nothing
+        to do costs one ``scandir`` per template directory. Returns ``True`` (and
+        bumps :attr:`version`) when the merged template set changed.
+        """
+
+        with self._lock:
+            seen: Dict[Path, Tuple[int, int]] = {}
+            changed = False
+            for template_dir in (self.template_dir, self.user_template_dir):
+                for file, stamp in self._scan(template_dir):
+                    seen[file] = stamp
+                    cached = self._files.get(file)
+                    if cached is not None and cached[0] == stamp:
+                        continue
+                    self._files[file] = (stamp, self._parse(file))
+                    changed = True
+            for file in [file for file in self._files if file not in seen]:
+                del self._files[file]
+                changed = True
+            if changed or self.version == 0:
+                self._rebuild()
+                self.version += 1
+                return True
+            return False
+
+    @staticmethod
+    def _scan(template_dir: Path) -> List[Tuple[Path, Tuple[int, int]]]:
+        try:
+            entries = list(os.scandir(template_dir))
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+        found: List[Tuple[Path, Tuple[int, int]]] = []
+        for entry in entries:
+            if not entry.name.endswith('.json'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            found.append((Path(entry.path), (stat.st_mtime_ns, stat.st_size)))
+        found.sort()
+        return found
+
+    @staticmethod
+    def _parse(file: Path) -> Optional[Dict[str, Any]]:
+        try:
+            payload = json.loads(file.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError):
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    def _invalidate(self, file: Path) -> None:
+        # A rewrite can keep the same size within one mtime tick, so force a re-read.
+        if file in self._files:
+            self._files[file] = ((-1, -1), None)
+
+    def _rebuild(self) -> None:
+        templates: Dict[str, Dict[str, Any]] = {key: value.copy() for key, value in self.defaults.items()}
+        sources: Dict[str, str] = {key: "built-in" for key in self.defaults}
+        # Same precedence as a full scan: built-ins, then each directory in sorted order.
+        for template_dir in (self.template_dir, self.user_template_dir):
+            files = sorted(file for file in self._files if file.parent == template_dir)
+            for file in files:
+                payload = self._files[file][1]
+                if payload is None:
+                    continue
+                key = payload.get('name') or file.stem
+                templates[key] = self._normalize(key, payload)
+                sources[key] = str(file)
+        self.templates = templates
+        self.sources = sources
+
+    @staticmethod
+    def _normalize(key: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'command': payload.get('command', ''),
+            'command_args': payload.get('command_args'),
+            'label': payload.get('label', key),
+            'default_type': payload.get('session_type', SessionType.LONG_RUNNING.value),
+            'working_dir': payload.get('working_dir'),
+            'description': payload.get('description'),
+            'env': payload.get('env'),
+            'post_create': payload.get('post_create'),
+            'include_files': payload.get('include_files'),
+            'hidden': payload.get('hidden', False),
+            'max_concurrency': payload.get('max_concurrency'),
+        }
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.templates.get(name)
+
+    def list_templates(self) -> List[Dict[str, Any]]:
+        templates, sources = self.templates, self.sources
+        results: List[Dict[str, Any]] = []
+        for name, config in sorted(templates.items(), key=lambda item: (item[1].get('label') or item[0]).lower()):
+            if config.get('hidden'):
+                continue
+            entry = dict(config)
+            entry['name'] = name
+            entry['source'] = sources.get(name, 'user')
+            entry.pop('hidden', None)
+            results.append(entry)
+        return results
+
+    def save_template(self, payload: Dict[str, Any], include_sources: Optional[List[Path]] = None) -> Path:
+        name = payload.get('name')
+        if not name:
+            raise ValueError('Template name is required')
+
+        include_entries = payload.get('include_files') or []
+        processed_entries: List[Any] = []
+        for entry in include_entries:
+            if isinstance(entry, str):
+                processed_entries.append(entry)
+            elif isinstance(entry, dict):
+                processed_entries.append({k: v for k, v in entry.items() if v})
+
+        if include_sources:
+            asset_root = self.user_asset_dir / name
+            asset_root.mkdir(parents=True, exist_ok=True)
+            for source_path in include_sources:
+                if not source_path.exists() or not source_path.is_file():
+                    continue
+                destination = asset_root / source_path.name
+                destination.write_bytes(source_path.read_bytes())
+                processed_entries.append({"source": f"{name}/{source_path.name}", "target": source_path.name})
+
+        payload = dict(payload)
+        payload['include_files'] = processed_entries
+
+        destination = self.user_template_dir / f"{name}.json"
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding='utf-8')
+        with self._lock:
+            self._invalidate(destination)
+            self.refresh()
+        return destination
+
+    def delete_template(self, name: str) -> None:
+        source = self.sources.get(name)
+        if not source or source == 'built-in':
+            raise ValueError(f"Template '{name}' cannot be deleted (not a user template)")
+        template_path = Path(source)
+        if template_path.exists():
+            template_path.unlink()
+        with self._lock:
+            self._invalidate(template_path)
+            self.refresh()
+
+    def asset_search_roots(self) -> List[Path]:
+        return [self.asset_dir, self.user_asset_dir, self.repo_root]
+
+    def resolve_asset_file(self, reference: str) -> Optional[Path]:
+        candidate = Path(reference)
+        if candidate.is_absolute() and candidate.exists():
+            return candidate
+        for root in self.asset_search_roots():
+            if not root:
+                continue
+            potential = root / reference
+            if potential.exists():
+                return potential
+        return None
+
+
+__all__ = ["DEFAULT_TEMPLATES", "TemplateRegistry"]
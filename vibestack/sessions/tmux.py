@@ -0,0 +1,303 @@
+"""Long-lived tmux control-mode client used to avoid a fork per tmux command."""
+
+from __future__ import annotations
+
+import collections
+import os
+import re
+import subprocess
+import threading
+import uuid
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Deque, Iterable, List, Optional, Sequence
+
+from .. import metrics
+
+# Prefix of the hidden session each control client creates for itself.
+CONTROL_SESSION_NAME = "__vibestack_control"
+# An argv element that is exactly this separates chained commands (``a ; b``).
+COMMAND_SEPARATOR = ";"
+
+_SAFE_ARGUMENT = re.compile(r"^[A-Za-z0-9_\-./:@=,+%]+$")
+_BLOCK_LINE = re.compile(r"^%(begin|end|error) (\d+) (\d+) (\d+)$")
+
+
+TMUX_COMMANDS = metrics.REGISTRY.counter(
+    "vibestack_tmux_commands_total", "tmux commands issued, by subcommand and transport.", ["command", "transport"]
+)
+TMUX_FAILURES = metrics.REGISTRY.counter(
+    "vibestack_tmux_command_failures_total",
+    "tmux commands that exited non-zero or did not complete, by subcommand and transport.",
+    ["command", "transport"],
+)
+TMUX_DURATION = metrics.REGISTRY.histogram(
+    "vibestack_tmux_command_duration_seconds",
+    "tmux command latency in seconds, by subcommand and transport.",
+    ["command", "transport"],
+)
+
+
+def record_command(command: Sequence[str], transport: str, seconds: float, ok: bool) -> None:
+    """Count one tmux command line (``transport`` is ``control`` or ``subprocess``).
+
+    Chained lines are recorded under their first subcommand.
+    """
+
+    args = command[1:] if command and command[0] == "tmux" else command
+    name = next((arg for arg in args if not arg.startswith("-")), "tmux")
+    TMUX_COMMANDS.inc(name, transport)
+    TMUX_DURATION.observe(seconds, name, transport)
+    if not ok:
+        TMUX_FAILURES.inc(name, transport)
+
+
+class TmuxControlUnavailable(RuntimeError):
+    """Raised when a command cannot be delivered over the control-mode client."""
+
+
+@dataclass
+class TmuxResult:
+    """Outcome of a tmux command issued through either transport."""
+
+    returncode: int
+    stdout: str
+
+
+@dataclass
+class _PendingLine:
+    """A submitted command line awaiting one output block per chained command."""
+
+    future: "Future[TmuxResult]"
+    blocks: int = 1
+    lines: List[str] = field(default_factory=list)
+
+
+def quote_argument(value: str) -> str:
+    """Quote ``value`` for the tmux command parser used by control mode."""
+
+    if value and _SAFE_ARGUMENT.match(value):
+        return value
+    return "'" + value.replace("'", "'\"'\"'") + "'"
+
+
+def escape_argument(value: str) -> str:
+    """Keep a trailing ``;`` literal when ``value`` is passed to tmux as an argv element.
+
+    tmux treats an argument ending in ``;`` as a command separator unless the
+    semicolon is preceded by a backslash, which it then drops.
+    """
+
+    return value[:-1] + "\\;" if value.endswith(";") else value
+
+
+def chain_commands(commands: Iterable[Sequence[str]]) -> List[str]:
+    """Join several commands into one argv that a single tmux invocation runs in order."""
+
+    args: List[str] = []
+    for command in commands:
+        if args:
+            args.append(COMMAND_SEPARATOR)
+        args.extend(command)
+    return args
+
+
+def build_command_line(args: Sequence[str]) -> str:
+    """Render ``args`` as a single control-mode command line.
+
+    Accepts the argv conventions of :func:`chain_commands` and :func:`escape_argument`.
+    Raises :class:`TmuxControlUnavailable` when an argument cannot be expressed on one
+    line (control mode is line oriented); callers fall back to a subprocess then.
+    """
+
+    parts: List[str] = []
+    for arg in args:
+        arg = str(arg)
+        if "\n" in arg or "\r" in arg:
+            raise TmuxControlUnavailable("argument contains a line break")
+        if arg == COMMAND_SEPARATOR:
+            parts.append(COMMAND_SEPARATOR)
+            continue
+        if arg.endswith("\\;"):
+            arg = arg[:-2] + ";"
+        parts.append(quote_argument(arg))
+    return " ".join(parts)
+
+
+class TmuxControlClient:
+    """Pipelines tmux commands over a single ``tmux -C`` client.
+
+    Commands are written to the client's stdin and answered in order by
+    ``%begin``/``%end`` (or ``%error``) blocks, which a reader thread matches to the
+    pending futures in FIFO order. A chained line is answered with one block per
+    command, or fewer when a command fails and tmux skips the rest; its future
+    collects them into a single result.
+
+    Each client attaches to a session of its own, marked ``destroy-unattached`` so
+    tmux removes it when the client goes away, even if the process crashes;
+    :meth:`close` also kills it, so it never lingers in ``list-sessions``.
+    """
+
+    def __init__(self, session_name: Optional[str] = None, timeout: float = 10.0) -> None:
+        self.session_name = session_name or f"{CONTROL_SESSION_NAME}_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        self.timeout = timeout
+        self._process: Optional[subprocess.Popen[str]] = None
+        self._reader: Optional[threading.Thread] = None
+        self._pending: Deque[_PendingLine] = collections.deque()
+        self._lock = threading.Lock()
+        self._alive = False
+
+    @property
+    def alive(self) -> bool:
+        return self._alive and self._process is not None and self._process.poll() is None
+
+    def start(self) -> bool:
+        """Spawn the control client; return ``False`` when tmux refuses to start it."""
+
+        with self._lock:
+            if self.alive:
+                return True
+            try:
+                process = subprocess.Popen(
+                    ["tmux", "-C", "new-session", "-A", "-s", self.session_name],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    encoding="utf-8",
+                    errors="replace",
+                    bufsize=1,
+                )
+            except OSError:
+                return False
+            self._process = process
+            self._pending.clear()
+            # The attach command itself is answered with the first block.
+            startup: Future[TmuxResult] = Future()
+            self._pending.append(_PendingLine(startup))
+            self._alive = True
+            self._reader = threading.Thread(
+                target=self._read_loop,
+                args=(process,),
+                name="vibestack-tmux-control",
+                daemon=True,
+            )
+            self._reader.start()
+        try:
+            startup.result(timeout=self.timeout)
+        except Exception:  # pylint: disable=broad-except
+            self.close()
+            return False
+        try:
+            # Pane output of the control session is never consumed.
+            self.run(["refresh-client", "-f", "no-output"])
+            self.run(["set-option", "-t", self.session_name, "destroy-unattached", "on"])
+        except (TmuxControlUnavailable, RuntimeError):
+            # Unanswered or exited; the caller falls back to subprocesses for a while.
+            self.close()
+            return False
+        return self.alive
+
+    def submit(self, args: Sequence[str]) -> "Future[TmuxResult]":
+        """Queue ``args`` and return a future resolved with the command's result."""
+
+        if args and args[0] == "tmux":
+            args = args[1:]
+        line = build_command_line(args)
+        future: Future[TmuxResult] = Future()
+        with self._lock:
+            process = self._process
+            if not self.alive or process is None or process.stdin is None:
+                raise TmuxControlUnavailable("tmux control client is not running")
+            try:
+                process.stdin.write(line + "\n")
+                process.stdin.flush()
+            except (OSError, ValueError) as exc:
+                self._alive = False
+                raise TmuxControlUnavailable(str(exc)) from exc
+            self._pending.append(_PendingLine(future, blocks=list(args).count(COMMAND_SEPARATOR) + 1))
+        return future
+
+    def run(self, args: Sequence[str], timeout: Optional[float] = None) -> TmuxResult:
+        future = self.submit(args)
+        try:
+            return future.result(timeout=timeout if timeout is not None else self.timeout)
+        except FutureTimeoutError as exc:
+            raise RuntimeError(f"tmux command timed out: {' '.join(args)}") from exc
+
+    def close(self) -> None:
+        with self._lock:
+            process = self._process
+            self._alive = False
+            self._process = None
+        if process is None:
+            return
+        try:
+            if process.stdin is not None:
+                process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        # destroy-unattached removes the session too, but not before close() returns.
+        subprocess.run(
+            ["tmux", "kill-session", "-t", self.session_name],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def _read_loop(self, process: subprocess.Popen[str]) -> None:
+        assert process.stdout is not None
+        block_number: Optional[str] = None
+        block_lines: List[str] = []
+        for raw_line in process.stdout:
+            line = raw_line.rstrip("\n")
+            match = _BLOCK_LINE.match(line)
+            if block_number is None:
+                if match and match.group(1) == "begin":
+                    block_number = match.group(3)
+                    block_lines = []
+                # Anything else outside a block is an asynchronous notification.
+                continue
+            if match and match.group(1) in {"end", "error"} and match.group(3) == block_number:
+                failed = match.group(1) == "error"
+                block_number = None
+                with self._lock:
+                    entry = self._pending[0] if self._pending else None
+                    if entry is None:
+                        continue
+                    entry.lines.extend(block_lines)
+                    entry.blocks -= 1
+                    if entry.blocks > 0 and not failed:
+                        continue
+                    self._pending.popleft()
+                if not entry.future.done():
+                    entry.future.set_result(TmuxResult(returncode=1 if failed else 0, stdout="\n".join(entry.lines)))
+                continue
+            block_lines.append(line)
+
+        with self._lock:
+            self._alive = False
+            pending = [entry.future for entry in self._pending]
+            self._pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(TmuxControlUnavailable("tmux control client exited"))
+
+
+__all__ = [
+    "COMMAND_SEPARATOR",
+    "CONTROL_SESSION_NAME",
+    "TmuxControlClient",
+    "TmuxControlUnavailable",
+    "TmuxResult",
+    "build_command_line",
+    "chain_commands",
+    "escape_argument",
+    "quote_argument",
+    "record_command",
+]
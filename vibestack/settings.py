@@ -3,8 +3,9 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urlencode, urljoin
 
 DEFAULT_SESSION_BASE_URL = os.environ.get(
@@ -15,25 +16,27 @@ _SETTINGS_DIR_ENV = "VIBESTACK_SETTINGS_DIR"
 _SETTINGS_FILENAME = "settings.json"
 _SESSION_UI_PATH = "ui/Sessions"
 
+# Parsed settings keyed by file path, valid while the file's stat stamp is unchanged.
+_CACHE: Dict[Path, Tuple[Optional[Tuple[int, int, int]], Dict[str, Any]]] = {}
+_CACHE_LOCK = threading.Lock()
 
-def _settings_dir() -> Path:
+
+def _settings_dir(*, create: bool = False) -> Path:
     root = os.environ.get(_SETTINGS_DIR_ENV)
     if root:
         path = Path(root).expanduser()
     else:
         path = Path.home() / ".vibestack"
-    path.mkdir(parents=True, exist_ok=True)
+    if create:
+        path.mkdir(parents=True, exist_ok=True)
     return path
 
 
-def _settings_path() -> Path:
-    return _settings_dir() / _SETTINGS_FILENAME
+def _settings_path(*, create: bool = False) -> Path:
+    return _settings_dir(create=create) / _SETTINGS_FILENAME
 
 
-def load_settings() -> Dict[str, Any]:
-    path = _settings_path()
-    if not path.exists():
-        return {}
+def _read_settings(path: Path) -> Dict[str, Any]:
     try:
         payload = json.loads(path.read_text(encoding="utf-8"))
     except (json.JSONDecodeError, OSError):
@@ -43,10 +46,30 @@ def load_settings() -> Dict[str, Any]:
     return payload
 
 
-def save_settings(settings: Dict[str, Any]) -> None:
+def load_settings() -> Dict[str, Any]:
+    """Return the settings file contents, re-reading it only after it changes on disk."""
+
     path = _settings_path()
+    try:
+        stat = path.stat()
+        stamp: Optional[Tuple[int, int, int]] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    except OSError:
+        stamp = None
+    with _CACHE_LOCK:
+        cached = _CACHE.get(path)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, _read_settings(path) if stamp is not None else {})
+            _CACHE[path] = cached
+    # Callers such as set_session_base_url edit the result in place.
+    return dict(cached[1])
+
+
+def save_settings(settings: Dict[str, Any]) -> None:
+    path = _settings_path(create=True)
     serialized = json.dumps(settings, indent=2, sort_keys=True) + "\n"
     path.write_text(serialized, encoding="utf-8")
+    with _CACHE_LOCK:
+        _CACHE.pop(path, None)
 
 
 def get_session_base_url() -> str:
@@ -67,8 +90,8 @@ def set_session_base_url(url: str) -> None:
     save_settings(settings)
 
 
-def build_session_ui_url(name: str, *, template: Optional[str] = None, base_url: Optional[str] = None) -> str:
-    base = (base_url if base_url is not None else get_session_base_url()).strip()
+def _session_ui_url(base: str, name: str, template: Optional[str]) -> str:
+    base = base.strip()
     if base:
         root = base if base.endswith("/") else f"{base}/"
         session_path = urljoin(root, _SESSION_UI_PATH)
@@ -81,9 +104,26 @@ def build_session_ui_url(name: str, *, template: Optional[str] = None, base_url:
     return f"{session_path}{separator}{urlencode(query)}"
 
 
+def build_session_ui_url(name: str, *, template: Optional[str] = None, base_url: Optional[str] = None) -> str:
+    base = base_url if base_url is not None else get_session_base_url()
+    return _session_ui_url(base, name, template)
+
+
+def build_session_ui_urls(
+    sessions: Iterable[Tuple[str, Optional[str]]],
+    *,
+    base_url: Optional[str] = None,
+) -> List[str]:
+    """Build UI URLs for ``(name, template)`` pairs, resolving the base URL once."""
+
+    base = base_url if base_url is not None else get_session_base_url()
+    return [_session_ui_url(base, name, template) for name, template in sessions]
+
+
 __all__ = [
     "DEFAULT_SESSION_BASE_URL",
     "build_session_ui_url",
+    "build_session_ui_urls",
     "get_session_base_url",
     "load_settings",
     "save_settings",